@@ -0,0 +1,44 @@
+import argparse
+from datetime import datetime
+
+if __name__ == "__main__":
+    # Imported here so the spawned job processes, which re-import this file, do not
+    # load the solver before setting their thread limits
+    from optimization.solver.batch_runner import BatchRunner, discover_instances
+
+    parser = argparse.ArgumentParser(
+        description="Solve every <name>_tasks / <name>_machines pair in a directory"
+    )
+    parser.add_argument("input_directory")
+    parser.add_argument("output_directory")
+    parser.add_argument("--start-date", type=datetime.fromisoformat, required=True)
+    parser.add_argument("--end-date", type=datetime.fromisoformat, required=True)
+    parser.add_argument("--jobs", type=int, default=None, help="Concurrent solves")
+    parser.add_argument("--threads", type=int, default=None, help="Total CPU threads")
+    parser.add_argument(
+        "--time-limit", type=float, default=None, help="Solver seconds per job"
+    )
+    parser.add_argument(
+        "--memory-limit-mb", type=int, default=None, help="Address space per job"
+    )
+    parser.add_argument(
+        "--wall-clock-limit",
+        type=float,
+        default=None,
+        help="Seconds after which a job is killed, with or without a time limit",
+    )
+    arguments = parser.parse_args()
+
+    BatchRunner(
+        planning_horizon=(arguments.start_date, arguments.end_date),
+        output_directory=arguments.output_directory,
+        max_jobs=arguments.jobs,
+        time_limit=arguments.time_limit,
+        memory_limit_bytes=(
+            arguments.memory_limit_mb * 1024 * 1024
+            if arguments.memory_limit_mb is not None
+            else None
+        ),
+        total_threads=arguments.threads,
+        wall_clock_limit=arguments.wall_clock_limit,
+    ).run(discover_instances(arguments.input_directory))
@@ -0,0 +1,61 @@
+import argparse
+
+from optimization.evaluation.benchmark import STRATEGIES, BenchmarkSuite
+from optimization.model.backends import BACKENDS
+from optimization.solver.solve_options import SolveOptions
+
+
+def parse_size(size: str):
+    tasks, machines = size.split("x")
+    return int(tasks), int(machines)
+
+
+parser = argparse.ArgumentParser(
+    description="Time and memory-profile each phase of a solve on synthetic instances"
+)
+parser.add_argument(
+    "--sizes",
+    nargs="+",
+    type=parse_size,
+    default=[(3, 2), (6, 2), (10, 3), (20, 4)],
+    help="Instance sizes as TASKSxMACHINES",
+)
+parser.add_argument(
+    "--strategies",
+    nargs="+",
+    choices=sorted(STRATEGIES),
+    default=["none", "exhaustive", "sampling-10"],
+)
+parser.add_argument("--seeds", nargs="+", type=int, default=[0])
+parser.add_argument(
+    "--backends",
+    nargs="+",
+    choices=sorted(BACKENDS),
+    default=["scip"],
+    help="Backends to compare on each case",
+)
+parser.add_argument("--time-limit", type=float, default=60)
+parser.add_argument("--no-solve", action="store_true", help="Only build the models")
+parser.add_argument(
+    "--no-memory",
+    action="store_true",
+    help="Skip the tracemalloc run that measures peak memory per phase",
+)
+parser.add_argument(
+    "--replan",
+    action="store_true",
+    help="Also time the incremental re-plan after an observed delay on scip",
+)
+parser.add_argument("--output", default="benchmarks/results.jsonl")
+arguments = parser.parse_args()
+
+BenchmarkSuite(
+    sizes=arguments.sizes,
+    strategies=arguments.strategies,
+    seeds=arguments.seeds,
+    backends=arguments.backends,
+    solve=not arguments.no_solve,
+    solve_options=SolveOptions(time_limit=arguments.time_limit),
+    measure_memory=not arguments.no_memory,
+    replan=arguments.replan,
+).run(arguments.output)
@@ -0,0 +1,85 @@
+"""
+Interns capabilities into bit positions, so sets of capabilities become bitmasks
+"""
+from typing import Dict, Iterable, List, Set
+
+import numpy as np
+
+from optimization.domain.capability import Capability
+
+WORD_BITS = 64
+
+
+class CapabilityIndex:
+    """
+    A set of capabilities is stored as a row of uint64 words, one bit per interned
+    capability, so any number of capabilities is supported
+    """
+
+    def __init__(self, capabilities: Iterable[Capability] = ()):
+        self.positions: Dict[Capability, int] = {}
+        for capability in capabilities:
+            self.intern(capability)
+
+    def intern(self, capability: Capability) -> int:
+        if capability not in self.positions:
+            self.positions[capability] = len(self.positions)
+        return self.positions[capability]
+
+    @property
+    def number_of_words(self) -> int:
+        return max(1, -(-len(self.positions) // WORD_BITS))
+
+    def masks(self, capability_sets: List[Set[Capability]]) -> np.ndarray:
+        """
+        One row of words per capability set. Capabilities seen for the first time
+        are interned on the way.
+        """
+        positions = [
+            [self.intern(capability) for capability in capability_set]
+            for capability_set in capability_sets
+        ]
+        rows = np.repeat(
+            np.arange(len(positions)), [len(row) for row in positions]
+        ).astype(np.int64)
+        bits = np.fromiter(
+            (position for row in positions for position in row),
+            dtype=np.int64,
+            count=len(rows),
+        )
+
+        masks = np.zeros((len(positions), self.number_of_words), dtype=np.uint64)
+        np.bitwise_or.at(
+            masks,
+            (rows, bits // WORD_BITS),
+            np.left_shift(np.uint64(1), (bits % WORD_BITS).astype(np.uint64)),
+        )
+        return masks
+
+    @staticmethod
+    def compatibility_matrix(
+        machine_masks: np.ndarray, task_masks: np.ndarray, block_size: int = 1 << 22
+    ) -> np.ndarray:
+        """
+        Boolean M x S matrix, true where the machine has every capability the task
+        requires. Machines are processed in blocks of about block_size words so the
+        intermediate array stays bounded.
+        """
+        words = max(machine_masks.shape[1], task_masks.shape[1])
+        machine_masks = _pad_words(machine_masks, words)
+        task_masks = _pad_words(task_masks, words)
+
+        compatible = np.empty((len(machine_masks), len(task_masks)), dtype=bool)
+        machines_per_block = max(1, block_size // max(1, len(task_masks) * words))
+        for start in range(0, len(machine_masks), machines_per_block):
+            block = machine_masks[start : start + machines_per_block]
+            missing = task_masks[np.newaxis, :, :] & ~block[:, np.newaxis, :]
+            compatible[start : start + len(block)] = ~missing.any(axis=2)
+        return compatible
+
+
+def _pad_words(masks: np.ndarray, words: int) -> np.ndarray:
+    if masks.shape[1] == words:
+        return masks
+
+    return np.pad(masks, ((0, 0), (0, words - masks.shape[1])))
@@ -0,0 +1,178 @@
+"""
+A struct-of-arrays Instance: one NumPy array per task and machine field, with
+lightweight per-task and per-machine views for code that expects Task and Machine
+"""
+from datetime import datetime
+from typing import List, Sequence, Set, Tuple
+
+import numpy as np
+
+from optimization.domain.capability import Capability
+from optimization.domain.capability_index import WORD_BITS, CapabilityIndex
+from optimization.domain.instance import Instance
+
+
+class TaskView:
+    __slots__ = ("instance", "index")
+
+    def __init__(self, instance: "ColumnarInstance", index: int):
+        self.instance = instance
+        self.index = index
+
+    @property
+    def name(self) -> str:
+        return self.instance.task_names[self.index]
+
+    @property
+    def delay_probability(self) -> float:
+        return float(self.instance.delay_probability[self.index])
+
+    @property
+    def base_duration(self) -> int:
+        return int(self.instance.base_duration[self.index])
+
+    @property
+    def delayed_duration(self) -> int:
+        return int(self.instance.delayed_duration[self.index])
+
+    @property
+    def target_date(self) -> datetime:
+        return self.instance.target_date[self.index].astype("datetime64[us]").item()
+
+    @property
+    def early_penalty(self) -> float:
+        return float(self.instance.early_penalty[self.index])
+
+    @property
+    def late_penalty(self) -> float:
+        return float(self.instance.late_penalty[self.index])
+
+    @property
+    def required_capabilities(self) -> Set[Capability]:
+        return self.instance.decode_mask(self.instance.task_masks[self.index])
+
+
+class MachineView:
+    __slots__ = ("instance", "index")
+
+    def __init__(self, instance: "ColumnarInstance", index: int):
+        self.instance = instance
+        self.index = index
+
+    @property
+    def name(self) -> str:
+        return self.instance.machine_names[self.index]
+
+    @property
+    def capabilities(self) -> Set[Capability]:
+        return self.instance.decode_mask(self.instance.machine_masks[self.index])
+
+
+class ColumnViews(Sequence):
+    """
+    A read-only sequence of views over the rows of a ColumnarInstance, created on
+    access
+    """
+
+    __slots__ = ("instance", "view", "length")
+
+    def __init__(self, instance: "ColumnarInstance", view, length: int):
+        self.instance = instance
+        self.view = view
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(*index.indices(self.length))
+            return [self.view(self.instance, i) for i in indices]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+        return self.view(self.instance, index)
+
+
+class ColumnarInstance(Instance):
+    """
+    Durations are int64, probabilities and penalties float64, target dates
+    datetime64[D], and capability sets bitmask rows of a shared CapabilityIndex.
+    tasks and machines are views, so code written against Instance keeps working.
+    """
+
+    def __init__(
+        self,
+        task_names: List[str],
+        delay_probability: np.ndarray,
+        base_duration: np.ndarray,
+        delayed_duration: np.ndarray,
+        target_date: np.ndarray,
+        early_penalty: np.ndarray,
+        late_penalty: np.ndarray,
+        task_masks: np.ndarray,
+        machine_names: List[str],
+        machine_masks: np.ndarray,
+        capability_index: CapabilityIndex,
+        planning_horizon: Tuple[datetime, datetime],
+    ):
+        self.task_names = task_names
+        self.delay_probability = np.asarray(delay_probability, dtype=np.float64)
+        self.base_duration = np.asarray(base_duration, dtype=np.int64)
+        self.delayed_duration = np.asarray(delayed_duration, dtype=np.int64)
+        self.target_date = np.asarray(target_date, dtype="datetime64[D]")
+        self.early_penalty = np.asarray(early_penalty, dtype=np.float64)
+        self.late_penalty = np.asarray(late_penalty, dtype=np.float64)
+        self.task_masks = task_masks
+        self.machine_names = machine_names
+        self.machine_masks = machine_masks
+        self.capability_index = capability_index
+        self.capabilities = list(capability_index.positions)
+        self.planning_horizon = planning_horizon
+        self.tasks = ColumnViews(self, TaskView, len(task_names))
+        self.machines = ColumnViews(self, MachineView, len(machine_names))
+
+    @staticmethod
+    def from_instance(instance: Instance) -> "ColumnarInstance":
+        """
+        Compatibility path from an Instance built of Task and Machine objects
+        """
+        capability_index = CapabilityIndex(instance.capabilities)
+        tasks = instance.tasks
+        return ColumnarInstance(
+            task_names=[task.name for task in tasks],
+            delay_probability=[task.delay_probability for task in tasks],
+            base_duration=[task.base_duration for task in tasks],
+            delayed_duration=[task.delayed_duration for task in tasks],
+            target_date=[np.datetime64(task.target_date, "D") for task in tasks],
+            early_penalty=[task.early_penalty for task in tasks],
+            late_penalty=[task.late_penalty for task in tasks],
+            task_masks=capability_index.masks(
+                [task.required_capabilities for task in tasks]
+            ),
+            machine_names=[machine.name for machine in instance.machines],
+            machine_masks=capability_index.masks(
+                [machine.capabilities for machine in instance.machines]
+            ),
+            capability_index=capability_index,
+            planning_horizon=instance.planning_horizon,
+        )
+
+    def target_days(self) -> np.ndarray:
+        """
+        Target dates as whole days from the start of the planning horizon
+        """
+        start = np.datetime64(self.planning_horizon[0], "D")
+        return (self.target_date - start).astype(np.int64)
+
+    def compatibility_matrix(self) -> np.ndarray:
+        return CapabilityIndex.compatibility_matrix(self.machine_masks, self.task_masks)
+
+    def decode_mask(self, mask: np.ndarray) -> Set[Capability]:
+        return {
+            capability
+            for capability, position in self.capability_index.positions.items()
+            if position // WORD_BITS < len(mask)
+            and int(mask[position // WORD_BITS]) >> (position % WORD_BITS) & 1
+        }
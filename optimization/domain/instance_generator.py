@@ -0,0 +1,128 @@
+"""
+Seeded generator of synthetic instances, for benchmarks and scaling experiments
+"""
+from datetime import datetime, timedelta
+from typing import Tuple
+from uuid import UUID
+
+import numpy as np
+
+from optimization.domain.capability import Capability
+from optimization.domain.instance import Instance
+from optimization.domain.machine import Machine
+from optimization.domain.task import Task
+
+
+class InstanceGenerator:
+    """
+    Every task requires a subset of the capabilities of one randomly chosen machine,
+    so each task can run on at least one machine. The same seed always gives the
+    same instance.
+    """
+
+    def __init__(
+        self,
+        number_of_tasks: int,
+        number_of_machines: int,
+        number_of_capabilities: int = 3,
+        capabilities_per_machine: int = 2,
+        capabilities_per_task: int = 1,
+        delay_probability: Tuple[float, float] = (0.05, 0.5),
+        base_duration: Tuple[int, int] = (1, 5),
+        delay_factor: Tuple[float, float] = (1.5, 3.0),
+        horizon_days: int = 45,
+        penalties: Tuple[float, float] = (1.0, 5.0),
+        start_date: datetime = datetime(year=2024, month=1, day=1),
+        seed=None,
+    ):
+        if number_of_tasks < 1 or number_of_machines < 1:
+            raise ValueError("An instance needs at least one task and one machine")
+        if not 1 <= capabilities_per_machine <= number_of_capabilities:
+            raise ValueError(
+                "capabilities_per_machine must be between 1 and number_of_capabilities"
+            )
+        if not 1 <= capabilities_per_task <= capabilities_per_machine:
+            raise ValueError(
+                "capabilities_per_task must be between 1 and capabilities_per_machine"
+            )
+
+        self.number_of_tasks = number_of_tasks
+        self.number_of_machines = number_of_machines
+        self.number_of_capabilities = number_of_capabilities
+        self.capabilities_per_machine = capabilities_per_machine
+        self.capabilities_per_task = capabilities_per_task
+        self.delay_probability = delay_probability
+        self.base_duration = base_duration
+        self.delay_factor = delay_factor
+        self.horizon_days = horizon_days
+        self.penalties = penalties
+        self.start_date = start_date
+        self.seed = seed
+
+    def generate(self) -> Instance:
+        rng = np.random.default_rng(self.seed)
+        capabilities = [
+            Capability(name=f"capability {c}", id=UUID(int=c))
+            for c in range(self.number_of_capabilities)
+        ]
+
+        machine_capabilities = [
+            rng.choice(
+                self.number_of_capabilities,
+                self.capabilities_per_machine,
+                replace=False,
+            )
+            for _ in range(self.number_of_machines)
+        ]
+        machines = [
+            Machine(
+                name=f"machine {m}",
+                capabilities={capabilities[c] for c in machine_capabilities[m]},
+            )
+            for m in range(self.number_of_machines)
+        ]
+
+        n = self.number_of_tasks
+        base_duration = rng.integers(
+            self.base_duration[0], self.base_duration[1], n, endpoint=True
+        )
+        delay_factor = rng.uniform(*self.delay_factor, n)
+        delayed_duration = np.maximum(
+            np.ceil(base_duration * delay_factor).astype(np.int64), base_duration + 1
+        )
+        delay_probability = rng.uniform(*self.delay_probability, n)
+        target_day = rng.integers(0, max(self.horizon_days - base_duration.max(), 1), n)
+        early_penalty = rng.uniform(*self.penalties, n)
+        late_penalty = rng.uniform(*self.penalties, n)
+        host_machine = rng.integers(0, self.number_of_machines, n)
+
+        tasks = [
+            Task(
+                name=f"task {s}",
+                delay_probability=float(delay_probability[s]),
+                base_duration=int(base_duration[s]),
+                delayed_duration=int(delayed_duration[s]),
+                target_date=self.start_date + timedelta(days=int(target_day[s])),
+                early_penalty=float(early_penalty[s]),
+                late_penalty=float(late_penalty[s]),
+                required_capabilities={
+                    capabilities[c]
+                    for c in rng.choice(
+                        machine_capabilities[host_machine[s]],
+                        self.capabilities_per_task,
+                        replace=False,
+                    )
+                },
+            )
+            for s in range(n)
+        ]
+
+        return Instance(
+            tasks=tasks,
+            machines=machines,
+            capabilities=capabilities,
+            planning_horizon=(
+                self.start_date,
+                self.start_date + timedelta(days=self.horizon_days),
+            ),
+        )
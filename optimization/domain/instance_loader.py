@@ -0,0 +1,218 @@
+"""
+Builds an Instance from task and machine tables in CSV, Parquet or Arrow files
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, FrozenSet, Tuple
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+
+from optimization.domain.capability import Capability
+from optimization.domain.capability_index import CapabilityIndex
+from optimization.domain.columnar_instance import ColumnarInstance
+from optimization.domain.instance import Instance
+from optimization.domain.machine import Machine
+from optimization.domain.task import Task
+
+TASK_COLUMNS = [
+    "name",
+    "delay_probability",
+    "base_duration",
+    "delayed_duration",
+    "target_date",
+    "early_penalty",
+    "late_penalty",
+    "required_capabilities",
+]
+MACHINE_COLUMNS = ["name", "capabilities"]
+
+
+class InstanceLoader:
+    """
+    Parses every column at once: dates with a single to_datetime call, and each
+    distinct capability string only once, so rows sharing a capability list share
+    one frozenset. Parquet and Arrow IPC files are memory-mapped when memory_map
+    is set.
+    """
+
+    def __init__(
+        self,
+        planning_horizon: Tuple[datetime, datetime],
+        date_format: str = "%Y-%m-%d",
+        capability_separator: str = ",",
+        memory_map: bool = True,
+    ):
+        self.planning_horizon = planning_horizon
+        self.date_format = date_format
+        self.capability_separator = capability_separator
+        self.memory_map = memory_map
+
+    def read_table(self, path, columns) -> pd.DataFrame:
+        path = Path(path)
+        suffix = path.suffix.lower()
+        if suffix == ".csv":
+            return pd.read_csv(path, usecols=columns)
+
+        if suffix == ".parquet":
+            import pyarrow.parquet as pq
+
+            return pq.read_table(
+                path, columns=columns, memory_map=self.memory_map
+            ).to_pandas()
+
+        if suffix in (".arrow", ".feather", ".ipc"):
+            import pyarrow as pa
+
+            open_file = pa.memory_map if self.memory_map else pa.OSFile
+            with open_file(str(path)) as source:
+                return pa.ipc.open_file(source).read_all().select(columns).to_pandas()
+
+        raise ValueError(f"Unsupported instance file format {path.suffix}")
+
+    def load(self, tasks_path, machines_path) -> Instance:
+        return self.from_tables(
+            self.read_table(tasks_path, TASK_COLUMNS),
+            self.read_table(machines_path, MACHINE_COLUMNS),
+        )
+
+    def from_tables(
+        self, tasks_df: pd.DataFrame, machines_df: pd.DataFrame
+    ) -> Instance:
+        capabilities = self.build_capabilities(
+            pd.concat(
+                [machines_df["capabilities"], tasks_df["required_capabilities"]]
+            )
+        )
+        machine_capabilities = self.parse_capability_column(
+            machines_df["capabilities"], capabilities
+        )
+        task_capabilities = self.parse_capability_column(
+            tasks_df["required_capabilities"], capabilities
+        )
+        target_dates = pd.DatetimeIndex(
+            pd.to_datetime(tasks_df["target_date"], format=self.date_format)
+        ).to_pydatetime()
+
+        tasks = [
+            Task(
+                name=name,
+                delay_probability=delay_probability,
+                base_duration=base_duration,
+                delayed_duration=delayed_duration,
+                target_date=target_date,
+                early_penalty=early_penalty,
+                late_penalty=late_penalty,
+                required_capabilities=required_capabilities,
+            )
+            for (
+                name,
+                delay_probability,
+                base_duration,
+                delayed_duration,
+                target_date,
+                early_penalty,
+                late_penalty,
+                required_capabilities,
+            ) in zip(
+                tasks_df["name"].tolist(),
+                tasks_df["delay_probability"].to_numpy(np.float64).tolist(),
+                tasks_df["base_duration"].to_numpy(np.int64).tolist(),
+                tasks_df["delayed_duration"].to_numpy(np.int64).tolist(),
+                target_dates.tolist(),
+                tasks_df["early_penalty"].to_numpy(np.float64).tolist(),
+                tasks_df["late_penalty"].to_numpy(np.float64).tolist(),
+                task_capabilities,
+            )
+        ]
+        machines = [
+            Machine(name=name, capabilities=machine_capability_set)
+            for name, machine_capability_set in zip(
+                machines_df["name"].tolist(), machine_capabilities
+            )
+        ]
+
+        return Instance(
+            tasks=tasks,
+            machines=machines,
+            capabilities=list(capabilities.values()),
+            planning_horizon=self.planning_horizon,
+        )
+
+    def load_columnar(self, tasks_path, machines_path) -> ColumnarInstance:
+        """
+        Loads the tables straight into a ColumnarInstance, without creating a Task
+        or Machine per row
+        """
+        tasks_df = self.read_table(tasks_path, TASK_COLUMNS)
+        machines_df = self.read_table(machines_path, MACHINE_COLUMNS)
+
+        capabilities = self.build_capabilities(
+            pd.concat(
+                [machines_df["capabilities"], tasks_df["required_capabilities"]]
+            )
+        )
+        capability_index = CapabilityIndex(capabilities.values())
+
+        return ColumnarInstance(
+            task_names=tasks_df["name"].tolist(),
+            delay_probability=tasks_df["delay_probability"].to_numpy(np.float64),
+            base_duration=tasks_df["base_duration"].to_numpy(np.int64),
+            delayed_duration=tasks_df["delayed_duration"].to_numpy(np.int64),
+            target_date=pd.to_datetime(
+                tasks_df["target_date"], format=self.date_format
+            ).to_numpy("datetime64[D]"),
+            early_penalty=tasks_df["early_penalty"].to_numpy(np.float64),
+            late_penalty=tasks_df["late_penalty"].to_numpy(np.float64),
+            task_masks=self.mask_capability_column(
+                tasks_df["required_capabilities"], capabilities, capability_index
+            ),
+            machine_names=machines_df["name"].tolist(),
+            machine_masks=self.mask_capability_column(
+                machines_df["capabilities"], capabilities, capability_index
+            ),
+            capability_index=capability_index,
+            planning_horizon=self.planning_horizon,
+        )
+
+    def build_capabilities(self, column: pd.Series) -> Dict[str, Capability]:
+        names = (
+            column.dropna()
+            .drop_duplicates()
+            .str.split(self.capability_separator)
+            .explode()
+            .str.strip()
+        )
+        return {
+            name: Capability(name=name, id=uuid4())
+            for name in sorted(names[names != ""].unique())
+        }
+
+    def parse_capability_column(
+        self, column: pd.Series, capabilities: Dict[str, Capability]
+    ) -> list:
+        codes, distinct = pd.factorize(column.fillna(""))
+        parsed = [self.parse_capabilities(value, capabilities) for value in distinct]
+        return [parsed[code] for code in codes.tolist()]
+
+    def mask_capability_column(
+        self,
+        column: pd.Series,
+        capabilities: Dict[str, Capability],
+        capability_index: CapabilityIndex,
+    ) -> np.ndarray:
+        codes, distinct = pd.factorize(column.fillna(""))
+        masks = capability_index.masks(
+            [self.parse_capabilities(value, capabilities) for value in distinct]
+        )
+        return masks[codes]
+
+    def parse_capabilities(
+        self, value: str, capabilities: Dict[str, Capability]
+    ) -> FrozenSet[Capability]:
+        return frozenset(
+            capabilities[name.strip()]
+            for name in value.split(self.capability_separator)
+            if name.strip()
+        )
@@ -0,0 +1,252 @@
+"""
+Times and memory-profiles every stage of a stochastic solve over a grid of synthetic
+instance sizes and scenario strategies
+"""
+import json
+import subprocess
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from itertools import product
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from optimization.domain.instance_generator import InstanceGenerator
+from optimization.model.backends import backend
+from optimization.scenarios.exhaustive_strategy import (
+    ExhaustiveScenarioGeneratorStrategy,
+)
+from optimization.scenarios.no_strategy import NoGeneratorStrategy
+from optimization.scenarios.sampling_strategy import SamplingScenarioGeneratorStrategy
+from optimization.scenarios.task_delay_scenario_generator import (
+    TaskDelayScenarioGenerator,
+)
+from optimization.solver.base_model_parameters import BaseModelParametersBuilder
+from optimization.solver.incremental_planner import IncrementalPlanner
+from optimization.solver.solve_options import SolveOptions
+from optimization.solver.stochastic_solver import StochasticSolver
+
+STRATEGIES: Dict[str, Callable[[Optional[int]], object]] = {
+    "none": lambda seed: NoGeneratorStrategy(),
+    "exhaustive": lambda seed: ExhaustiveScenarioGeneratorStrategy(),
+    "sampling-10": lambda seed: SamplingScenarioGeneratorStrategy(10, seed),
+    "sampling-100": lambda seed: SamplingScenarioGeneratorStrategy(100, seed),
+}
+
+
+@dataclass
+class PhaseMeasurement:
+    phase: str
+    seconds: float
+    peak_bytes: Optional[int] = None
+
+
+@dataclass
+class BenchmarkResult:
+    number_of_tasks: int
+    number_of_machines: int
+    strategy: str
+    seed: int
+    backend: str = "scip"
+    number_of_scenarios: int = 0
+    number_of_variables: int = 0
+    number_of_constraints: int = 0
+    objective: Optional[float] = None
+    skipped: Optional[str] = None
+    phases: List[PhaseMeasurement] = field(default_factory=list)
+
+
+def measure_time(result: BenchmarkResult, phase: str, function: Callable):
+    start = time.perf_counter()
+    value = function()
+    result.phases.append(PhaseMeasurement(phase, time.perf_counter() - start))
+    return value
+
+
+def measure_memory(result: BenchmarkResult, phase: str, function: Callable):
+    """
+    Runs function under tracemalloc, recording the peak memory allocated by Python
+    while it ran on the phase's timing measurement
+    """
+    tracemalloc.reset_peak()
+    current, _ = tracemalloc.get_traced_memory()
+    value = function()
+    _, peak = tracemalloc.get_traced_memory()
+    for measurement in result.phases:
+        if measurement.phase == phase:
+            measurement.peak_bytes = peak - current
+    return value
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class BenchmarkSuite:
+    """
+    Each case generates a seeded instance and runs the parameter build, scenario
+    generation, base model construction, expansion and solve as separate measured
+    phases. Exhaustive cases above max_exhaustive_tasks are recorded as skipped.
+    tracemalloc slows Python down severalfold, so phase times come from an untraced
+    run and, with measure_memory, the build phases are repeated under tracemalloc
+    for their peak memory.
+    Running several backends compares their build times on the same cases; a
+    backend that builds lazily is loaded in its own load_model phase. With replan,
+    scip cases also time an IncrementalPlanner: its first plan, and the re-plan
+    after the first task is observed with its delayed duration.
+    """
+
+    def __init__(
+        self,
+        sizes: Iterable[Tuple[int, int]] = ((3, 2), (6, 2), (10, 3), (20, 4)),
+        strategies: Iterable[str] = ("none", "exhaustive", "sampling-10"),
+        seeds: Iterable[int] = (0,),
+        backends: Iterable[str] = ("scip",),
+        solve: bool = True,
+        solve_options: Optional[SolveOptions] = None,
+        max_exhaustive_tasks: int = 10,
+        measure_memory: bool = True,
+        replan: bool = False,
+    ):
+        self.sizes = list(sizes)
+        self.strategies = list(strategies)
+        self.seeds = list(seeds)
+        self.backends = list(backends)
+        self.solve = solve
+        self.solve_options = solve_options or SolveOptions(time_limit=60)
+        self.max_exhaustive_tasks = max_exhaustive_tasks
+        self.measure_memory = measure_memory
+        self.replan = replan
+
+    def run_case(
+        self,
+        number_of_tasks: int,
+        number_of_machines: int,
+        strategy: str,
+        seed: int,
+        backend_name: str = "scip",
+    ) -> BenchmarkResult:
+        result = BenchmarkResult(
+            number_of_tasks, number_of_machines, strategy, seed, backend_name
+        )
+        if strategy == "exhaustive" and number_of_tasks > self.max_exhaustive_tasks:
+            result.skipped = (
+                f"exhaustive enumeration over {self.max_exhaustive_tasks} tasks"
+            )
+            return result
+
+        instance = InstanceGenerator(
+            number_of_tasks, number_of_machines, seed=seed
+        ).generate()
+        scenarios, base_model = self.build(
+            result, instance, strategy, seed, backend_name, measure_time
+        )
+        if self.solve:
+            solution = measure_time(
+                result, "solve", lambda: base_model.solve(self.solve_options)
+            )
+            if solution is not None:
+                result.objective = solution.objective
+            if self.replan and backend_name == "scip":
+                self.measure_replan(result, instance, strategy, seed)
+
+        result.number_of_scenarios = len(scenarios)
+        result.number_of_variables, result.number_of_constraints = (
+            base_model.model_size()
+        )
+
+        if self.measure_memory:
+            tracemalloc.start()
+            try:
+                self.build(
+                    result, instance, strategy, seed, backend_name, measure_memory
+                )
+            finally:
+                tracemalloc.stop()
+        return result
+
+    def measure_replan(self, result, instance, strategy, seed):
+        _, model_expander = backend("scip")
+        solver = StochasticSolver(
+            TaskDelayScenarioGenerator(instance.tasks),
+            STRATEGIES[strategy](seed),
+            BaseModelParametersBuilder(),
+            model_expander,
+            solve_options=self.solve_options,
+        )
+        planner = IncrementalPlanner(solver, instance, verbose=False)
+        measure_time(result, "plan", planner.solve)
+        planner.observe_duration(0, instance.tasks[0].delayed_duration)
+        measure_time(result, "replan", planner.solve)
+
+    @staticmethod
+    def build(result, instance, strategy, seed, backend_name, measure: Callable):
+        scenario_generator = TaskDelayScenarioGenerator(instance.tasks)
+        scenario_strategy = STRATEGIES[strategy](seed)
+        base_model_factory, model_expander = backend(backend_name)
+
+        model_parameters = measure(
+            result,
+            "build_parameters",
+            lambda: BaseModelParametersBuilder().build(instance),
+        )
+        scenarios = measure(
+            result,
+            "generate_scenarios",
+            lambda: list(
+                scenario_strategy.generate_scenarios(scenario_generator, instance)
+            ),
+        )
+        base_model = measure(
+            result,
+            "construct_base_model",
+            lambda: base_model_factory(model_parameters),
+        )
+
+        def expand():
+            for scenario in scenarios:
+                model_expander.expand(base_model, scenario)
+
+        measure(result, "expand", expand)
+        if hasattr(base_model, "load"):
+            measure(result, "load_model", base_model.load)
+        return scenarios, base_model
+
+    def run(self, output) -> List[BenchmarkResult]:
+        """
+        Runs every case of the grid and appends one JSON line per case to output,
+        tagged with the current commit so runs can be compared between commits
+        """
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        commit = current_commit()
+        started_at = datetime.now(timezone.utc).isoformat()
+
+        results = []
+        with output.open("a") as file:
+            for (tasks, machines), strategy, seed, backend_name in product(
+                self.sizes, self.strategies, self.seeds, self.backends
+            ):
+                result = self.run_case(tasks, machines, strategy, seed, backend_name)
+                results.append(result)
+                record = {"commit": commit, "started_at": started_at, **asdict(result)}
+                file.write(json.dumps(record) + "\n")
+                file.flush()
+                print(
+                    f"{tasks} tasks, {machines} machines, {strategy}, {backend_name}: "
+                    + (
+                        f"skipped ({result.skipped})"
+                        if result.skipped
+                        else ", ".join(
+                            f"{phase.phase} {phase.seconds:.3f}s"
+                            for phase in result.phases
+                        )
+                    )
+                )
+        return results
@@ -0,0 +1,65 @@
+"""
+A fixed first-stage plan: which machine runs each task, in which order, and when it is planned to start
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from optimization.solver.base_model_parameters import BaseModelParameters
+from optimization.solver.solution import Solution
+
+
+@dataclass
+class Schedule:
+    machine_sequences: Dict[int, List[int]]
+    planned_start: np.ndarray
+    target_execution_times: np.ndarray
+    delay_costs: np.ndarray
+    advance_costs: np.ndarray
+
+    @staticmethod
+    def build(
+        model_parameters: BaseModelParameters,
+        assignment: Dict[int, int],
+        order: Iterable[Tuple[int, int]],
+        planned_start: Dict[int, float],
+    ) -> "Schedule":
+        predecessors = {s: 0 for s in model_parameters.S}
+        for s, r in order:
+            if assignment[s] == assignment[r]:
+                predecessors[r] += 1
+
+        machine_sequences = {m: [] for m in model_parameters.M}
+        for s in sorted(model_parameters.S, key=lambda s: predecessors[s]):
+            machine_sequences[assignment[s]].append(s)
+
+        return Schedule(
+            machine_sequences=machine_sequences,
+            planned_start=np.array(
+                [planned_start[s] for s in model_parameters.S], dtype=np.float64
+            ),
+            target_execution_times=np.array(
+                [model_parameters.target_execution_times[s] for s in model_parameters.S],
+                dtype=np.float64,
+            ),
+            delay_costs=np.array(
+                [model_parameters.delay_costs[s] for s in model_parameters.S],
+                dtype=np.float64,
+            ),
+            advance_costs=np.array(
+                [model_parameters.advance_costs[s] for s in model_parameters.S],
+                dtype=np.float64,
+            ),
+        )
+
+    @staticmethod
+    def from_solution(
+        solution: Solution, model_parameters: BaseModelParameters
+    ) -> "Schedule":
+        return Schedule.build(
+            model_parameters,
+            dict(enumerate(solution.machine_assignment.tolist())),
+            map(tuple, solution.task_order.tolist()),
+            dict(enumerate(solution.start.tolist())),
+        )
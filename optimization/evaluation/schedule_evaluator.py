@@ -0,0 +1,93 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from optimization.evaluation.schedule import Schedule
+
+
+@dataclass
+class ScheduleEvaluation:
+    number_of_scenarios: int
+    mean: float
+    quantiles: Dict[float, float]
+    cvar_alpha: float
+    cvar: float
+    mean_earliness: np.ndarray
+    mean_lateness: np.ndarray
+    costs: np.ndarray
+
+
+def simulate_schedule(
+    schedule: Schedule, durations: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Replays the schedule for every row of the duration matrix at once. Each task starts
+    at its planned start, or as soon as its predecessor on the same machine ends.
+    """
+    number_of_scenarios = durations.shape[0]
+    start = np.empty(durations.shape, dtype=np.float64)
+    for sequence in schedule.machine_sequences.values():
+        machine_free = np.zeros(number_of_scenarios)
+        for s in sequence:
+            start[:, s] = np.maximum(schedule.planned_start[s], machine_free)
+            machine_free = start[:, s] + durations[:, s]
+
+    earliness = np.maximum(schedule.target_execution_times - start, 0)
+    lateness = np.maximum(start - schedule.target_execution_times, 0)
+    return start, earliness, lateness
+
+
+def _evaluate_chunk(schedule: Schedule, durations: np.ndarray):
+    _, earliness, lateness = simulate_schedule(schedule, durations)
+    costs = earliness @ schedule.advance_costs + lateness @ schedule.delay_costs
+    return costs, earliness.sum(axis=0), lateness.sum(axis=0)
+
+
+class MonteCarloScheduleEvaluator:
+    def __init__(
+        self,
+        quantiles: Sequence[float] = (0.5, 0.9, 0.95, 0.99),
+        cvar_alpha: float = 0.95,
+        chunk_size: int = 100_000,
+        max_workers: Optional[int] = None,
+    ):
+        self.quantiles = quantiles
+        self.cvar_alpha = cvar_alpha
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+
+    def evaluate(self, schedule: Schedule, durations: np.ndarray) -> ScheduleEvaluation:
+        if durations.shape[0] == 0:
+            raise ValueError("Evaluating a schedule needs at least one scenario")
+
+        chunks = [
+            durations[start : start + self.chunk_size]
+            for start in range(0, durations.shape[0], self.chunk_size)
+        ]
+        evaluate_chunk = partial(_evaluate_chunk, schedule)
+
+        if self.max_workers == 1 or len(chunks) <= 1:
+            results = list(map(evaluate_chunk, chunks))
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(evaluate_chunk, chunks))
+
+        costs = np.concatenate([result[0] for result in results])
+        value_at_risk = np.quantile(costs, self.cvar_alpha)
+
+        return ScheduleEvaluation(
+            number_of_scenarios=len(costs),
+            mean=float(costs.mean()),
+            quantiles={
+                q: float(value)
+                for q, value in zip(self.quantiles, np.quantile(costs, self.quantiles))
+            },
+            cvar_alpha=self.cvar_alpha,
+            cvar=float(costs[costs >= value_at_risk].mean()),
+            mean_earliness=sum(result[1] for result in results) / len(costs),
+            mean_lateness=sum(result[2] for result in results) / len(costs),
+            costs=costs,
+        )
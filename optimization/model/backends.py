@@ -0,0 +1,26 @@
+"""
+The model backends StochasticSolver can build on, as a base model factory and a matching sub-model expander
+"""
+from optimization.model.base_model import BaseModel
+from optimization.model.changed_task_duration_submodel import (
+    ChangedTaskDurationSubModelExpander,
+)
+from optimization.model.cp_sat_model import CpSatBaseModel, CpSatSubModelExpander
+from optimization.model.matrix_base_model import MatrixBaseModel
+from optimization.model.matrix_changed_task_duration_submodel import (
+    MatrixChangedTaskDurationSubModelExpander,
+)
+
+BACKENDS = {
+    "scip": (BaseModel, ChangedTaskDurationSubModelExpander),
+    "scip-matrix": (MatrixBaseModel, MatrixChangedTaskDurationSubModelExpander),
+    "cp-sat": (CpSatBaseModel, CpSatSubModelExpander),
+}
+
+
+def backend(name: str):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend {name}, choose one of {sorted(BACKENDS)}")
+
+    base_model_factory, model_expander_class = BACKENDS[name]
+    return base_model_factory, model_expander_class()
@@ -1,18 +1,38 @@
-from ortools.linear_solver import pywraplp
+import math
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+from ortools.linear_solver import linear_solver_pb2, pywraplp
 
 from optimization.solver.base_model_parameters import BaseModelParameters
+from optimization.solver.instrumentation import NULL_INSTRUMENTATION, Instrumentation
+from optimization.solver.solution import Solution, SolutionLayout, SolverOutput
+from optimization.solver.solve_options import Incumbent, SolveOptions
 
 
 class BaseModel:
 
 
-    def __init__(self, model_parameters: BaseModelParameters):
+    def __init__(
+        self,
+        model_parameters: BaseModelParameters,
+        instrumentation: Instrumentation = NULL_INSTRUMENTATION,
+        keep_constraints: bool = False,
+    ):
         self.model_parameters = model_parameters
+        self.instrumentation = instrumentation
+        # Constraint handles are only kept for models that are updated in place
+        self.keep_constraints = keep_constraints
         self.end_date = self.model_parameters.end_date
         self.model = pywraplp.Solver.CreateSolver("SCIP")
         self.variables = {}
         self.constraints = {}
         self.objective = None
+        self.first_stage_hint = None
+        self.status = None
+        self.contiguous_layout = True
+        self.best_output = None
         self._create_variables()
         self._create_constraints()
         self._create_objective()
@@ -31,121 +51,367 @@ class BaseModel:
         for s, t in self.model_parameters.j:
             self.j[s, t] = self.model.IntVar(0, 1, f"j_{s}_{t}")
 
-        for s in self.model_parameters.S:
-            self.s_advance[s] = self.model.IntVar(0, self.end_date, f"s+_{s}")
-            self.s_delay[s] = self.model.IntVar(0, self.end_date, f"s-_{s}")
-            self.s_t[s] = self.model.IntVar(0, self.end_date, f"s_{s}")
+        self.s_advance, self.s_delay, self.s_t = self.create_task_variables("")
+
+    def start_window(self, s):
+        if self.model_parameters.earliest_start is None:
+            return 0, self.end_date
+
+        return (
+            self.model_parameters.earliest_start[s],
+            self.model_parameters.latest_start[s],
+        )
+
+    def big_m(self, s, r):
+        if self.model_parameters.big_m is None:
+            return self.end_date
+
+        return int(self.model_parameters.big_m[s, r])
+
+    def create_task_variables(self, prefix, tasks=None):
+        # Each family is created as one contiguous block, see SolutionLayout
+        S = self.model_parameters.S if tasks is None else tasks
+        # pywraplp only takes Python numbers, not the NumPy scalars of array inputs
+        targets = {s: int(self.model_parameters.target_execution_times[s]) for s in S}
+        windows = {s: tuple(map(int, self.start_window(s))) for s in S}
+        advance_upper = {
+            s: max(0, min(self.end_date, targets[s] - windows[s][0])) for s in S
+        }
+        delay_upper = {
+            s: max(0, min(self.end_date, windows[s][1] - targets[s])) for s in S
+        }
+
+        s_advance = {
+            s: self.model.IntVar(0, advance_upper[s], f"{prefix}s+_{s}") for s in S
+        }
+        s_delay = {s: self.model.IntVar(0, delay_upper[s], f"{prefix}s-_{s}") for s in S}
+        s_t = {s: self.model.IntVar(*windows[s], f"{prefix}s_{s}") for s in S}
+
+        return s_advance, s_delay, s_t
 
     def _create_constraints(self):
-        self._create_overlap_constraints()
-        self._create_advance_constraints()
-        self._create_delay_constraints()
-        self._create_machine_assignment_constraints()
-        self._create_asymmetric_task_sequence_constraints()
-        self._create_task_sequence_requirement_constraints()
+        constraint_families = {
+            "overlap": self._create_overlap_constraints,
+            "advance": self._create_advance_constraints,
+            "delay": self._create_delay_constraints,
+            "machine_assignment": self._create_machine_assignment_constraints,
+            "asymmetric_task_sequence": self._create_asymmetric_task_sequence_constraints,
+            "task_sequence_requirement": self._create_task_sequence_requirement_constraints,
+        }
+        for family, create_constraints in constraint_families.items():
+            with self.instrumentation.phase("constraints", family=family):
+                with self.instrumentation.size_change(self, family=family):
+                    create_constraints()
+
+    def keep_constraint(self, constraints: dict, key: tuple, constraint):
+        if self.keep_constraints:
+            constraints[key] = constraint
 
     def _create_overlap_constraints(self):
-        for (s, r), j_sr in self.j.items():
-            self.model.Add(
-                self.s_t[s] + self.model_parameters.task_duration[s]
-                <= self.s_t[r] + self.end_date * (1 - j_sr),
-                f"overlap_{s}_{r}_duration_{self.model_parameters.task_duration[s]}",
-            )
+        for s, r in self.j:
+            self.add_overlap_constraint(s, r)
+
+    def add_overlap_constraint(self, s, r):
+        duration = int(self.model_parameters.task_duration[s])
+        constraint = self.model.Add(
+            self.s_t[s] + duration
+            <= self.s_t[r] + self.big_m(s, r) * (1 - self.j[s, r]),
+            f"overlap_{s}_{r}_duration_{duration}",
+        )
+        self.keep_constraint(self.constraints, ("overlap", s, r), constraint)
 
     def _create_advance_constraints(self):
         for s in self.model_parameters.S:
-            self.model.Add(
-                self.model_parameters.target_execution_times[s] - self.s_t[s]
-                <= self.s_advance[s],
-                f"advance_{s}",
-            )
+            self.add_advance_constraint(s)
+
+    def add_advance_constraint(self, s):
+        constraint = self.model.Add(
+            int(self.model_parameters.target_execution_times[s]) - self.s_t[s]
+            <= self.s_advance[s],
+            f"advance_{s}",
+        )
+        self.keep_constraint(self.constraints, ("advance", s), constraint)
 
     def _create_delay_constraints(self):
         for s in self.model_parameters.S:
-            self.model.Add(
-                self.s_t[s] - self.model_parameters.target_execution_times[s]
-                <= self.s_delay[s],
-                f"delay_{s}",
-            )
+            self.add_delay_constraint(s)
+
+    def add_delay_constraint(self, s):
+        constraint = self.model.Add(
+            self.s_t[s] - int(self.model_parameters.target_execution_times[s])
+            <= self.s_delay[s],
+            f"delay_{s}",
+        )
+        self.keep_constraint(self.constraints, ("delay", s), constraint)
 
     def _create_machine_assignment_constraints(self):
         for s in self.model_parameters.S:
-            constraint_expr = []
-            for m in self.model_parameters.M:
-                if (m, s) in self.y:
-                    constraint_expr.append(self.y[m, s])
+            self.add_machine_assignment_constraint(s)
 
-            self.model.Add(sum(constraint_expr) == 1)
+    def add_machine_assignment_constraint(self, s):
+        constraint_expr = []
+        for m in self.model_parameters.M:
+            if (m, s) in self.y:
+                constraint_expr.append(self.y[m, s])
+
+        constraint = self.model.Add(sum(constraint_expr) == 1)
+        self.keep_constraint(self.constraints, ("machine_assignment", s), constraint)
 
     def _create_asymmetric_task_sequence_constraints(self):
-        for s in self.model_parameters.S:
-            for t in self.model_parameters.S:
-                if s != t and (s, t) in self.j and (t, s) in self.j:
-                    self.model.Add(
-                        self.j[s, t] + self.j[t, s] <= 1,
-                        f"asymmetric_task_sequence_{s}_{t}",
-                    )
+        for s, t in self.model_parameters.task_pairs:
+            self.add_asymmetric_task_sequence_constraint(s, t)
+
+    def add_asymmetric_task_sequence_constraint(self, s, t):
+        if (s, t) not in self.j or (t, s) not in self.j:
+            return
+
+        constraint = self.model.Add(
+            self.j[s, t] + self.j[t, s] <= 1,
+            f"asymmetric_task_sequence_{s}_{t}",
+        )
+        self.keep_constraint(
+            self.constraints, ("asymmetric_task_sequence", s, t), constraint
+        )
 
     def _create_task_sequence_requirement_constraints(self):
-        for s in self.model_parameters.S:
-            for t in self.model_parameters.S:
-                if s != t and (s, t) in self.j and (t, s) in self.j:
-                    for m in self.model_parameters.M:
-                        if (m, s) in self.y and (m, t) in self.y:
-                            self.model.Add(
-                                self.y[m, s] + self.y[m, t] - 1
-                                <= self.j[s, t] + self.j[t, s],
-                                f"task_sequence_requirement_{s}_{t}_{m}",
-                            )
+        for (s, t), machines in self.model_parameters.task_pairs.items():
+            for m in machines:
+                self.add_task_sequence_requirement_constraint(s, t, m)
+
+    def add_task_sequence_requirement_constraint(self, s, t, m):
+        constraint = self.model.Add(
+            self.y[m, s] + self.y[m, t] - 1
+            <= self.j.get((s, t), 0) + self.j.get((t, s), 0),
+            f"task_sequence_requirement_{s}_{t}_{m}",
+        )
+        self.keep_constraint(
+            self.constraints, ("task_sequence_requirement", s, t, m), constraint
+        )
 
     def _create_objective(self):
         self.objective = self.model.Objective()
         for s in self.model_parameters.S:
             self.objective.SetCoefficient(
-                self.s_advance[s], self.model_parameters.advance_costs[s]
+                self.s_advance[s], float(self.model_parameters.advance_costs[s])
             )
             self.objective.SetCoefficient(
-                self.s_delay[s], self.model_parameters.delay_costs[s]
+                self.s_delay[s], float(self.model_parameters.delay_costs[s])
             )
 
-    def solve(self):
+    def add_machine_release_constraints(self, release_times: dict):
+        """
+        A task assigned to machine m starts no earlier than release_times[m], in the
+        first stage and in every scenario
+        """
+        start_times = [self.s_t] + [
+            sub_model.s_t for sub_model in self.sub_models.values()
+        ]
+        for (m, s), y_ms in self.y.items():
+            release = release_times.get(m, 0)
+            if release <= 0:
+                continue
+
+            for s_t in start_times:
+                self.model.Add(s_t[s] >= release * y_ms, f"release_{m}_{s}")
+
+    def add_machine_symmetry_constraints(self, machine_classes: List[List[int]]):
+        """
+        Within each class of identical machines m_1, ..., m_k, and with the tasks
+        they can run in index order, a task goes to m_i only if m_(i-1) already runs
+        an earlier task. Running counts of the earlier tasks per machine keep this
+        linear in the number of tasks.
+        """
+        for machines in machine_classes:
+            tasks = sorted(s for m, s in self.y if m == machines[0])
+            for previous, m in zip(machines, machines[1:]):
+                earlier = 0
+                for q, s in enumerate(tasks):
+                    self.model.Add(self.y[m, s] <= earlier, f"symmetry_{m}_{s}")
+                    count = self.model.NumVar(0, q + 1, f"earlier_{previous}_{s}")
+                    self.model.Add(count == earlier + self.y[previous, s])
+                    earlier = count
+
+    def fix_identical_task_order(self, task_classes: List[List[int]]):
+        """
+        Identical tasks run in index order whenever they share a machine
+        """
+        for tasks in task_classes:
+            for a, s in enumerate(tasks):
+                for t in tasks[a + 1 :]:
+                    if (t, s) in self.j:
+                        self.j[t, s].SetBounds(0, 0)
 
-        status = self.model.Solve()
+    def model_size(self):
+        return self.model.NumVariables(), self.model.NumConstraints()
 
-        if status == pywraplp.Solver.OPTIMAL:
-            return self._extract_variables()
+    def first_stage_values(self):
+        return (
+            {key: round(y_ms.solution_value()) for key, y_ms in self.y.items()},
+            {key: round(j_sr.solution_value()) for key, j_sr in self.j.items()},
+        )
+
+    def set_first_stage_hint(self, y_values: dict, j_values: dict):
+        self.first_stage_hint = (y_values, j_values)
+
+    def _apply_first_stage_hint(self):
+        if self.first_stage_hint is None:
+            return
+
+        y_values, j_values = self.first_stage_hint
+        variables = []
+        values = []
+        for key, value in y_values.items():
+            if key in self.y:
+                variables.append(self.y[key])
+                values.append(value)
+        for key, value in j_values.items():
+            if key in self.j:
+                variables.append(self.j[key])
+                values.append(value)
+
+        self.model.SetHint(variables, values)
+
+    def export_model(self) -> bytes:
+        self._apply_first_stage_hint()
+        model_proto = linear_solver_pb2.MPModelProto()
+        self.model.ExportModelToProto(model_proto)
+        return model_proto.SerializeToString()
+
+    @staticmethod
+    def configure(model: pywraplp.Solver, options: SolveOptions, time_limit=None):
+        if time_limit is not None:
+            model.SetTimeLimit(int(time_limit * 1000))
+        if options.num_threads is not None:
+            model.SetNumThreads(options.num_threads)
+        model.SetSolverSpecificParametersAsString(options.solver_specific_parameters)
+
+        parameters = pywraplp.MPSolverParameters()
+        if options.relative_gap is not None:
+            parameters.SetDoubleParam(
+                pywraplp.MPSolverParameters.RELATIVE_MIP_GAP, options.relative_gap
+            )
+        return parameters
+
+    @staticmethod
+    def solve_serialized(
+        serialized_model: bytes, options: Optional[SolveOptions] = None
+    ) -> Optional[SolverOutput]:
+        options = options or SolveOptions()
+        model = pywraplp.Solver.CreateSolver("SCIP")
+        model_proto = linear_solver_pb2.MPModelProto.FromString(serialized_model)
+        error = model.LoadModelFromProto(model_proto)
+        if error:
+            raise ValueError(f"Could not load the model: {error}")
+
+        status = model.Solve(BaseModel.configure(model, options, options.time_limit))
+
+        if status in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+            return BaseModel.solver_output(model, status)
 
         else:
-            print("The problem does not have an optimal solution.")
+            print("The problem does not have a feasible solution.")
             return None
 
-    def _extract_variables(self):
-        print("Solution:")
-        print("Objective value =", self.model.Objective().Value())
-        for s in self.model_parameters.S:
-            for m in self.model_parameters.M:
-                if self.y[m, s].solution_value() > 0:
-                    print(f"Task {s} is assigned to machine {m}")
+    @staticmethod
+    def solver_output(model: pywraplp.Solver, status) -> SolverOutput:
+        response = linear_solver_pb2.MPSolutionResponse()
+        model.FillSolutionResponseProto(response)
+        return SolverOutput(
+            status="optimal" if status == pywraplp.Solver.OPTIMAL else "feasible",
+            objective=response.objective_value,
+            bound=response.best_objective_bound,
+            values=np.array(response.variable_value, dtype=np.float64),
+        )
 
-        for s in self.model_parameters.S:
-            for r in self.model_parameters.S:
-                if r != s and self.j[s, r].solution_value() > 0:
-                    print(f"Task {s} is executed before task {r}")
+    def solution_layout(self) -> SolutionLayout:
+        return SolutionLayout.from_model(
+            self, lambda variable: variable.index(), self.contiguous_layout
+        )
 
-        for s in self.model_parameters.S:
-            print(f"Task {s} starts at {self.s_t[s].solution_value()}")
+    def incumbents(self, options: Optional[SolveOptions] = None, first_time_slice=1.0):
+        """
+        Yields every improving solution with its objective and bound. SCIP offers no
+        solution callback through pywraplp, so the search runs in time slices of
+        doubling length, each one hinted with the previous incumbent, until the
+        problem is solved, the gap target is met or the time limit runs out. The best
+        solution found so far is kept in best_output.
+        """
+        options = options or SolveOptions()
+        self.best_output = None
+        self._apply_first_stage_hint()
+        start = time.perf_counter()
+        time_slice = first_time_slice
+        best_objective = math.inf
 
-        for s in self.model_parameters.S:
-            print(
-                f"Task {s} ends at {self.s_t[s].solution_value() + self.model_parameters.task_duration[s]}"
+        while True:
+            time_limit = time_slice
+            if options.time_limit is not None:
+                remaining = options.time_limit - (time.perf_counter() - start)
+                if remaining <= 0:
+                    return
+                time_limit = min(time_slice, remaining)
+
+            # SCIP cannot always resume an interrupted solve, so each slice starts
+            # from a fresh extraction of the model
+            parameters = self.configure(self.model, options, time_limit)
+            parameters.SetIntegerParam(
+                pywraplp.MPSolverParameters.INCREMENTALITY,
+                pywraplp.MPSolverParameters.INCREMENTALITY_OFF,
             )
+            self.status = self.model.Solve(parameters)
+            if self.status not in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+                if self.status != pywraplp.Solver.NOT_SOLVED:
+                    return
+                time_slice *= 2
+                continue
 
-        for s in self.model_parameters.S:
-            print(f"Task {s} is delayed by {self.s_delay[s].solution_value()}")
+            output = self.solver_output(self.model, self.status)
+            if output.objective < best_objective:
+                best_objective = output.objective
+                self.best_output = output
+                yield Incumbent(
+                    output.objective, output.bound, time.perf_counter() - start
+                )
 
-        for s in self.model_parameters.S:
-            print(f"Task {s} is advanced by {self.s_advance[s].solution_value()}")
+            gap_reached = options.relative_gap is not None and abs(
+                output.objective - output.bound
+            ) <= options.relative_gap * max(abs(output.objective), 1e-9)
+            if self.status == pywraplp.Solver.OPTIMAL or gap_reached:
+                return
 
-        for name, sub_model in self.sub_models.items():
-            print(f"\n\nSub model {name}: ")
-            sub_model.extract_variables()
+            self.model.SetHint(self.model.variables(), output.values.tolist())
+            time_slice *= 2
+
+    def solve(
+        self,
+        options: Optional[SolveOptions] = None,
+        on_incumbent: Optional[Callable[[Incumbent], bool]] = None,
+    ) -> Optional[Solution]:
+        options = options or SolveOptions()
+        output = None
+        self.instrumentation.model_size(self)
+        with self.instrumentation.phase("solve"):
+            if on_incumbent is None:
+                self._apply_first_stage_hint()
+                self.status = self.model.Solve(
+                    self.configure(self.model, options, options.time_limit)
+                )
+                if self.status in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+                    output = self.solver_output(self.model, self.status)
+            else:
+                # The last time slice may end without a solution, so the best
+                # incumbent of all slices is reported
+                for incumbent in self.incumbents(options):
+                    if on_incumbent(incumbent):
+                        break
+                output = self.best_output
+
+        if output is not None:
+            self.instrumentation.solver_statistics(
+                output.objective, output.bound, self.model.nodes()
+            )
+            return self.solution_layout().build(output)
+
+        else:
+            print("The problem does not have a feasible solution.")
+            return None
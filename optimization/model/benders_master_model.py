@@ -0,0 +1,57 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from optimization.model.base_model import BaseModel
+from optimization.model.scenario_sub_problem import ScenarioSubProblemResult
+from optimization.solver.base_model_parameters import BaseModelParameters
+
+
+class BendersMasterModel(BaseModel):
+    """
+    The base model over the first-stage y and j variables, with one recourse cost
+    estimate theta per scenario that is tightened by optimality and feasibility cuts
+    """
+
+    def __init__(self, model_parameters: BaseModelParameters, weights: List[float]):
+        super().__init__(model_parameters)
+        self.pairs: List[Tuple[int, int]] = sorted(self.j)
+        self.weights = weights
+        self.theta = []
+        for k, weight in enumerate(weights):
+            self.theta.append(
+                self.model.NumVar(0, self.model.infinity(), f"theta_{k}")
+            )
+            self.objective.SetCoefficient(self.theta[k], weight)
+
+    def j_values(self) -> np.ndarray:
+        return np.array(
+            [round(self.j[pair].solution_value()) for pair in self.pairs], dtype=int
+        )
+
+    def recourse_estimate(self) -> float:
+        return sum(
+            weight * theta.solution_value()
+            for weight, theta in zip(self.weights, self.theta)
+        )
+
+    def add_optimality_cut(
+        self, k: int, result: ScenarioSubProblemResult, j_values: np.ndarray
+    ):
+        # Each overlap constraint's right hand side is big_m * (1 - j_sr) - d_s, so
+        # its dual is the change of the scenario cost per unit of -big_m * j_sr
+        cut = result.objective
+        for pair, dual, j_sr in zip(self.pairs, result.duals, j_values):
+            if dual != 0:
+                cut += -self.big_m(*pair) * dual * (self.j[pair] - int(j_sr))
+
+        self.model.Add(self.theta[k] >= cut, f"optimality_cut_{k}")
+
+    def add_feasibility_cut(self, j_values: np.ndarray):
+        # Setting j_sr to 1 only ever adds constraints to the sub-problems, so an
+        # infeasible ordering stays infeasible for every superset of its active pairs
+        active = [self.j[pair] for pair, j_sr in zip(self.pairs, j_values) if j_sr]
+        if not active:
+            raise ValueError("A scenario is infeasible for every task ordering")
+
+        self.model.Add(sum(active) <= len(active) - 1, "feasibility_cut")
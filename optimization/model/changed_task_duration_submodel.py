@@ -32,18 +32,7 @@ class ChangedTaskDurationsub_model(SubModel):
         self.s_t = s_t
         self.advance_costs = advance_costs
         self.delay_costs = delay_costs
-
-    def extract_variables(self):
-        print(f"In scenario {self.name} with weight {self.weight}")
-        for s in self.task_duration.keys():
-            print(f"Task {s} ends at {self.s_t[s].solution_value() + self.task_duration[s]}")
-            print(f"Task {s} is delayed by {self.s_delay[s].solution_value()}")
-            print(f"Task {s} is advanced by {self.s_advance[s].solution_value()}")
-            print(
-                f"Sub objective Value: "
-                f"advance: {self.s_advance[s].solution_value() * self.advance_costs[s]} \n"
-                f"delay: {self.s_delay[s].solution_value() * self.delay_costs[s]} \n"
-            )
+        self.constraints = {}
 
 
 class ChangedTaskDurationSubModelExpander(ModelExpander):
@@ -55,17 +44,7 @@ class ChangedTaskDurationSubModelExpander(ModelExpander):
 
     @staticmethod
     def create_sub_model(model: BaseModel, scenario: ChangedTaskDurationScenario):
-        s_advance = {}
-        s_delay = {}
-        s_t = {}
-        for s in model.model_parameters.S:
-            s_advance[s] = model.model.IntVar(
-                0, model.end_date, f"{scenario.name}_s+_{s}"
-            )
-            s_delay[s] = model.model.IntVar(
-                0, model.end_date, f"{scenario.name}_s-_{s}"
-            )
-            s_t[s] = model.model.IntVar(0, model.end_date, f"{scenario.name}_s_{s}")
+        s_advance, s_delay, s_t = model.create_task_variables(f"{scenario.name}_")
 
         return ChangedTaskDurationsub_model(
             scenario,
@@ -87,49 +66,86 @@ class ChangedTaskDurationSubModelExpander(ModelExpander):
     def add_sub_model_overlap_constraints(
         model: BaseModel, sub_model: ChangedTaskDurationsub_model
     ):
-        for (s, r), j_sr in model.j.items():
-            constraint_name = (
-                f"{sub_model.name}_overlap_{s}_{r}_duration_"
-                f"{model.model_parameters.task_duration[s]}"
+        for s, r in model.j:
+            ChangedTaskDurationSubModelExpander.add_sub_model_overlap_constraint(
+                model, sub_model, s, r
             )
 
-            model.model.Add(
-                sub_model.s_t[s] + sub_model.task_duration[s]
-                <= sub_model.s_t[r] + model.end_date * (1 - j_sr),
-                constraint_name,
-            )
+    @staticmethod
+    def add_sub_model_overlap_constraint(
+        model: BaseModel, sub_model: ChangedTaskDurationsub_model, s, r
+    ):
+        constraint_name = (
+            f"{sub_model.name}_overlap_{s}_{r}_duration_"
+            f"{model.model_parameters.task_duration[s]}"
+        )
+
+        constraint = model.model.Add(
+            sub_model.s_t[s] + int(sub_model.task_duration[s])
+            <= sub_model.s_t[r] + model.big_m(s, r) * (1 - model.j[s, r]),
+            constraint_name,
+        )
+        model.keep_constraint(sub_model.constraints, ("overlap", s, r), constraint)
 
     @staticmethod
     def _create_advance_constraints(
             model: BaseModel, sub_model: ChangedTaskDurationsub_model
     ):
         for s in model.model_parameters.S:
-            model.model.Add(
-                model.model_parameters.target_execution_times[s] - sub_model.s_t[s]
-                <= sub_model.s_advance[s],
-                f"advance_{s}",
+            ChangedTaskDurationSubModelExpander.add_sub_model_advance_constraint(
+                model, sub_model, s
             )
 
+    @staticmethod
+    def add_sub_model_advance_constraint(
+        model: BaseModel, sub_model: ChangedTaskDurationsub_model, s
+    ):
+        constraint = model.model.Add(
+            int(model.model_parameters.target_execution_times[s]) - sub_model.s_t[s]
+            <= sub_model.s_advance[s],
+            f"advance_{s}",
+        )
+        model.keep_constraint(sub_model.constraints, ("advance", s), constraint)
+
     @staticmethod
     def _create_delay_constraints(
             model: BaseModel, sub_model: ChangedTaskDurationsub_model
     ):
         for s in model.model_parameters.S:
-            model.model.Add(
-                sub_model.s_t[s] - model.model_parameters.target_execution_times[s]
-                <= sub_model.s_delay[s],
-                f"delay_{s}",
+            ChangedTaskDurationSubModelExpander.add_sub_model_delay_constraint(
+                model, sub_model, s
             )
 
+    @staticmethod
+    def add_sub_model_delay_constraint(
+        model: BaseModel, sub_model: ChangedTaskDurationsub_model, s
+    ):
+        constraint = model.model.Add(
+            sub_model.s_t[s] - int(model.model_parameters.target_execution_times[s])
+            <= sub_model.s_delay[s],
+            f"delay_{s}",
+        )
+        model.keep_constraint(sub_model.constraints, ("delay", s), constraint)
+
     @staticmethod
     def add_sub_model_wighted_cost_objective(
         model: BaseModel, sub_model: ChangedTaskDurationsub_model
     ):
         for s in model.model_parameters.S:
-            model.objective.SetCoefficient(
-                sub_model.s_delay[s], model.model_parameters.delay_costs[s]
+            ChangedTaskDurationSubModelExpander.set_sub_model_task_cost(
+                model, sub_model, s
             )
 
-            model.objective.SetCoefficient(
-                sub_model.s_advance[s], model.model_parameters.advance_costs[s]
-            )
+    @staticmethod
+    def set_sub_model_task_cost(
+        model: BaseModel, sub_model: ChangedTaskDurationsub_model, s
+    ):
+        model.objective.SetCoefficient(
+            sub_model.s_delay[s],
+            float(sub_model.weight * model.model_parameters.delay_costs[s]),
+        )
+
+        model.objective.SetCoefficient(
+            sub_model.s_advance[s],
+            float(sub_model.weight * model.model_parameters.advance_costs[s]),
+        )
@@ -0,0 +1,407 @@
+import os
+import queue
+import threading
+from typing import Callable, List, Optional
+
+import numpy as np
+from google.protobuf import text_format
+from ortools.sat.python import cp_model
+
+from optimization.model.model_expander import ModelExpander
+from optimization.model.sub_model import SubModel
+from optimization.scenarios.changed_task_duration_scenario import (
+    ChangedTaskDurationScenario,
+)
+from optimization.solver.base_model_parameters import BaseModelParameters
+from optimization.solver.instrumentation import NULL_INSTRUMENTATION, Instrumentation
+from optimization.solver.solution import SolutionLayout, SolverOutput
+from optimization.solver.solve_options import Incumbent, SolveOptions
+
+
+class IncumbentCallback(cp_model.CpSolverSolutionCallback):
+    """
+    Reports each improving solution, and stops the search once on_incumbent returns
+    True
+    """
+
+    def __init__(self, on_incumbent: Callable[[Incumbent], bool]):
+        super().__init__()
+        self.on_incumbent = on_incumbent
+
+    def on_solution_callback(self):
+        incumbent = Incumbent(
+            objective=self.ObjectiveValue(),
+            bound=self.BestObjectiveBound(),
+            wall_time=self.WallTime(),
+        )
+        if self.on_incumbent(incumbent):
+            self.StopSearch()
+
+
+class CpSatBaseModel:
+    """
+    The base model on CP-SAT. Machine assignment uses optional interval variables per
+    (machine, task) with AddNoOverlap per machine, and the shared ordering j is kept
+    as enforced precedences instead of big-M rows. CP-SAT needs an integer objective,
+    so costs are multiplied by objective_scale and rounded; the scale is stored in
+    the model so reported objective values are in the original units. Without an
+    objective_scale, it is derived so the smallest nonzero cost is worth
+    objective_precision units.
+    """
+
+    # Largest objective magnitude CP-SAT still reports exactly as a double
+    max_objective = 2**53
+
+    def __init__(
+        self,
+        model_parameters: BaseModelParameters,
+        objective_scale: Optional[float] = None,
+        objective_precision: int = 1000,
+        num_workers: Optional[int] = None,
+        instrumentation: Instrumentation = NULL_INSTRUMENTATION,
+    ):
+        self.model_parameters = model_parameters
+        self.instrumentation = instrumentation
+        self.end_date = self.model_parameters.end_date
+        self.objective_scale = objective_scale
+        self.objective_precision = objective_precision
+        self.num_workers = num_workers or os.cpu_count()
+        self.model = cp_model.CpModel()
+        self.objective_variables = []
+        self.objective_coefficients = []
+        self.first_stage_hint = None
+        self.finalized = False
+        self.status = None
+        self._create_variables()
+        self._create_constraints()
+        self._create_objective()
+        self.sub_models = {}
+
+    def _create_variables(self):
+        self.y = {}
+        self.j = {}
+
+        for m, s in self.model_parameters.y:
+            self.y[m, s] = self.model.NewBoolVar(f"y_{m}_{s}")
+
+        for s, r in self.model_parameters.j:
+            self.j[s, r] = self.model.NewBoolVar(f"j_{s}_{r}")
+
+        self.s_advance, self.s_delay, self.s_t = self.create_task_variables("")
+
+    def start_window(self, s):
+        if self.model_parameters.earliest_start is None:
+            return 0, self.end_date
+
+        return (
+            self.model_parameters.earliest_start[s],
+            self.model_parameters.latest_start[s],
+        )
+
+    def create_task_variables(self, prefix):
+        # Each family is created as one contiguous block, see SolutionLayout
+        S = self.model_parameters.S
+        targets = self.model_parameters.target_execution_times
+        windows = {s: self.start_window(s) for s in S}
+        advance_upper = {
+            s: max(0, min(self.end_date, targets[s] - windows[s][0])) for s in S
+        }
+        delay_upper = {
+            s: max(0, min(self.end_date, windows[s][1] - targets[s])) for s in S
+        }
+
+        s_advance = {
+            s: self.model.NewIntVar(0, advance_upper[s], f"{prefix}s+_{s}") for s in S
+        }
+        s_delay = {
+            s: self.model.NewIntVar(0, delay_upper[s], f"{prefix}s-_{s}") for s in S
+        }
+        s_t = {s: self.model.NewIntVar(*windows[s], f"{prefix}s_{s}") for s in S}
+
+        return s_advance, s_delay, s_t
+
+    def _create_constraints(self):
+        constraint_families = {
+            "schedule": lambda: self.add_schedule_constraints(
+                "",
+                self.s_advance,
+                self.s_delay,
+                self.s_t,
+                self.model_parameters.task_duration,
+            ),
+            "machine_assignment": self._create_machine_assignment_constraints,
+            "asymmetric_task_sequence": self._create_asymmetric_task_sequence_constraints,
+            "task_sequence_requirement": self._create_task_sequence_requirement_constraints,
+        }
+        for family, create_constraints in constraint_families.items():
+            with self.instrumentation.phase("constraints", family=family):
+                with self.instrumentation.size_change(self, family=family):
+                    create_constraints()
+
+    def add_schedule_constraints(self, prefix, s_advance, s_delay, s_t, task_duration):
+        """
+        Constraints that every copy of the start times needs: no overlap per machine,
+        the ordering given by j, and the advance and delay definitions
+        """
+        machine_intervals = {m: [] for m in self.model_parameters.M}
+        for (m, s), y_ms in self.y.items():
+            machine_intervals[m].append(
+                self.model.NewOptionalFixedSizeIntervalVar(
+                    s_t[s], int(task_duration[s]), y_ms, f"{prefix}interval_{m}_{s}"
+                )
+            )
+        for intervals in machine_intervals.values():
+            self.model.AddNoOverlap(intervals)
+
+        for (s, r), j_sr in self.j.items():
+            duration = int(task_duration[s])
+            self.model.Add(s_t[s] + duration <= s_t[r]).OnlyEnforceIf(j_sr)
+
+            big_m = self.end_date
+            if self.model_parameters.big_m is not None:
+                big_m = self.model_parameters.big_m[s, r]
+            if self.start_window(s)[1] + duration - self.start_window(r)[0] > big_m:
+                self.model.Add(s_t[s] + duration <= s_t[r] + big_m).OnlyEnforceIf(
+                    j_sr.Not()
+                )
+
+        for s in self.model_parameters.S:
+            target = self.model_parameters.target_execution_times[s]
+            self.model.Add(target - s_t[s] <= s_advance[s])
+            self.model.Add(s_t[s] - target <= s_delay[s])
+
+    def _create_machine_assignment_constraints(self):
+        for s in self.model_parameters.S:
+            self.model.AddExactlyOne(
+                [self.y[m, s] for m in self.model_parameters.M if (m, s) in self.y]
+            )
+
+    def _create_asymmetric_task_sequence_constraints(self):
+        for s, t in self.model_parameters.task_pairs:
+            if (s, t) in self.j and (t, s) in self.j:
+                self.model.AddAtMostOne([self.j[s, t], self.j[t, s]])
+
+    def _create_task_sequence_requirement_constraints(self):
+        for (s, t), machines in self.model_parameters.task_pairs.items():
+            orderings = [self.j[pair] for pair in ((s, t), (t, s)) if pair in self.j]
+            for m in machines:
+                self.model.AddBoolOr(
+                    [self.y[m, s].Not(), self.y[m, t].Not(), *orderings]
+                )
+
+    def _create_objective(self):
+        self.add_cost_objective(self.s_advance, self.s_delay, 1.0)
+
+    def add_cost_objective(self, s_advance, s_delay, weight):
+        for s in self.model_parameters.S:
+            self.objective_variables.append(s_advance[s])
+            self.objective_coefficients.append(
+                float(weight * self.model_parameters.advance_costs[s])
+            )
+            self.objective_variables.append(s_delay[s])
+            self.objective_coefficients.append(
+                float(weight * self.model_parameters.delay_costs[s])
+            )
+
+    def add_machine_release_constraints(self, release_times: dict):
+        start_times = [self.s_t] + [
+            sub_model.s_t for sub_model in self.sub_models.values()
+        ]
+        for (m, s), y_ms in self.y.items():
+            release = release_times.get(m, 0)
+            if release <= 0:
+                continue
+
+            for s_t in start_times:
+                self.model.Add(s_t[s] >= release).OnlyEnforceIf(y_ms)
+
+    def add_machine_symmetry_constraints(self, machine_classes: List[List[int]]):
+        for machines in machine_classes:
+            tasks = sorted(s for m, s in self.y if m == machines[0])
+            for previous, m in zip(machines, machines[1:]):
+                earlier = 0
+                for q, s in enumerate(tasks):
+                    self.model.Add(self.y[m, s] <= earlier)
+                    count = self.model.NewIntVar(0, q + 1, f"earlier_{previous}_{s}")
+                    self.model.Add(count == earlier + self.y[previous, s])
+                    earlier = count
+
+    def fix_identical_task_order(self, task_classes: List[List[int]]):
+        for tasks in task_classes:
+            for a, s in enumerate(tasks):
+                for t in tasks[a + 1 :]:
+                    if (t, s) in self.j:
+                        self.model.Add(self.j[t, s] == 0)
+
+    def model_size(self):
+        proto = self.model.Proto()
+        return len(proto.variables), len(proto.constraints)
+
+    def set_first_stage_hint(self, y_values: dict, j_values: dict):
+        self.first_stage_hint = (y_values, j_values)
+
+    def scaled_objective(self):
+        """
+        The scale and the integer objective coefficients. Each cost variable is
+        bounded by end_date, which bounds the largest objective the scale may reach.
+        """
+        magnitudes = [abs(c) for c in self.objective_coefficients if c != 0]
+        if not magnitudes:
+            return 1.0, [0] * len(self.objective_coefficients)
+
+        largest_scale = self.max_objective / (sum(magnitudes) * max(self.end_date, 1))
+        scale = self.objective_scale
+        if scale is None:
+            scale = min(self.objective_precision / min(magnitudes), largest_scale)
+        elif scale > largest_scale:
+            raise ValueError(
+                f"objective_scale {scale} exceeds CP-SAT's integer objective range, "
+                f"it can be at most {largest_scale}"
+            )
+        if scale * min(magnitudes) < 0.5:
+            raise ValueError(
+                f"The smallest cost {min(magnitudes)} rounds to 0 with objective_scale "
+                f"{scale}"
+            )
+
+        return scale, [round(scale * c) for c in self.objective_coefficients]
+
+    def _finalize(self):
+        if self.finalized:
+            return
+
+        scale, coefficients = self.scaled_objective()
+        self.model.Minimize(
+            cp_model.LinearExpr.WeightedSum(self.objective_variables, coefficients)
+        )
+        self.model.Proto().objective.scaling_factor = 1 / scale
+
+        if self.first_stage_hint is not None:
+            y_values, j_values = self.first_stage_hint
+            for key, value in y_values.items():
+                if key in self.y:
+                    self.model.AddHint(self.y[key], value)
+            for key, value in j_values.items():
+                if key in self.j:
+                    self.model.AddHint(self.j[key], value)
+
+        self.finalized = True
+
+    def export_model(self) -> bytes:
+        self._finalize()
+        return self.model.Proto().SerializeToString()
+
+    @staticmethod
+    def create_solver(options: SolveOptions, num_workers: int):
+        solver = cp_model.CpSolver()
+        solver.parameters.num_workers = options.num_threads or num_workers
+        if options.time_limit is not None:
+            solver.parameters.max_time_in_seconds = options.time_limit
+        if options.relative_gap is not None:
+            solver.parameters.relative_gap_limit = options.relative_gap
+        if options.solver_specific_parameters:
+            text_format.Merge(options.solver_specific_parameters, solver.parameters)
+        return solver
+
+    @staticmethod
+    def solver_output(solver: cp_model.CpSolver, status) -> SolverOutput:
+        return SolverOutput(
+            status="optimal" if status == cp_model.OPTIMAL else "feasible",
+            objective=solver.ObjectiveValue(),
+            bound=solver.BestObjectiveBound(),
+            values=np.array(solver.ResponseProto().solution, dtype=np.float64),
+        )
+
+    def solution_layout(self) -> SolutionLayout:
+        return SolutionLayout.from_model(self, lambda variable: variable.Index())
+
+    @staticmethod
+    def solve_serialized(
+        serialized_model: bytes, options: Optional[SolveOptions] = None
+    ) -> Optional[SolverOutput]:
+        options = options or SolveOptions()
+        model = cp_model.CpModel()
+        model.Proto().ParseFromString(serialized_model)
+        solver = CpSatBaseModel.create_solver(options, os.cpu_count())
+        status = solver.Solve(model)
+
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return CpSatBaseModel.solver_output(solver, status)
+
+        else:
+            print("The problem does not have a feasible solution.")
+            return None
+
+    def incumbents(self, options: Optional[SolveOptions] = None):
+        """
+        Yields every improving solution while CP-SAT searches in a background thread.
+        Closing the iterator stops the search.
+        """
+        solutions = queue.Queue()
+        finished = object()
+        callback = IncumbentCallback(lambda incumbent: solutions.put(incumbent))
+
+        def search():
+            try:
+                self.solve(options, callback=callback)
+            finally:
+                solutions.put(finished)
+
+        thread = threading.Thread(target=search, daemon=True)
+        thread.start()
+        try:
+            while True:
+                incumbent = solutions.get()
+                if incumbent is finished:
+                    return
+                yield incumbent
+        finally:
+            callback.StopSearch()
+            thread.join()
+
+    def solve(
+        self,
+        options: Optional[SolveOptions] = None,
+        on_incumbent: Optional[Callable[[Incumbent], bool]] = None,
+        callback: Optional[cp_model.CpSolverSolutionCallback] = None,
+    ):
+        self._finalize()
+        solver = self.create_solver(options or SolveOptions(), self.num_workers)
+        if callback is None and on_incumbent is not None:
+            callback = IncumbentCallback(on_incumbent)
+        self.instrumentation.model_size(self)
+        with self.instrumentation.phase("solve"):
+            self.status = solver.Solve(self.model, callback)
+
+        if self.status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            output = self.solver_output(solver, self.status)
+            self.instrumentation.solver_statistics(
+                output.objective, output.bound, solver.NumBranches()
+            )
+            return self.solution_layout().build(output)
+
+        else:
+            print("The problem does not have a feasible solution.")
+            return None
+
+
+class CpSatSubModel(SubModel):
+    def __init__(self, scenario: ChangedTaskDurationScenario, s_advance, s_delay, s_t):
+        self.scenario = scenario
+        self.task_duration = scenario.task_duration
+        self.weight = scenario.weight
+        self.name = f"Sub Model {scenario.name}"
+        self.s_advance = s_advance
+        self.s_delay = s_delay
+        self.s_t = s_t
+
+
+class CpSatSubModelExpander(ModelExpander):
+    def expand(self, base_model: CpSatBaseModel, scenario: ChangedTaskDurationScenario):
+        s_advance, s_delay, s_t = base_model.create_task_variables(f"{scenario.name}_")
+        sub_model = CpSatSubModel(scenario, s_advance, s_delay, s_t)
+        self.add_sub_model(base_model, sub_model)
+        base_model.add_schedule_constraints(
+            f"{scenario.name}_", s_advance, s_delay, s_t, scenario.task_duration
+        )
+        base_model.add_cost_objective(s_advance, s_delay, scenario.weight)
@@ -0,0 +1,105 @@
+"""
+Accumulates a linear model as NumPy blocks and loads it into OR-tools in one MPModelProto
+"""
+import numpy as np
+from ortools.linear_solver import linear_solver_pb2
+
+
+def _concatenate(blocks, dtype):
+    if not blocks:
+        return np.empty(0, dtype=dtype)
+
+    return np.concatenate(blocks).astype(dtype, copy=False)
+
+
+def _broadcast(value, count, dtype):
+    return np.broadcast_to(np.asarray(value, dtype=dtype), (count,))
+
+
+class LinearModelArrays:
+    def __init__(self):
+        self.number_of_variables = 0
+        self.number_of_constraints = 0
+        self._variable_lower = []
+        self._variable_upper = []
+        self._variable_integer = []
+        self._objective_indices = []
+        self._objective_coefficients = []
+        self._rows = []
+        self._columns = []
+        self._coefficients = []
+        self._constraint_lower = []
+        self._constraint_upper = []
+
+    def add_variables(self, count: int, lower, upper, is_integer: bool) -> np.ndarray:
+        indices = np.arange(
+            self.number_of_variables, self.number_of_variables + count, dtype=np.int64
+        )
+        self._variable_lower.append(_broadcast(lower, count, np.float64))
+        self._variable_upper.append(_broadcast(upper, count, np.float64))
+        self._variable_integer.append(_broadcast(is_integer, count, bool))
+        self.number_of_variables += count
+        return indices
+
+    def add_objective_terms(self, indices, coefficients):
+        indices = np.asarray(indices, dtype=np.int64)
+        self._objective_indices.append(indices)
+        self._objective_coefficients.append(
+            _broadcast(coefficients, len(indices), np.float64)
+        )
+
+    def add_constraints(self, count: int, rows, columns, coefficients, lower, upper):
+        """
+        Adds count constraints given in coordinate format, with rows numbered from 0
+        within the block
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        self._rows.append(rows + self.number_of_constraints)
+        self._columns.append(np.asarray(columns, dtype=np.int64))
+        self._coefficients.append(_broadcast(coefficients, len(rows), np.float64))
+        self._constraint_lower.append(_broadcast(lower, count, np.float64))
+        self._constraint_upper.append(_broadcast(upper, count, np.float64))
+        self.number_of_constraints += count
+
+    def to_proto(self) -> linear_solver_pb2.MPModelProto:
+        proto = linear_solver_pb2.MPModelProto()
+
+        objective = np.zeros(self.number_of_variables)
+        np.add.at(
+            objective,
+            _concatenate(self._objective_indices, np.int64),
+            _concatenate(self._objective_coefficients, np.float64),
+        )
+        for lower, upper, is_integer, coefficient in zip(
+            _concatenate(self._variable_lower, np.float64).tolist(),
+            _concatenate(self._variable_upper, np.float64).tolist(),
+            _concatenate(self._variable_integer, bool).tolist(),
+            objective.tolist(),
+        ):
+            variable = proto.variable.add()
+            variable.lower_bound = lower
+            variable.upper_bound = upper
+            variable.is_integer = is_integer
+            variable.objective_coefficient = coefficient
+
+        rows = _concatenate(self._rows, np.int64)
+        order = np.argsort(rows, kind="stable")
+        row_starts = np.searchsorted(
+            rows[order], np.arange(self.number_of_constraints + 1)
+        ).tolist()
+        columns = _concatenate(self._columns, np.int64)[order].tolist()
+        coefficients = _concatenate(self._coefficients, np.float64)[order].tolist()
+
+        for i, (lower, upper) in enumerate(
+            zip(
+                _concatenate(self._constraint_lower, np.float64).tolist(),
+                _concatenate(self._constraint_upper, np.float64).tolist(),
+            )
+        ):
+            constraint = proto.constraint.add()
+            constraint.lower_bound = lower
+            constraint.upper_bound = upper
+            constraint.var_index.extend(columns[row_starts[i] : row_starts[i + 1]])
+            constraint.coefficient.extend(coefficients[row_starts[i] : row_starts[i + 1]])
+
+        return proto
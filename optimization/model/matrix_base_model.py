@@ -0,0 +1,290 @@
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from optimization.model.base_model import BaseModel
+from optimization.model.linear_model_arrays import LinearModelArrays
+from optimization.solver.base_model_parameters import BaseModelParameters
+from optimization.solver.instrumentation import NULL_INSTRUMENTATION, Instrumentation
+from optimization.solver.solution import SolutionLayout
+from optimization.solver.solve_options import Incumbent, SolveOptions
+
+
+class MatrixBaseModel(BaseModel):
+    """
+    Builds the same model as BaseModel, but each constraint family is generated as a
+    sparse NumPy block and the whole model is loaded into SCIP at once on solve. The
+    variable dicts (y, j, s_t, ...) are only populated after loading.
+    """
+
+    def __init__(
+        self,
+        model_parameters: BaseModelParameters,
+        instrumentation: Instrumentation = NULL_INSTRUMENTATION,
+    ):
+        self.arrays = LinearModelArrays()
+        self.loaded = False
+        self._bindings = []
+        super().__init__(model_parameters, instrumentation)
+
+    def _create_variables(self):
+        self.y = {}
+        self.j = {}
+        self.s_advance = {}
+        self.s_delay = {}
+        self.s_t = {}
+
+        S = self.model_parameters.S
+        self.task_duration = self.task_array(self.model_parameters.task_duration)
+        self.target_execution_times = self.task_array(
+            self.model_parameters.target_execution_times
+        )
+        self.advance_costs = self.task_array(self.model_parameters.advance_costs)
+        self.delay_costs = self.task_array(self.model_parameters.delay_costs)
+        windows = np.array([self.start_window(s) for s in S], np.float64).reshape(-1, 2)
+        self.earliest_start = windows[:, 0]
+        self.latest_start = windows[:, 1]
+
+        self.y_pairs = np.array(sorted(self.model_parameters.y), np.int64).reshape(-1, 2)
+        self.j_pairs = np.array(sorted(self.model_parameters.j), np.int64).reshape(-1, 2)
+        self.y_index = self.arrays.add_variables(len(self.y_pairs), 0, 1, True)
+        self.j_index = self.arrays.add_variables(len(self.j_pairs), 0, 1, True)
+        self.y_lookup = np.full((len(self.model_parameters.M), len(S)), -1, np.int64)
+        self.y_lookup[self.y_pairs[:, 0], self.y_pairs[:, 1]] = self.y_index
+        self.big_m_values = np.array(
+            [self.big_m(s, r) for s, r in self.j_pairs.tolist()], dtype=np.float64
+        )
+
+        (
+            self.s_advance_index,
+            self.s_delay_index,
+            self.s_t_index,
+        ) = self.add_task_variables()
+
+        self.bind(self.y, map(tuple, self.y_pairs.tolist()), self.y_index)
+        self.bind(self.j, map(tuple, self.j_pairs.tolist()), self.j_index)
+        self.bind(self.s_advance, S, self.s_advance_index)
+        self.bind(self.s_delay, S, self.s_delay_index)
+        self.bind(self.s_t, S, self.s_t_index)
+
+    def add_task_variables(self):
+        if self.loaded:
+            raise ValueError("Cannot add variables after the model has been loaded")
+
+        count = len(self.model_parameters.S)
+        advance_upper = np.clip(
+            self.target_execution_times - self.earliest_start, 0, self.end_date
+        )
+        delay_upper = np.clip(
+            self.latest_start - self.target_execution_times, 0, self.end_date
+        )
+        return (
+            self.arrays.add_variables(count, 0, advance_upper, True),
+            self.arrays.add_variables(count, 0, delay_upper, True),
+            self.arrays.add_variables(
+                count, self.earliest_start, self.latest_start, True
+            ),
+        )
+
+    def task_array(self, values) -> np.ndarray:
+        """
+        Per-task values as a float array; arrays from a ColumnarInstance are used
+        as they are when already float64
+        """
+        if isinstance(values, np.ndarray):
+            return values.astype(np.float64, copy=False)
+
+        return np.array([values[s] for s in self.model_parameters.S], dtype=np.float64)
+
+    def bind(self, target: dict, keys, indices: np.ndarray):
+        self._bindings.append((target, list(keys), indices))
+
+    def _create_overlap_constraints(self):
+        self.add_overlap_rows(self.s_t_index, self.task_duration)
+
+    def _create_advance_constraints(self):
+        self.add_advance_rows(self.s_t_index, self.s_advance_index)
+
+    def _create_delay_constraints(self):
+        self.add_delay_rows(self.s_t_index, self.s_delay_index)
+
+    def _create_machine_assignment_constraints(self):
+        self.arrays.add_constraints(
+            len(self.model_parameters.S),
+            rows=self.y_pairs[:, 1],
+            columns=self.y_index,
+            coefficients=1,
+            lower=1,
+            upper=1,
+        )
+
+    def _create_asymmetric_task_sequence_constraints(self):
+        pairs = np.array(
+            list(self.model_parameters.task_pairs), dtype=np.int64
+        ).reshape(-1, 2)
+        forward = self._j_positions(pairs[:, 0], pairs[:, 1])
+        backward = self._j_positions(pairs[:, 1], pairs[:, 0])
+        both = (forward >= 0) & (backward >= 0)
+        forward = forward[both]
+        backward = backward[both]
+        block = np.arange(len(forward))
+        self.arrays.add_constraints(
+            len(forward),
+            rows=np.concatenate([block, block]),
+            columns=np.concatenate([self.j_index[forward], self.j_index[backward]]),
+            coefficients=1,
+            lower=-np.inf,
+            upper=1,
+        )
+
+    def _create_task_sequence_requirement_constraints(self):
+        edges = np.array(
+            [
+                (s, t, m)
+                for (s, t), machines in self.model_parameters.task_pairs.items()
+                for m in machines
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 3)
+        s, t, m = edges[:, 0], edges[:, 1], edges[:, 2]
+        count = len(edges)
+        block = np.arange(count)
+        forward = self._j_positions(s, t)
+        backward = self._j_positions(t, s)
+        self.arrays.add_constraints(
+            count,
+            rows=np.concatenate(
+                [block, block, block[forward >= 0], block[backward >= 0]]
+            ),
+            columns=np.concatenate(
+                [
+                    self.y_lookup[m, s],
+                    self.y_lookup[m, t],
+                    self.j_index[forward[forward >= 0]],
+                    self.j_index[backward[backward >= 0]],
+                ]
+            ),
+            coefficients=np.concatenate(
+                [
+                    np.ones(2 * count),
+                    -np.ones(int((forward >= 0).sum() + (backward >= 0).sum())),
+                ]
+            ),
+            lower=-np.inf,
+            upper=1,
+        )
+
+    def _j_positions(self, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """
+        Positions in j_pairs of the ordered pairs (first, second), or -1 for pairs
+        without a j variable
+        """
+        wanted = first * len(self.model_parameters.S) + second
+        if len(self.j_pairs) == 0:
+            return np.full(len(wanted), -1, np.int64)
+
+        codes = self.j_pairs[:, 0] * len(self.model_parameters.S) + self.j_pairs[:, 1]
+        position = np.minimum(np.searchsorted(codes, wanted), len(codes) - 1)
+        return np.where(codes[position] == wanted, position, -1)
+
+    def _create_objective(self):
+        self.add_cost_objective(self.s_advance_index, self.s_delay_index)
+
+    def add_overlap_rows(self, s_t_index: np.ndarray, task_duration: np.ndarray):
+        count = len(self.j_pairs)
+        block = np.arange(count)
+        s = self.j_pairs[:, 0]
+        r = self.j_pairs[:, 1]
+        self.arrays.add_constraints(
+            count,
+            rows=np.concatenate([block, block, block]),
+            columns=np.concatenate([s_t_index[s], s_t_index[r], self.j_index]),
+            coefficients=np.concatenate(
+                [np.ones(count), -np.ones(count), self.big_m_values]
+            ),
+            lower=-np.inf,
+            upper=self.big_m_values - task_duration[s],
+        )
+
+    def add_advance_rows(self, s_t_index: np.ndarray, s_advance_index: np.ndarray):
+        block = np.arange(len(s_t_index))
+        self.arrays.add_constraints(
+            len(s_t_index),
+            rows=np.concatenate([block, block]),
+            columns=np.concatenate([s_t_index, s_advance_index]),
+            coefficients=1,
+            lower=self.target_execution_times,
+            upper=np.inf,
+        )
+
+    def add_delay_rows(self, s_t_index: np.ndarray, s_delay_index: np.ndarray):
+        block = np.arange(len(s_t_index))
+        self.arrays.add_constraints(
+            len(s_t_index),
+            rows=np.concatenate([block, block]),
+            columns=np.concatenate([s_t_index, s_delay_index]),
+            coefficients=np.concatenate([np.ones(len(block)), -np.ones(len(block))]),
+            lower=-np.inf,
+            upper=self.target_execution_times,
+        )
+
+    def add_cost_objective(
+        self, s_advance_index: np.ndarray, s_delay_index: np.ndarray, weight=1.0
+    ):
+        self.arrays.add_objective_terms(s_advance_index, weight * self.advance_costs)
+        self.arrays.add_objective_terms(s_delay_index, weight * self.delay_costs)
+
+    def model_size(self):
+        if self.loaded:
+            return super().model_size()
+
+        return self.arrays.number_of_variables, self.arrays.number_of_constraints
+
+    def load(self):
+        if self.loaded:
+            return
+
+        error = self.model.LoadModelFromProto(self.arrays.to_proto())
+        if error:
+            raise ValueError(f"Could not load the model: {error}")
+
+        variables = self.model.variables()
+        for target, keys, indices in self._bindings:
+            target.update(zip(keys, (variables[i] for i in indices.tolist())))
+
+        self.objective = self.model.Objective()
+        self.loaded = True
+        self.arrays = None
+        self._bindings = []
+
+    def export_model(self) -> bytes:
+        self.load()
+        return super().export_model()
+
+    def add_machine_release_constraints(self, release_times: dict):
+        self.load()
+        super().add_machine_release_constraints(release_times)
+
+    def add_machine_symmetry_constraints(self, machine_classes: List[List[int]]):
+        self.load()
+        super().add_machine_symmetry_constraints(machine_classes)
+
+    def fix_identical_task_order(self, task_classes: List[List[int]]):
+        self.load()
+        super().fix_identical_task_order(task_classes)
+
+    def solution_layout(self) -> SolutionLayout:
+        self.load()
+        return super().solution_layout()
+
+    def incumbents(self, options: Optional[SolveOptions] = None, first_time_slice=1.0):
+        self.load()
+        return super().incumbents(options, first_time_slice)
+
+    def solve(
+        self,
+        options: Optional[SolveOptions] = None,
+        on_incumbent: Optional[Callable[[Incumbent], bool]] = None,
+    ):
+        self.load()
+        return super().solve(options, on_incumbent)
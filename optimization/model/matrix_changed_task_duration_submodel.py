@@ -0,0 +1,62 @@
+import numpy as np
+
+from optimization.model.changed_task_duration_submodel import (
+    ChangedTaskDurationsub_model,
+    ChangedTaskDurationSubModelExpander,
+)
+from optimization.model.matrix_base_model import MatrixBaseModel
+from optimization.scenarios.changed_task_duration_scenario import (
+    ChangedTaskDurationScenario,
+)
+
+
+class MatrixChangedTaskDurationSubModel(ChangedTaskDurationsub_model):
+    def __init__(
+        self,
+        scenario: ChangedTaskDurationScenario,
+        s_advance_index: np.ndarray,
+        s_delay_index: np.ndarray,
+        s_t_index: np.ndarray,
+        advance_costs,
+        delay_costs,
+    ):
+        super().__init__(scenario, {}, {}, {}, advance_costs, delay_costs)
+        self.s_advance_index = s_advance_index
+        self.s_delay_index = s_delay_index
+        self.s_t_index = s_t_index
+
+
+class MatrixChangedTaskDurationSubModelExpander(ChangedTaskDurationSubModelExpander):
+    @staticmethod
+    def create_sub_model(model: MatrixBaseModel, scenario: ChangedTaskDurationScenario):
+        s_advance_index, s_delay_index, s_t_index = model.add_task_variables()
+        sub_model = MatrixChangedTaskDurationSubModel(
+            scenario,
+            s_advance_index,
+            s_delay_index,
+            s_t_index,
+            model.model_parameters.advance_costs,
+            model.model_parameters.delay_costs,
+        )
+        model.bind(sub_model.s_advance, model.model_parameters.S, s_advance_index)
+        model.bind(sub_model.s_delay, model.model_parameters.S, s_delay_index)
+        model.bind(sub_model.s_t, model.model_parameters.S, s_t_index)
+
+        return sub_model
+
+    def add_sub_model_constraints(
+        self, model: MatrixBaseModel, sub_model: MatrixChangedTaskDurationSubModel
+    ):
+        model.add_overlap_rows(
+            sub_model.s_t_index, np.asarray(sub_model.task_duration, dtype=np.float64)
+        )
+        model.add_advance_rows(sub_model.s_t_index, sub_model.s_advance_index)
+        model.add_delay_rows(sub_model.s_t_index, sub_model.s_delay_index)
+
+    @staticmethod
+    def add_sub_model_wighted_cost_objective(
+        model: MatrixBaseModel, sub_model: MatrixChangedTaskDurationSubModel
+    ):
+        model.add_cost_objective(
+            sub_model.s_advance_index, sub_model.s_delay_index, sub_model.weight
+        )
@@ -0,0 +1,203 @@
+"""
+Per-scenario models of progressive hedging, kept alive in worker processes between
+iterations
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+from ortools.linear_solver import pywraplp
+
+from optimization.model.base_model import BaseModel
+from optimization.model.changed_task_duration_submodel import (
+    ChangedTaskDurationSubModelExpander,
+)
+from optimization.scenarios.changed_task_duration_scenario import (
+    ChangedTaskDurationScenario,
+)
+from optimization.solver.base_model_parameters import BaseModelParameters
+from optimization.solver.solution import Solution
+from optimization.solver.solve_options import SolveOptions
+
+
+@dataclass
+class ScenarioHedgingResult:
+    feasible: bool
+    objective: float
+    first_stage: Optional[np.ndarray]
+
+
+def first_stage_variables(base_model: BaseModel) -> list:
+    """
+    The y variables followed by the j variables, in key order, which is the same in
+    every scenario model
+    """
+    return [base_model.y[key] for key in sorted(base_model.y)] + [
+        base_model.j[key] for key in sorted(base_model.j)
+    ]
+
+
+def repair_first_stage(
+    model_parameters: BaseModelParameters, consensus: np.ndarray
+) -> np.ndarray:
+    """
+    A feasible first stage close to a fractional consensus, in first_stage_variables
+    order. Each task goes to the machine with the largest consensus y, and the tasks
+    of a machine run in order of how strongly the consensus puts them before the
+    others, unless presolve left only one order for a pair.
+    """
+    y_keys = sorted(model_parameters.y)
+    j_keys = sorted(model_parameters.j)
+    y_consensus = dict(zip(y_keys, consensus[: len(y_keys)].tolist()))
+    j_consensus = dict(zip(j_keys, consensus[len(y_keys) :].tolist()))
+    j = model_parameters.j
+
+    machine = {}
+    for (m, s), value in y_consensus.items():
+        if s not in machine or value > y_consensus[machine[s], s]:
+            machine[s] = m
+
+    position = {}
+    for m in model_parameters.M:
+        tasks = [s for s in model_parameters.S if machine.get(s) == m]
+        score = {
+            s: sum(
+                j_consensus.get((s, r), 0) - j_consensus.get((r, s), 0)
+                for r in tasks
+                if r != s
+            )
+            for s in tasks
+        }
+        remaining = sorted(tasks, key=lambda s: (-score[s], s))
+        while remaining:
+            forced_after = {
+                s
+                for s in remaining
+                for r in remaining
+                if (r, s) in j and (s, r) not in j
+            }
+            s = next((s for s in remaining if s not in forced_after), remaining[0])
+            position[s] = len(position)
+            remaining.remove(s)
+
+    y_values = [float(machine[s] == m) for m, s in y_keys]
+    j_values = [
+        float(machine[s] == machine[r] and position[s] < position[r])
+        for s, r in j_keys
+    ]
+    return np.array(y_values + j_values, dtype=np.float64)
+
+
+class ScenarioHedgingModel:
+    """
+    The base model with a single scenario at weight one, so its objective is the
+    first-stage cost plus that scenario's cost. y and j carry no cost of their own,
+    so the hedging penalty is set directly as their objective coefficients.
+    """
+
+    def __init__(
+        self,
+        model_parameters: BaseModelParameters,
+        scenario: ChangedTaskDurationScenario,
+        solve_options: SolveOptions,
+    ):
+        self.base_model = BaseModel(model_parameters)
+        ChangedTaskDurationSubModelExpander().expand(
+            self.base_model,
+            ChangedTaskDurationScenario(scenario.name, 1.0, scenario.task_duration),
+        )
+        self.first_stage = first_stage_variables(self.base_model)
+        self.solve_options = solve_options
+        self.parameters = BaseModel.configure(
+            self.base_model.model, solve_options, solve_options.time_limit
+        )
+
+    def solve(self, penalty: Optional[np.ndarray]) -> ScenarioHedgingResult:
+        model = self.base_model.model
+        if penalty is not None:
+            for variable, coefficient in zip(self.first_stage, penalty.tolist()):
+                self.base_model.objective.SetCoefficient(variable, coefficient)
+
+        status = model.Solve(self.parameters)
+        if status not in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+            return ScenarioHedgingResult(False, np.inf, None)
+
+        first_stage = np.array(
+            [round(variable.solution_value()) for variable in self.first_stage],
+            dtype=np.float64,
+        )
+        objective = self.base_model.objective.Value()
+        if penalty is not None:
+            objective -= float(penalty @ first_stage)
+
+        # The next iteration starts from this solution
+        model.SetHint(self.first_stage, first_stage.tolist())
+        return ScenarioHedgingResult(True, objective, first_stage)
+
+    def solve_fixed(self, first_stage: np.ndarray) -> Optional[Solution]:
+        """
+        Solves for the start times with y and j fixed and without hedging penalties
+        """
+        for variable, value in zip(self.first_stage, first_stage.tolist()):
+            self.base_model.objective.SetCoefficient(variable, 0)
+            variable.SetBounds(value, value)
+        return self.base_model.solve(self.solve_options)
+
+
+class ScenarioHedgingWorker:
+    def __init__(
+        self,
+        model_parameters: BaseModelParameters,
+        scenarios: Dict[int, ChangedTaskDurationScenario],
+        solve_options: SolveOptions,
+    ):
+        self.models = {
+            k: ScenarioHedgingModel(model_parameters, scenario, solve_options)
+            for k, scenario in scenarios.items()
+        }
+
+    def solve(
+        self, penalties: Dict[int, Optional[np.ndarray]]
+    ) -> Dict[int, ScenarioHedgingResult]:
+        return {k: self.models[k].solve(penalties[k]) for k in self.models}
+
+    def solve_fixed(self, first_stage: np.ndarray) -> Dict[int, Optional[Solution]]:
+        return {k: model.solve_fixed(first_stage) for k, model in self.models.items()}
+
+    def handle(self, message):
+        """
+        message is ("hedge", penalties) or ("fix", first_stage)
+        """
+        kind, payload = message
+        if kind == "fix":
+            return self.solve_fixed(payload)
+
+        return self.solve(payload)
+
+
+def run_hedging_worker(
+    connection,
+    model_parameters: BaseModelParameters,
+    scenarios: Dict[int, ChangedTaskDurationScenario],
+    solve_options: SolveOptions,
+):
+    """
+    Builds the worker's scenario models once, then answers every message with the
+    scenario results until it receives None
+    """
+    worker = ScenarioHedgingWorker(model_parameters, scenarios, solve_options)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        connection.send(worker.handle(message))
+    connection.close()
+
+
+def partition_scenarios(
+    scenarios: List[ChangedTaskDurationScenario], number_of_workers: int
+) -> List[Dict[int, ChangedTaskDurationScenario]]:
+    partitions = [{} for _ in range(number_of_workers)]
+    for k, scenario in enumerate(scenarios):
+        partitions[k % number_of_workers][k] = scenario
+    return [partition for partition in partitions if partition]
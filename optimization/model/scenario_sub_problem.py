@@ -0,0 +1,75 @@
+"""
+Second-stage LP of a single scenario for a fixed task ordering, used by the Benders solver
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from ortools.linear_solver import pywraplp
+
+
+@dataclass
+class ScenarioSubProblemData:
+    pairs: List[Tuple[int, int]]
+    big_m: List[int]
+    start_windows: List[Tuple[int, int]]
+    target_execution_times: Dict[int, int]
+    delay_costs: Dict[int, float]
+    advance_costs: Dict[int, float]
+    end_date: int
+
+
+@dataclass
+class ScenarioSubProblemResult:
+    feasible: bool
+    objective: float
+    duals: Optional[np.ndarray]
+    start: Optional[np.ndarray] = None
+
+
+_sub_problem_data: Optional[ScenarioSubProblemData] = None
+
+
+def initialize_sub_problem_worker(data: ScenarioSubProblemData):
+    global _sub_problem_data
+    _sub_problem_data = data
+
+
+def solve_scenario_sub_problem(
+    task_duration: np.ndarray, j_values: np.ndarray
+) -> ScenarioSubProblemResult:
+    data = _sub_problem_data
+    model = pywraplp.Solver.CreateSolver("GLOP")
+    tasks = range(len(task_duration))
+
+    s_t = [model.NumVar(*data.start_windows[s], f"s_{s}") for s in tasks]
+    s_advance = [model.NumVar(0, data.end_date, f"s+_{s}") for s in tasks]
+    s_delay = [model.NumVar(0, data.end_date, f"s-_{s}") for s in tasks]
+
+    overlap_constraints = []
+    for (s, r), big_m, j_sr in zip(data.pairs, data.big_m, j_values):
+        overlap_constraints.append(
+            model.Add(
+                s_t[s] - s_t[r] <= big_m * (1 - int(j_sr)) - int(task_duration[s]),
+                f"overlap_{s}_{r}",
+            )
+        )
+
+    objective = model.Objective()
+    for s in tasks:
+        model.Add(data.target_execution_times[s] - s_t[s] <= s_advance[s])
+        model.Add(s_t[s] - data.target_execution_times[s] <= s_delay[s])
+        objective.SetCoefficient(s_advance[s], data.advance_costs[s])
+        objective.SetCoefficient(s_delay[s], data.delay_costs[s])
+    objective.SetMinimization()
+
+    status = model.Solve()
+    if status != pywraplp.Solver.OPTIMAL:
+        return ScenarioSubProblemResult(feasible=False, objective=np.inf, duals=None)
+
+    return ScenarioSubProblemResult(
+        feasible=True,
+        objective=objective.Value(),
+        duals=np.array([constraint.dual_value() for constraint in overlap_constraints]),
+        start=np.array([variable.solution_value() for variable in s_t]),
+    )
@@ -1,8 +1,10 @@
+from typing import Sequence
+
 from optimization.scenarios.scenario import Scenario
 
 
 class ChangedTaskDurationScenario(Scenario):
-    def __init__(self, name, weight, task_duration: dict[int, int]):
+    def __init__(self, name, weight, task_duration: Sequence[int]):
         self.name = name
         self.weight = weight
         self.task_duration = task_duration
@@ -0,0 +1,114 @@
+import heapq
+import math
+from typing import List, Optional
+
+import numpy as np
+
+from optimization.scenarios.scenario_generator_strategy import ScenarioGeneratorStrategy
+
+
+class MostProbableScenarioGeneratorStrategy(ScenarioGeneratorStrategy):
+    """
+    Enumerates delay scenarios in decreasing probability with a best-first search.
+
+    The most probable scenario has every task in its more likely state. Any other
+    scenario flips a set of tasks, and each flip multiplies the probability by the
+    task's ratio min(p, 1 - p) / max(p, 1 - p) <= 1. Tasks are sorted by decreasing
+    ratio and flip sets are grown from a heap: the successors of a set whose last
+    flip is task i either add task i + 1 or move that last flip to i + 1. Every set
+    is reached exactly once and never before a more probable one, so only the
+    scenarios that are yielded, plus the heap frontier, are ever looked at.
+
+    Enumeration stops after number_of_scenarios scenarios or once their probability
+    reaches probability_mass. The weights are renormalized over the covered mass,
+    and the uncovered tail probability is kept in uncovered_probability.
+    """
+
+    name_format = "Most probable task delay scenario {}"
+
+    def __init__(
+        self,
+        number_of_scenarios: int = 100,
+        probability_mass: float = 1.0,
+        renormalize: bool = True,
+    ):
+        if number_of_scenarios < 1:
+            raise ValueError("number_of_scenarios must be at least 1")
+        if not 0 < probability_mass <= 1:
+            raise ValueError("probability_mass must be in (0, 1]")
+
+        self.number_of_scenarios = number_of_scenarios
+        self.probability_mass = probability_mass
+        self.renormalize = renormalize
+        self.covered_probability: Optional[float] = None
+        self.uncovered_probability: Optional[float] = None
+
+    def generate_scenarios(self, scenario_generator, instance):
+        probability = scenario_generator.delay_probability
+        likely_delayed = probability > 0.5
+        likely = np.where(likely_delayed, probability, 1 - probability)
+        unlikely = 1 - likely
+
+        # Tasks that are certain in either state can never be flipped
+        flippable = np.flatnonzero(unlikely > 0)
+        log_ratio = np.log(unlikely[flippable]) - np.log(likely[flippable])
+        order = np.argsort(-log_ratio, kind="stable")
+        flippable = flippable[order]
+        log_ratio = log_ratio[order].tolist()
+
+        log_base = float(np.log(likely).sum())
+        flip_sets: List[tuple] = []
+        log_probabilities = []
+        covered = 0.0
+        heap = [(-(log_base + log_ratio[0]), (0,))] if len(log_ratio) else []
+        flip_set = ()
+        log_probability = log_base
+        while True:
+            flip_sets.append(flip_set)
+            log_probabilities.append(log_probability)
+            covered += math.exp(log_probability)
+            if (
+                len(flip_sets) >= self.number_of_scenarios
+                or covered >= self.probability_mass
+                or not heap
+            ):
+                break
+
+            negative_log_probability, flip_set = heapq.heappop(heap)
+            log_probability = -negative_log_probability
+            last = flip_set[-1]
+            if last + 1 < len(log_ratio):
+                heapq.heappush(
+                    heap,
+                    (
+                        -(log_probability + log_ratio[last + 1]),
+                        flip_set + (last + 1,),
+                    ),
+                )
+                heapq.heappush(
+                    heap,
+                    (
+                        -(log_probability - log_ratio[last] + log_ratio[last + 1]),
+                        flip_set[:-1] + (last + 1,),
+                    ),
+                )
+
+        self.covered_probability = min(covered, 1.0)
+        self.uncovered_probability = max(0.0, 1.0 - covered)
+
+        weights = np.exp(np.array(log_probabilities))
+        if self.renormalize:
+            weights = weights / weights.sum()
+
+        batch_size = scenario_generator.batch_size
+        for batch_start in range(0, len(flip_sets), batch_size):
+            batch_stop = min(batch_start + batch_size, len(flip_sets))
+            delay_mask = np.tile(likely_delayed, (batch_stop - batch_start, 1))
+            for row, flips in enumerate(flip_sets[batch_start:batch_stop]):
+                delay_mask[row, flippable[list(flips)]] ^= True
+            yield from scenario_generator.batch(
+                self.name_format,
+                np.arange(batch_start, batch_stop),
+                delay_mask,
+                weights[batch_start:batch_stop],
+            )
@@ -0,0 +1,40 @@
+import numpy as np
+
+from optimization.scenarios.scenario_generator_strategy import ScenarioGeneratorStrategy
+
+
+class SamplingScenarioGeneratorStrategy(ScenarioGeneratorStrategy):
+    name_format = "Sampled task delay scenario {}"
+
+    def __init__(self, number_of_scenarios: int, seed=None, scenario_budget: int = 1000):
+        if number_of_scenarios < 1:
+            raise ValueError("number_of_scenarios must be at least 1")
+        if number_of_scenarios > scenario_budget:
+            raise ValueError(
+                f"Requested {number_of_scenarios} scenarios, "
+                f"over the scenario budget of {scenario_budget}"
+            )
+
+        self.number_of_scenarios = number_of_scenarios
+        self.seed = seed
+        self.scenario_budget = scenario_budget
+
+    def generate_scenarios(self, scenario_generator, instance):
+        rng = np.random.default_rng(self.seed)
+        weight = 1 / self.number_of_scenarios
+
+        for batch_start in range(
+            0, self.number_of_scenarios, scenario_generator.batch_size
+        ):
+            batch_stop = min(
+                batch_start + scenario_generator.batch_size, self.number_of_scenarios
+            )
+            delay_mask = scenario_generator.sample_delay_mask(
+                rng, batch_stop - batch_start
+            )
+            yield from scenario_generator.batch(
+                self.name_format,
+                np.arange(batch_start, batch_stop),
+                delay_mask,
+                np.full(batch_stop - batch_start, weight),
+            )
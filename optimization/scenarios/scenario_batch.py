@@ -0,0 +1,41 @@
+import numpy as np
+
+from optimization.scenarios.changed_task_duration_scenario import (
+    ChangedTaskDurationScenario,
+)
+
+
+class ScenarioBatch:
+    """
+    A block of task delay scenarios stored as dense arrays: one row per scenario,
+    one column per task. Scenarios are only materialized when iterated, and each one
+    references its row of the duration matrix instead of holding its own dict.
+    """
+
+    def __init__(
+        self,
+        name_format: str,
+        labels: np.ndarray,
+        weights: np.ndarray,
+        delay_mask: np.ndarray,
+        durations: np.ndarray,
+    ):
+        self.name_format = name_format
+        self.labels = labels
+        self.weights = weights
+        self.delay_mask = delay_mask
+        self.durations = durations
+
+    def __len__(self):
+        return len(self.labels)
+
+    def scenario(self, k: int) -> ChangedTaskDurationScenario:
+        return ChangedTaskDurationScenario(
+            name=self.name_format.format(self.labels[k]),
+            weight=float(self.weights[k]),
+            task_duration=self.durations[k],
+        )
+
+    def __iter__(self):
+        for k in range(len(self)):
+            yield self.scenario(k)
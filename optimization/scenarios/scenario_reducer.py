@@ -0,0 +1,58 @@
+import numpy as np
+
+from optimization.scenarios.changed_task_duration_scenario import (
+    ChangedTaskDurationScenario,
+)
+
+
+class ScenarioReducer:
+    """
+    Merges scenarios with identical duration vectors and sums their weights.
+    With merge_dominated, a scenario whose durations are all less than or equal to
+    those of a kept scenario is folded into it as well, which over-approximates
+    the recourse cost in exchange for fewer sub-models.
+    """
+
+    def __init__(self, merge_dominated: bool = False):
+        self.merge_dominated = merge_dominated
+
+    def reduce(self, scenarios):
+        merged = {}
+        for scenario in scenarios:
+            durations = np.asarray(scenario.task_duration, dtype=np.int64)
+            key = durations.tobytes()
+            if key in merged:
+                merged[key][2] += scenario.weight
+            else:
+                merged[key] = [scenario.name, durations, scenario.weight]
+
+        reduced = list(merged.values())
+        if self.merge_dominated:
+            reduced = self._merge_dominated(reduced)
+
+        return [
+            ChangedTaskDurationScenario(
+                name=name, weight=weight, task_duration=durations
+            )
+            for name, durations, weight in reduced
+        ]
+
+    @staticmethod
+    def _merge_dominated(scenarios):
+        if not scenarios:
+            return scenarios
+
+        scenarios = sorted(scenarios, key=lambda scenario: -scenario[1].sum())
+        kept = []
+        kept_durations = np.empty((len(scenarios), len(scenarios[0][1])), np.int64)
+        for scenario in scenarios:
+            dominating = np.flatnonzero(
+                np.all(kept_durations[: len(kept)] >= scenario[1], axis=1)
+            )
+            if len(dominating) > 0:
+                kept[dominating[0]][2] += scenario[2]
+            else:
+                kept_durations[len(kept)] = scenario[1]
+                kept.append(scenario)
+
+        return kept
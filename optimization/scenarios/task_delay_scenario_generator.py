@@ -1,15 +1,38 @@
 from typing import List
 
+import numpy as np
+
+from optimization.domain.columnar_instance import ColumnarInstance
 from optimization.domain.task import Task
 from optimization.scenarios.changed_task_duration_scenario import (
     ChangedTaskDurationScenario,
 )
+from optimization.scenarios.scenario_batch import ScenarioBatch
 from optimization.scenarios.scenario_generator import ScenarioGenerator
 
 
 class TaskDelayScenarioGenerator(ScenarioGenerator):
-    def __init__(self, tasks: List[Task]):
+    name_format = "Task delay scenario {}"
+
+    def __init__(self, tasks: List[Task], batch_size: int = 4096):
         self.tasks = tasks
+        self.batch_size = batch_size
+        columns = getattr(tasks, "instance", None)
+        if isinstance(columns, ColumnarInstance):
+            self.base_duration = columns.base_duration
+            self.delayed_duration = columns.delayed_duration
+            self.delay_probability = columns.delay_probability
+            return
+
+        self.base_duration = np.array(
+            [task.base_duration for task in tasks], dtype=np.int64
+        )
+        self.delayed_duration = np.array(
+            [task.delayed_duration for task in tasks], dtype=np.int64
+        )
+        self.delay_probability = np.array(
+            [task.delay_probability for task in tasks], dtype=np.float64
+        )
 
     @property
     def index_range(self):
@@ -18,27 +41,60 @@ class TaskDelayScenarioGenerator(ScenarioGenerator):
     def index_iterator(self):
         return range(*self.index_range)
 
+    def index_batches(self):
+        start, stop = self.index_range
+        for batch_start in range(start, stop, self.batch_size):
+            batch_stop = min(batch_start + self.batch_size, stop)
+            yield self.generate_by_indices(
+                np.arange(batch_start, batch_stop, dtype=np.uint64)
+            )
+
+    def decode_index(self, index: int) -> np.ndarray:
+        n_tasks = len(self.tasks)
+        raw = np.frombuffer(
+            index.to_bytes(max((n_tasks + 7) // 8, 1), "little"), dtype=np.uint8
+        )
+        return np.unpackbits(raw, bitorder="little")[:n_tasks].astype(bool)
+
+    def decode_indices(self, indices: np.ndarray) -> np.ndarray:
+        if len(self.tasks) > 64:
+            raise ValueError("Batched index decoding supports at most 64 tasks")
+
+        raw = np.ascontiguousarray(indices, dtype="<u8").view(np.uint8)
+        bits = np.unpackbits(raw.reshape(-1, 8), axis=1, bitorder="little")
+        return bits[:, : len(self.tasks)].astype(bool)
+
+    def sample_delay_mask(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return rng.random((size, len(self.tasks))) < self.delay_probability
+
+    def durations(self, delay_mask: np.ndarray) -> np.ndarray:
+        return np.where(delay_mask, self.delayed_duration, self.base_duration)
+
+    def weights(self, delay_mask: np.ndarray) -> np.ndarray:
+        return np.where(
+            delay_mask, self.delay_probability, 1 - self.delay_probability
+        ).prod(axis=-1)
+
+    def batch(self, name_format, labels, delay_mask, weights=None) -> ScenarioBatch:
+        if weights is None:
+            weights = self.weights(delay_mask)
+
+        return ScenarioBatch(
+            name_format=name_format,
+            labels=labels,
+            weights=weights,
+            delay_mask=delay_mask,
+            durations=self.durations(delay_mask),
+        )
+
+    def generate_by_indices(self, indices: np.ndarray) -> ScenarioBatch:
+        return self.batch(self.name_format, indices, self.decode_indices(indices))
+
     def generate_by_index(self, index):
-        i = 0
-        delayed_tasks = set()
-        while (1 << i) <= index:
-            if index & (1 << i) > 0:
-                delayed_tasks.add(i)
-
-            i += 1
-
-        task_duration = {}
-        weight = 1
-        for s, task in enumerate(self.tasks):
-            if s in delayed_tasks:
-                task_duration[s] = task.delayed_duration
-                weight *= task.delay_probability
-            else:
-                task_duration[s] = task.base_duration
-                weight *= 1 - task.delay_probability
+        delay_mask = self.decode_index(index)
 
         return ChangedTaskDurationScenario(
-            name=f"Task delay scenario {index}",
-            weight=weight,
-            task_duration=task_duration
+            name=self.name_format.format(index),
+            weight=float(self.weights(delay_mask)),
+            task_duration=self.durations(delay_mask),
         )
@@ -1,26 +1,41 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Tuple
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
 
 from optimization.domain.capability import Capability
+from optimization.domain.capability_index import CapabilityIndex
+from optimization.domain.columnar_instance import ColumnarInstance
 from optimization.domain.instance import Instance
 from optimization.domain.machine import Machine
 from optimization.domain.task import Task
 from optimization.solver.model_parameters import ModelParametersBuilder
 
 
+# Per-task values indexed by task: dicts, or the arrays of a ColumnarInstance
+FloatByTask = Union[dict[int, float], np.ndarray]
+IntByTask = Union[dict[int, int], np.ndarray]
+
+
 @dataclass
 class BaseModelParameters:
     M: list[int]
     S: list[int]
     y: set[tuple[int, int]]
     j: set[tuple[int, int]]
-    delay_costs: dict[int, float]
-    advance_costs: dict[int, float]
-    target_execution_times: dict[int, int]
-    task_duration: dict[int, int]
+    delay_costs: FloatByTask
+    advance_costs: FloatByTask
+    target_execution_times: IntByTask
+    task_duration: IntByTask
     start_date: int
     end_date: int
+    task_pairs: dict[tuple[int, int], list[int]]
+    delayed_task_duration: IntByTask
+    delay_probability: FloatByTask
+    earliest_start: Optional[dict[int, int]] = None
+    latest_start: Optional[dict[int, int]] = None
+    big_m: Optional[dict[tuple[int, int], int]] = None
 
 
 class BaseModelParametersBuilder(ModelParametersBuilder):
@@ -35,12 +50,17 @@ class BaseModelParametersBuilder(ModelParametersBuilder):
     S = []
     y = set()
     j = set()
+    compatibility = None
+    columns = None
+    task_pairs = {}
     S_delay = {}
     S_advance = {}
     delay_costs = {}
     advance_costs = {}
     target_execution_times = {}
     task_duration = {}
+    delayed_task_duration = {}
+    delay_probability = {}
 
     def __init__(
         self,
@@ -48,7 +68,12 @@ class BaseModelParametersBuilder(ModelParametersBuilder):
         pass
 
     def build(self, instance: Instance):
+        """
+        A ColumnarInstance is read directly: its arrays become the per-task
+        parameters without being copied
+        """
         self.instance = instance
+        self.columns = instance if isinstance(instance, ColumnarInstance) else None
         self.tasks = instance.tasks
         self.machines = instance.machines
         self.capabilities = instance.capabilities
@@ -71,6 +96,9 @@ class BaseModelParametersBuilder(ModelParametersBuilder):
             self.task_duration,
             self.start_date,
             self.end_date,
+            self.task_pairs,
+            self.delayed_task_duration,
+            self.delay_probability,
         )
 
     def build_basic_arrays(self):
@@ -78,35 +106,77 @@ class BaseModelParametersBuilder(ModelParametersBuilder):
         self.S = [i for i in range(len(self.tasks))]
 
     def build_domain(self):
+        self.compatibility = self.build_compatibility_matrix()
         self.y = self.build_machine_assignment_variables()
+        self.task_pairs = self.build_task_pairs()
         self.j = self.build_task_order_variables()
 
     def build_constants(self):
+        if self.columns is not None:
+            self.build_columnar_constants()
+            return
+
         self.delay_costs = self.build_delay_costs()
         self.advance_costs = self.build_advance_costs()
         self.target_execution_times = self.build_target_execution_times()
         self.task_duration = self.build_task_duration()
+        self.delayed_task_duration = self.build_delayed_task_duration()
+        self.delay_probability = self.build_delay_probability()
+
+    def build_columnar_constants(self):
+        self.delay_costs = self.columns.late_penalty
+        self.advance_costs = self.columns.early_penalty
+        self.target_execution_times = self.columns.target_days()
+        self.task_duration = self.columns.base_duration
+        self.delayed_task_duration = self.columns.delayed_duration
+        self.delay_probability = self.columns.delay_probability
 
     @staticmethod
     def __can_machine_perform_task(machine, task):
         return task.required_capabilities.issubset(machine.capabilities)
 
+    def build_compatibility_matrix(self):
+        """
+        M x S boolean matrix of which machine can perform which task, computed on
+        capability bitmasks
+        """
+        if self.columns is not None:
+            return self.columns.compatibility_matrix()
+
+        capability_index = CapabilityIndex(self.capabilities)
+        machine_masks = capability_index.masks(
+            [machine.capabilities for machine in self.machines]
+        )
+        task_masks = capability_index.masks(
+            [task.required_capabilities for task in self.tasks]
+        )
+        return CapabilityIndex.compatibility_matrix(machine_masks, task_masks)
+
     def build_machine_assignment_variables(self):
-        y = set()
-        for m in self.M:
-            for s in self.S:
-                if self.tasks[s].required_capabilities.issubset(
-                    self.machines[m].capabilities
-                ):
-                    y.add((m, s))
-        return y
+        machines, tasks = np.nonzero(self.compatibility)
+        return set(zip(machines.tolist(), tasks.tolist()))
+
+    def build_task_pairs(self):
+        """
+        Edges of the machine-task compatibility graph: every pair of tasks (s, t), s < t,
+        that some machine can run both of, mapped to the machines they share
+        """
+        machine_tasks = {
+            m: np.flatnonzero(self.compatibility[m]).tolist() for m in self.M
+        }
+
+        task_pairs = {}
+        for m, tasks in machine_tasks.items():
+            for a, s in enumerate(tasks):
+                for t in tasks[a + 1 :]:
+                    task_pairs.setdefault((s, t), []).append(m)
+        return task_pairs
 
     def build_task_order_variables(self):
         j = set()
-        for r in self.S:
-            for s in self.S:
-                if r != s:
-                    j.add((r, s))
+        for s, t in self.task_pairs:
+            j.add((s, t))
+            j.add((t, s))
         return j
 
     def build_delay_costs(self):
@@ -123,3 +193,9 @@ class BaseModelParametersBuilder(ModelParametersBuilder):
 
     def build_task_duration(self):
         return {s: self.tasks[s].base_duration for s in self.S}
+
+    def build_delayed_task_duration(self):
+        return {s: self.tasks[s].delayed_duration for s in self.S}
+
+    def build_delay_probability(self):
+        return {s: self.tasks[s].delay_probability for s in self.S}
@@ -0,0 +1,24 @@
+"""
+Entry point of a batch runner job process. It imports nothing heavy, so the thread
+limits are in the environment before NumPy or OR-tools start their thread pools.
+"""
+import os
+import pickle
+
+THREAD_ENVIRONMENT_VARIABLES = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+)
+
+
+def start_job(threads: int, job: bytes, connection):
+    """
+    job is a pickled (function, arguments) pair. It is only unpickled here, since
+    that imports the solver modules.
+    """
+    for variable in THREAD_ENVIRONMENT_VARIABLES:
+        os.environ[variable] = str(threads)
+
+    function, arguments = pickle.loads(job)
+    function(*arguments, connection)
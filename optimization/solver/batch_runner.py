@@ -0,0 +1,273 @@
+"""
+Solves many instances, each in its own process with time and memory limits, and
+streams the results to an output directory as the jobs finish
+"""
+import json
+import multiprocessing
+import os
+import pickle
+import time
+import traceback
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from optimization.domain.instance import Instance
+from optimization.domain.instance_loader import InstanceLoader
+from optimization.model.changed_task_duration_submodel import (
+    ChangedTaskDurationSubModelExpander,
+)
+from optimization.scenarios.no_strategy import NoGeneratorStrategy
+from optimization.scenarios.task_delay_scenario_generator import (
+    TaskDelayScenarioGenerator,
+)
+from optimization.solver.base_model_parameters import BaseModelParametersBuilder
+from optimization.solver.batch_job import start_job
+from optimization.solver.solve_options import SolveOptions
+from optimization.solver.stochastic_solver import StochasticSolver
+
+INSTANCE_SUFFIXES = (".csv", ".parquet", ".arrow", ".feather")
+
+
+@dataclass
+class InstanceFiles:
+    name: str
+    tasks_path: str
+    machines_path: str
+
+
+@dataclass
+class JobResult:
+    name: str
+    status: str
+    seconds: float
+    objective: Optional[float] = None
+    bound: Optional[float] = None
+    error: Optional[str] = None
+
+
+def discover_instances(directory) -> List[InstanceFiles]:
+    """
+    Pairs every <name>_tasks file in directory with its <name>_machines file
+    """
+    instances = []
+    for tasks_path in sorted(Path(directory).iterdir()):
+        if tasks_path.suffix not in INSTANCE_SUFFIXES:
+            continue
+        if not tasks_path.stem.endswith("_tasks"):
+            continue
+
+        name = tasks_path.stem[: -len("_tasks")]
+        machines_path = tasks_path.with_name(f"{name}_machines{tasks_path.suffix}")
+        if machines_path.exists():
+            instances.append(InstanceFiles(name, str(tasks_path), str(machines_path)))
+        else:
+            print(f"Skipping {name}: {machines_path.name} not found")
+    return instances
+
+
+def default_solver(instance: Instance, solve_options: SolveOptions) -> StochasticSolver:
+    return StochasticSolver(
+        TaskDelayScenarioGenerator(instance.tasks),
+        NoGeneratorStrategy(),
+        BaseModelParametersBuilder(),
+        ChangedTaskDurationSubModelExpander(),
+        solve_options=solve_options,
+    )
+
+
+def _limit_memory(memory_limit_bytes: Optional[int]):
+    if memory_limit_bytes is None:
+        return
+
+    import resource
+
+    resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+
+
+def _run_job(
+    instance_files: InstanceFiles,
+    planning_horizon: Tuple[datetime, datetime],
+    solver_factory: Callable[[Instance, SolveOptions], StochasticSolver],
+    solve_options: SolveOptions,
+    memory_limit_bytes: Optional[int],
+    connection,
+):
+    start = time.perf_counter()
+    try:
+        _limit_memory(memory_limit_bytes)
+        instance = InstanceLoader(planning_horizon).load(
+            instance_files.tasks_path, instance_files.machines_path
+        )
+        solution = solver_factory(instance, solve_options).solve(instance)
+        connection.send(
+            (
+                "solved" if solution is not None else "infeasible",
+                solution.to_dict() if solution is not None else None,
+                time.perf_counter() - start,
+                None,
+            )
+        )
+    except MemoryError:
+        connection.send(("out_of_memory", None, time.perf_counter() - start, None))
+    except Exception:
+        connection.send(
+            ("failed", None, time.perf_counter() - start, traceback.format_exc())
+        )
+    finally:
+        connection.close()
+
+
+class BatchRunner:
+    """
+    Runs at most max_jobs solver processes at a time; each job is a fresh process,
+    so a crash, a memory limit hit or a timeout only loses that job. The CPU threads
+    are divided evenly between the concurrent jobs, and each job process limits its
+    native thread pools to its share. A job is killed kill_grace_seconds after its
+    solver time limit, or once it has run for wall_clock_limit seconds, which also
+    bounds jobs without a time limit.
+
+    Every finished job appends a line to results.jsonl in the output directory and
+    writes <name>/solution.json, or <name>/error.txt when it failed.
+    """
+
+    def __init__(
+        self,
+        planning_horizon: Tuple[datetime, datetime],
+        output_directory,
+        max_jobs: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        memory_limit_bytes: Optional[int] = None,
+        total_threads: Optional[int] = None,
+        kill_grace_seconds: float = 30.0,
+        wall_clock_limit: Optional[float] = None,
+        solver_factory: Callable[
+            [Instance, SolveOptions], StochasticSolver
+        ] = default_solver,
+    ):
+        self.planning_horizon = planning_horizon
+        self.output_directory = Path(output_directory)
+        self.total_threads = total_threads or os.cpu_count() or 1
+        self.max_jobs = max(1, min(max_jobs or self.total_threads, self.total_threads))
+        self.time_limit = time_limit
+        self.memory_limit_bytes = memory_limit_bytes
+        self.kill_grace_seconds = kill_grace_seconds
+        self.wall_clock_limit = wall_clock_limit
+        self.solver_factory = solver_factory
+
+    @property
+    def threads_per_job(self) -> int:
+        return max(1, self.total_threads // self.max_jobs)
+
+    def solve_options(self) -> SolveOptions:
+        return SolveOptions(
+            time_limit=self.time_limit, num_threads=self.threads_per_job
+        )
+
+    def run(self, instances: List[InstanceFiles]) -> List[JobResult]:
+        self.output_directory.mkdir(parents=True, exist_ok=True)
+        context = multiprocessing.get_context("spawn")
+        pending = list(reversed(instances))
+        running: Dict[object, Tuple[InstanceFiles, object, float]] = {}
+        results = []
+
+        with open(self.output_directory / "results.jsonl", "a") as results_file:
+            while pending or running:
+                while pending and len(running) < self.max_jobs:
+                    instance_files = pending.pop()
+                    receiver, sender = context.Pipe(duplex=False)
+                    job = pickle.dumps(
+                        (
+                            _run_job,
+                            (
+                                instance_files,
+                                self.planning_horizon,
+                                self.solver_factory,
+                                self.solve_options(),
+                                self.memory_limit_bytes,
+                            ),
+                        )
+                    )
+                    process = context.Process(
+                        target=start_job,
+                        args=(self.threads_per_job, job, sender),
+                        name=f"solve-{instance_files.name}",
+                    )
+                    process.start()
+                    sender.close()
+                    running[receiver] = (instance_files, process, time.perf_counter())
+
+                ready = wait(list(running), timeout=1.0)
+                for receiver in ready:
+                    result = self._collect(receiver, *running.pop(receiver))
+                    self._write(result, results_file)
+                    results.append(result)
+
+                for receiver in self._timed_out(running):
+                    instance_files, process, start = running.pop(receiver)
+                    self._stop(process)
+                    receiver.close()
+                    result = JobResult(
+                        instance_files.name, "timed_out", time.perf_counter() - start
+                    )
+                    self._write(result, results_file)
+                    results.append(result)
+        return results
+
+    def _collect(self, receiver, instance_files, process, start) -> JobResult:
+        try:
+            status, solution, seconds, error = receiver.recv()
+        except EOFError:
+            process.join()
+            return JobResult(
+                instance_files.name,
+                "crashed",
+                time.perf_counter() - start,
+                error=f"Process exited with code {process.exitcode}",
+            )
+        finally:
+            receiver.close()
+
+        process.join()
+        result = JobResult(instance_files.name, status, seconds, error=error)
+        job_directory = self.output_directory / instance_files.name
+        job_directory.mkdir(parents=True, exist_ok=True)
+        if solution is not None:
+            result.objective = solution["objective"]
+            result.bound = solution["bound"]
+            (job_directory / "solution.json").write_text(json.dumps(solution))
+        if error is not None:
+            (job_directory / "error.txt").write_text(error)
+        return result
+
+    def _timed_out(self, running) -> list:
+        deadlines = [self.wall_clock_limit]
+        if self.time_limit is not None:
+            deadlines.append(self.time_limit + self.kill_grace_seconds)
+        deadlines = [deadline for deadline in deadlines if deadline is not None]
+        if not deadlines:
+            return []
+
+        deadline = min(deadlines)
+        now = time.perf_counter()
+        return [
+            receiver
+            for receiver, (_, _, start) in running.items()
+            if now - start > deadline
+        ]
+
+    @staticmethod
+    def _stop(process):
+        process.terminate()
+        process.join(5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+    @staticmethod
+    def _write(result: JobResult, results_file):
+        results_file.write(json.dumps(asdict(result)) + "\n")
+        results_file.flush()
+        print(f"{result.name}: {result.status} in {result.seconds:.1f}s")
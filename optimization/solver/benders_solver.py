@@ -0,0 +1,163 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Callable, Optional
+
+import numpy as np
+
+from ortools.linear_solver import pywraplp
+
+from optimization.domain.instance import Instance
+from optimization.model.base_model import BaseModel
+from optimization.model.benders_master_model import BendersMasterModel
+from optimization.model.scenario_sub_problem import (
+    ScenarioSubProblemData,
+    initialize_sub_problem_worker,
+    solve_scenario_sub_problem,
+)
+from optimization.scenarios.scenario_reducer import ScenarioReducer
+from optimization.solver.model_parameters import ModelParametersBuilder
+from optimization.solver.presolve import Presolver
+from optimization.solver.solution import Solution
+from optimization.solver.solver import Solver
+
+
+class BendersStochasticSolver(Solver):
+    """
+    L-shaped decomposition of the stochastic model: a master problem over the
+    first-stage assignment and ordering, and one LP per scenario for the fixed
+    ordering, solved independently and returned as optimality cuts
+    """
+
+    def __init__(
+        self,
+        scenario_generator,
+        scenario_generation_strategy,
+        model_parameters_builder: ModelParametersBuilder,
+        scenario_reducer: Optional[ScenarioReducer] = None,
+        presolver: Optional[Presolver] = None,
+        tolerance: float = 1e-6,
+        max_iterations: int = 100,
+        max_workers: Optional[int] = None,
+        formatter: Optional[Callable[[Solution], str]] = None,
+    ):
+        if max_iterations < 1:
+            raise ValueError("max_iterations must be at least 1")
+
+        self.scenario_generator = scenario_generator
+        self.scenario_generation_strategy = scenario_generation_strategy
+        self.model_parameters_builder = model_parameters_builder
+        self.scenario_reducer = scenario_reducer
+        self.presolver = presolver
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.max_workers = max_workers
+        self.formatter = formatter
+
+    def solve(self, instance: Instance):
+        scenarios = self.scenario_generation_strategy.generate_scenarios(
+            self.scenario_generator, instance
+        )
+        if self.scenario_reducer is not None:
+            scenarios = self.scenario_reducer.reduce(scenarios)
+        scenarios = list(scenarios)
+
+        model_parameters = self.model_parameters_builder.build(instance)
+        if self.presolver is not None:
+            model_parameters = self.presolver.presolve(model_parameters)
+        master = BendersMasterModel(
+            model_parameters, [scenario.weight for scenario in scenarios]
+        )
+        sub_problem_data = ScenarioSubProblemData(
+            pairs=master.pairs,
+            big_m=[master.big_m(*pair) for pair in master.pairs],
+            start_windows=[master.start_window(s) for s in model_parameters.S],
+            target_execution_times=model_parameters.target_execution_times,
+            delay_costs=model_parameters.delay_costs,
+            advance_costs=model_parameters.advance_costs,
+            end_date=model_parameters.end_date,
+        )
+        durations = [scenario.task_duration for scenario in scenarios]
+
+        if self.max_workers == 1:
+            initialize_sub_problem_worker(sub_problem_data)
+            return self._iterate(master, scenarios, durations, map)
+
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=initialize_sub_problem_worker,
+            initargs=(sub_problem_data,),
+        ) as executor:
+            return self._iterate(master, scenarios, durations, executor.map)
+
+    def _iterate(self, master: BendersMasterModel, scenarios, durations, map_function):
+        lower_bound = -math.inf
+        upper_bound = math.inf
+        incumbent = None
+
+        for iteration in range(1, self.max_iterations + 1):
+            if master.model.Solve() != pywraplp.Solver.OPTIMAL:
+                print("The master problem does not have an optimal solution.")
+                return None
+
+            lower_bound = master.objective.Value()
+            j_values = master.j_values()
+            results = list(
+                map_function(solve_scenario_sub_problem, durations, repeat(j_values))
+            )
+
+            if not all(result.feasible for result in results):
+                master.add_feasibility_cut(j_values)
+                continue
+
+            first_stage_cost = lower_bound - master.recourse_estimate()
+            upper = first_stage_cost + sum(
+                scenario.weight * result.objective
+                for scenario, result in zip(scenarios, results)
+            )
+            if upper < upper_bound:
+                upper_bound = upper
+                incumbent = self._snapshot(master, scenarios, results)
+
+            if upper_bound - lower_bound <= self.tolerance * max(1.0, abs(upper_bound)):
+                break
+
+            for k, result in enumerate(results):
+                master.add_optimality_cut(k, result, j_values)
+
+        print(
+            f"Benders finished after {iteration} iterations: "
+            f"lower bound {lower_bound}, upper bound {upper_bound}"
+        )
+        if incumbent is None:
+            print("The problem does not have a feasible solution.")
+            return None
+
+        incumbent.objective = upper_bound
+        incumbent.bound = lower_bound
+        if self.formatter is not None:
+            print(self.formatter(incumbent))
+        return incumbent
+
+    @staticmethod
+    def _snapshot(master: BendersMasterModel, scenarios, results) -> Solution:
+        solution = master.solution_layout().build(
+            BaseModel.solver_output(master.model, pywraplp.Solver.OPTIMAL)
+        )
+        model_parameters = master.model_parameters
+        targets = np.array(
+            [model_parameters.target_execution_times[s] for s in model_parameters.S],
+            dtype=np.float64,
+        )
+        solution.scenario_names = [scenario.name for scenario in scenarios]
+        solution.scenario_weights = np.array(
+            [scenario.weight for scenario in scenarios], dtype=np.float64
+        )
+        solution.scenario_start = np.array([result.start for result in results])
+        solution.scenario_end = solution.scenario_start + np.array(
+            [scenario.task_duration for scenario in scenarios], dtype=np.float64
+        )
+        solution.scenario_delay = np.maximum(solution.scenario_start - targets, 0)
+        solution.scenario_advance = np.maximum(targets - solution.scenario_start, 0)
+        solution.scenario_cost = np.array([result.objective for result in results])
+        return solution
@@ -0,0 +1,127 @@
+"""
+Content-addressed on-disk cache for serialized models and their solutions
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from optimization.domain.instance import Instance
+
+_SETTING_TYPES = (bool, int, float, str, type(None))
+
+
+def describe(component) -> Optional[dict]:
+    """
+    The type of a solver component and its plain settings and arrays, as a stable
+    description for cache keys
+    """
+    if component is None:
+        return None
+
+    if isinstance(component, type):
+        return {"type": f"{component.__module__}.{component.__qualname__}"}
+
+    component_type = type(component)
+    return {
+        "type": f"{component_type.__module__}.{component_type.__qualname__}",
+        **{
+            name: value
+            for name, value in sorted(vars(component).items())
+            if isinstance(value, _SETTING_TYPES)
+        },
+        **{
+            name: value.tolist()
+            for name, value in sorted(vars(component).items())
+            if isinstance(value, np.ndarray)
+        },
+    }
+
+
+def instance_fingerprint(instance: Instance) -> dict:
+    return {
+        "tasks": [
+            {
+                "name": task.name,
+                "delay_probability": float(task.delay_probability),
+                "base_duration": int(task.base_duration),
+                "delayed_duration": int(task.delayed_duration),
+                "target_date": task.target_date.isoformat(),
+                "early_penalty": float(task.early_penalty),
+                "late_penalty": float(task.late_penalty),
+                "required_capabilities": sorted(
+                    capability.name for capability in task.required_capabilities
+                ),
+            }
+            for task in instance.tasks
+        ],
+        "machines": [
+            {
+                "name": machine.name,
+                "capabilities": sorted(
+                    capability.name for capability in machine.capabilities
+                ),
+            }
+            for machine in instance.machines
+        ],
+        "planning_horizon": [date.isoformat() for date in instance.planning_horizon],
+    }
+
+
+def stable_hash(*parts) -> str:
+    serialized = json.dumps(parts, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+class ModelCache:
+    """
+    Files are named by key and kind. Reading a file refreshes its modification
+    time, and the least recently used files are removed once the cache grows
+    beyond max_bytes.
+    """
+
+    def __init__(self, directory="cache", max_bytes: int = 1 << 30):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str, kind: str) -> Path:
+        return self.directory / f"{key}.{kind}"
+
+    def get(self, key: str, kind: str) -> Optional[bytes]:
+        path = self._path(key, kind)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        os.utime(path)
+        return data
+
+    def put(self, key: str, kind: str, data: bytes):
+        path = self._path(key, kind)
+        temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary_path.write_bytes(data)
+        os.replace(temporary_path, path)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in self.directory.iterdir():
+            if path.suffix == ".tmp":
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,72 @@
+import json
+
+from optimization.domain.instance import Instance
+from optimization.solver.cache import ModelCache, instance_fingerprint, stable_hash
+from optimization.solver.solution import Solution, SolutionLayout
+from optimization.solver.solver import Solver
+from optimization.solver.stochastic_solver import StochasticSolver
+
+
+class CachedSolver(Solver):
+    """
+    Wraps a StochasticSolver. The serialized model is keyed by the instance and the
+    model settings, and the solution additionally by the solver options, so a run
+    that only changes solver options reuses the built model. The model's solution
+    layout is stored next to it so a cached model still yields a full Solution.
+    A solver whose scenario generation is randomized without a seed is not cached.
+    """
+
+    model_kind = "model.pb"
+    layout_kind = "layout.json"
+    solution_kind = "solution.json"
+
+    def __init__(self, solver: StochasticSolver, cache: ModelCache):
+        self.solver = solver
+        self.cache = cache
+
+    def keys(self, instance: Instance):
+        model_key = stable_hash(instance_fingerprint(instance), self.solver.model_settings())
+        solution_key = stable_hash(model_key, self.solver.solver_options())
+        return model_key, solution_key
+
+    def cacheable(self) -> bool:
+        strategy = self.solver.scenario_generation_strategy
+        return getattr(strategy, "seed", 0) is not None
+
+    def solve(self, instance: Instance):
+        if not self.cacheable():
+            print("Not using the cache, the scenario generation has no seed")
+            return self.solver.solve(instance)
+
+        model_key, solution_key = self.keys(instance)
+
+        cached_solution = self.cache.get(solution_key, self.solution_kind)
+        if cached_solution is not None:
+            print(f"Using cached solution {solution_key}")
+            return Solution.from_dict(json.loads(cached_solution))
+
+        serialized_model = self.cache.get(model_key, self.model_kind)
+        cached_layout = self.cache.get(model_key, self.layout_kind)
+        if serialized_model is None or cached_layout is None:
+            base_model = self.solver.build_model(instance)
+            self.cache.put(model_key, self.model_kind, base_model.export_model())
+            layout = base_model.solution_layout()
+            self.cache.put(
+                model_key, self.layout_kind, json.dumps(layout.to_dict()).encode()
+            )
+            solution = base_model.solve(self.solver.solve_options)
+        else:
+            print(f"Using cached model {model_key}")
+            layout = SolutionLayout.from_dict(json.loads(cached_layout))
+            output = self.solver.base_model_factory.solve_serialized(
+                serialized_model, self.solver.solve_options
+            )
+            solution = layout.build(output) if output is not None else None
+
+        if solution is not None:
+            self.cache.put(
+                solution_key, self.solution_kind, json.dumps(solution.to_dict()).encode()
+            )
+            if self.solver.formatter is not None:
+                print(self.solver.formatter(solution))
+        return solution
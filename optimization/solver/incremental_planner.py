@@ -0,0 +1,325 @@
+"""
+Keeps a built model in memory while the schedule is executed, and re-plans after
+every observation by changing only the variables and constraints it affects
+"""
+import time
+from functools import partial
+from typing import Iterable, Optional
+
+import numpy as np
+
+from optimization.domain.instance import Instance
+from optimization.domain.task import Task
+from optimization.model.base_model import BaseModel
+from optimization.model.changed_task_duration_submodel import (
+    ChangedTaskDurationSubModelExpander,
+)
+from optimization.solver.solution import Solution
+from optimization.solver.stochastic_solver import StochasticSolver
+
+PER_TASK_PARAMETERS = (
+    "delay_costs",
+    "advance_costs",
+    "target_execution_times",
+    "task_duration",
+    "delayed_task_duration",
+    "delay_probability",
+)
+
+
+class IncrementalPlanner:
+    """
+    Builds the model of a StochasticSolver once and updates it in place: fixing a
+    start or a machine changes variable bounds, a new duration changes the right
+    hand side of the task's overlap constraints, a removed task or a dropped
+    scenario has its constraints relaxed and its costs zeroed, and a new task only
+    adds its own variables and constraints. Every re-solve is hinted with the
+    previous solution.
+
+    Presolved start windows and big-M values are derived from the whole task set and
+    would not hold after an update, so the solver must not have a presolver, and
+    neither do symmetry breaking constraints. The model is built on the scip backend
+    with keep_constraints, so it keeps the constraint handles this needs.
+    """
+
+    def __init__(
+        self, solver: StochasticSolver, instance: Instance, verbose: bool = True
+    ):
+        if solver.presolver is not None:
+            raise ValueError("The incremental planner needs a solver without presolver")
+        if solver.base_model_factory is not BaseModel or not isinstance(
+            solver.model_expander, ChangedTaskDurationSubModelExpander
+        ):
+            raise ValueError("The incremental planner needs the scip backend")
+        if solver.symmetry_breaker is not None:
+            raise ValueError(
+                "Symmetry breaking constraints do not hold after fixing or adding tasks"
+            )
+
+        self.solver = solver
+        self.instance = instance
+        self.verbose = verbose
+        self.base_model = solver.build_model(
+            instance, base_model_factory=partial(BaseModel, keep_constraints=True)
+        )
+        self.model_parameters = self.base_model.model_parameters
+        self.output = None
+        self.solution: Optional[Solution] = None
+        self.solve_time = None
+        self.removed = set()
+
+        p = self.model_parameters
+        # Tasks are added to the parameters, so arrays are turned into dicts
+        for name in PER_TASK_PARAMETERS:
+            values = getattr(p, name)
+            if isinstance(values, np.ndarray):
+                setattr(p, name, dict(enumerate(values.tolist())))
+        p.S = list(p.S)
+        for sub_model in self.base_model.sub_models.values():
+            # A copy, so observed durations are not written into the scenario batch
+            sub_model.task_duration = np.array(sub_model.task_duration, dtype=np.int64)
+
+        self.machine_tasks = {m: [] for m in p.M}
+        for m, s in sorted(self.base_model.y):
+            self.machine_tasks[m].append(s)
+        self.successors = {s: [] for s in p.S}
+        for s, r in self.base_model.j:
+            self.successors[s].append(r)
+
+    def solve(self) -> Optional[Solution]:
+        """
+        The first call is a cold solve; later calls hint every variable that existed
+        in the previous solve with its previous value
+        """
+        model = self.base_model.model
+        start = time.perf_counter()
+        if self.output is not None:
+            model.SetHint(
+                model.variables()[: len(self.output.values)],
+                self.output.values.tolist(),
+            )
+
+        solution = self.base_model.solve(self.solver.solve_options)
+        self.solve_time = time.perf_counter() - start
+        if solution is None:
+            return None
+
+        # From now on the previous solution is the hint
+        self.base_model.first_stage_hint = None
+        self.output = BaseModel.solver_output(model, self.base_model.status)
+        self.solution = solution
+        return solution
+
+    def _fix(self, variable, value):
+        variable.SetBounds(value, value)
+        if self.output is not None and variable.index() < len(self.output.values):
+            self.output.values[variable.index()] = value
+
+    def _start_variables(self) -> list:
+        return [self.base_model.s_t] + [
+            sub_model.s_t for sub_model in self.base_model.sub_models.values()
+        ]
+
+    def fix_start(self, s: int, start: int):
+        """
+        Task s has started, so it starts at start in the first stage and in every
+        scenario
+        """
+        for s_t in self._start_variables():
+            self._fix(s_t[s], start)
+
+    def fix_machine(self, s: int, m: int):
+        if (m, s) not in self.base_model.y:
+            raise ValueError(f"Machine {m} cannot run task {s}")
+
+        for machine in self.model_parameters.M:
+            if (machine, s) in self.base_model.y:
+                self._fix(self.base_model.y[machine, s], 1 if machine == m else 0)
+
+    def change_duration(self, s: int, duration: int):
+        """
+        Sets the duration of task s in the first stage and in every scenario. The
+        overlap constraint s_t[s] + d <= s_t[r] + M (1 - j[s, r]) is stored as
+        s_t[s] - s_t[r] + M j[s, r] <= M - d, so only its upper bound changes.
+        """
+        base_model = self.base_model
+        self.model_parameters.task_duration[s] = duration
+        for sub_model in base_model.sub_models.values():
+            sub_model.task_duration[s] = duration
+        if s in self.removed:
+            return
+
+        for r in self.successors[s]:
+            base_model.constraints["overlap", s, r].SetUb(
+                base_model.big_m(s, r) - duration
+            )
+        for sub_model in base_model.sub_models.values():
+            for r in self.successors[s]:
+                sub_model.constraints["overlap", s, r].SetUb(
+                    base_model.big_m(s, r) - duration
+                )
+
+    def observe_duration(self, s: int, duration: int):
+        """
+        Drops the scenarios in which task s has another duration, then changes the
+        duration. If no scenario has the observed duration, all of them are kept.
+        """
+        ruled_out = [
+            sub_model.scenario.name
+            for sub_model in self.base_model.sub_models.values()
+            if int(sub_model.task_duration[s]) != duration
+        ]
+        if len(ruled_out) < len(self.base_model.sub_models):
+            self.drop_scenarios(ruled_out)
+        elif self.verbose:
+            print(f"No scenario has duration {duration} for task {s}, keeping them all")
+        self.change_duration(s, duration)
+
+    def drop_scenarios(self, scenario_names: Iterable[str]):
+        """
+        Relaxes the constraints of the dropped scenarios and zeroes their costs, and
+        scales the weights of the remaining scenarios back to the previous total
+        """
+        scenario_names = set(scenario_names)
+        sub_models = self.base_model.sub_models
+        dropped = [
+            sub_model
+            for sub_model in sub_models.values()
+            if sub_model.scenario.name in scenario_names
+        ]
+        if not dropped:
+            return
+        if len(dropped) == len(sub_models):
+            raise ValueError("At least one scenario has to remain")
+
+        total_weight = sum(sub_model.weight for sub_model in sub_models.values())
+        infinity = self.base_model.model.infinity()
+        objective = self.base_model.objective
+        for sub_model in dropped:
+            for constraint in sub_model.constraints.values():
+                constraint.SetBounds(-infinity, infinity)
+            for s in self.model_parameters.S:
+                objective.SetCoefficient(sub_model.s_delay[s], 0)
+                objective.SetCoefficient(sub_model.s_advance[s], 0)
+            del sub_models[sub_model.name]
+
+        remaining_weight = sum(sub_model.weight for sub_model in sub_models.values())
+        for sub_model in sub_models.values():
+            sub_model.weight *= total_weight / remaining_weight
+            for s in self.model_parameters.S:
+                if s not in self.removed:
+                    ChangedTaskDurationSubModelExpander.set_sub_model_task_cost(
+                        self.base_model, sub_model, s
+                    )
+
+    def remove_task(self, s: int):
+        """
+        Unassigns task s and relaxes its overlap constraints; its variables stay in
+        the model without cost, and its machine in the solution is -1
+        """
+        base_model = self.base_model
+        infinity = base_model.model.infinity()
+        self.removed.add(s)
+        for machine in self.model_parameters.M:
+            if (machine, s) in base_model.y:
+                self._fix(base_model.y[machine, s], 0)
+        base_model.constraints["machine_assignment", s].SetBounds(0, 0)
+
+        constraint_sets = [base_model.constraints] + [
+            sub_model.constraints for sub_model in base_model.sub_models.values()
+        ]
+        for r in self.successors[s]:
+            self._fix(base_model.j[s, r], 0)
+            self._fix(base_model.j[r, s], 0)
+            for constraints in constraint_sets:
+                constraints["overlap", s, r].SetBounds(-infinity, infinity)
+                constraints["overlap", r, s].SetBounds(-infinity, infinity)
+
+        objective = base_model.objective
+        for variables in [base_model] + list(base_model.sub_models.values()):
+            objective.SetCoefficient(variables.s_delay[s], 0)
+            objective.SetCoefficient(variables.s_advance[s], 0)
+
+    def add_task(self, task: Task) -> int:
+        """
+        Adds task with its own variables and constraints, and returns its index. The
+        scenarios have not sampled its delay, so it has its base duration in all of
+        them.
+        """
+        base_model = self.base_model
+        model = base_model.model
+        p = self.model_parameters
+        machines = [
+            m
+            for m in p.M
+            if task.required_capabilities.issubset(
+                self.instance.machines[m].capabilities
+            )
+        ]
+        if not machines:
+            raise ValueError(f"No machine can run task {task.name}")
+
+        s = len(p.S)
+        p.S.append(s)
+        p.delay_costs[s] = task.late_penalty
+        p.advance_costs[s] = task.early_penalty
+        p.target_execution_times[s] = (
+            task.target_date - self.instance.planning_horizon[0]
+        ).days
+        p.task_duration[s] = task.base_duration
+        p.delayed_task_duration[s] = task.delayed_duration
+        p.delay_probability[s] = task.delay_probability
+        # The new variables do not extend the existing blocks
+        base_model.contiguous_layout = False
+
+        shared_machines = {}
+        for m in machines:
+            p.y.add((m, s))
+            base_model.y[m, s] = model.IntVar(0, 1, f"y_{m}_{s}")
+            for r in self.machine_tasks[m]:
+                if r not in self.removed:
+                    shared_machines.setdefault(r, []).append(m)
+            self.machine_tasks[m].append(s)
+
+        self.successors[s] = []
+        for r, shared in shared_machines.items():
+            p.task_pairs[r, s] = shared
+            for a, b in ((r, s), (s, r)):
+                p.j.add((a, b))
+                base_model.j[a, b] = model.IntVar(0, 1, f"j_{a}_{b}")
+                self.successors[a].append(b)
+
+        s_advance, s_delay, s_t = base_model.create_task_variables("", [s])
+        base_model.s_advance.update(s_advance)
+        base_model.s_delay.update(s_delay)
+        base_model.s_t.update(s_t)
+        for r, shared in shared_machines.items():
+            base_model.add_overlap_constraint(r, s)
+            base_model.add_overlap_constraint(s, r)
+            base_model.add_asymmetric_task_sequence_constraint(r, s)
+            for m in shared:
+                base_model.add_task_sequence_requirement_constraint(r, s, m)
+        base_model.add_advance_constraint(s)
+        base_model.add_delay_constraint(s)
+        base_model.add_machine_assignment_constraint(s)
+        base_model.objective.SetCoefficient(base_model.s_advance[s], p.advance_costs[s])
+        base_model.objective.SetCoefficient(base_model.s_delay[s], p.delay_costs[s])
+
+        expander = ChangedTaskDurationSubModelExpander
+        for sub_model in base_model.sub_models.values():
+            sub_model.task_duration = np.append(
+                sub_model.task_duration, task.base_duration
+            )
+            s_advance, s_delay, s_t = base_model.create_task_variables(
+                f"{sub_model.scenario.name}_", [s]
+            )
+            sub_model.s_advance.update(s_advance)
+            sub_model.s_delay.update(s_delay)
+            sub_model.s_t.update(s_t)
+            for r in shared_machines:
+                expander.add_sub_model_overlap_constraint(base_model, sub_model, r, s)
+                expander.add_sub_model_overlap_constraint(base_model, sub_model, s, r)
+            expander.add_sub_model_advance_constraint(base_model, sub_model, s)
+            expander.add_sub_model_delay_constraint(base_model, sub_model, s)
+            expander.set_sub_model_task_cost(base_model, sub_model, s)
+        return s
@@ -0,0 +1,203 @@
+"""
+Per-phase timings, memory peaks and model-size metrics, sent to a pluggable sink
+"""
+import json
+import logging
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+@dataclass
+class Metric:
+    name: str
+    value: float
+    labels: Dict[str, str] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+
+class MetricsSink(ABC):
+    @abstractmethod
+    def emit(self, metric: Metric):
+        pass
+
+    def close(self):
+        pass
+
+
+class LoggingSink(MetricsSink):
+    def __init__(self, logger: Optional[logging.Logger] = None, level=logging.INFO):
+        self.logger = logger or logging.getLogger("optimization.instrumentation")
+        self.level = level
+
+    def emit(self, metric: Metric):
+        labels = ", ".join(f"{key}={value}" for key, value in metric.labels.items())
+        self.logger.log(self.level, "%s{%s} %s", metric.name, labels, metric.value)
+
+
+class JsonLinesSink(MetricsSink):
+    def __init__(self, path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(path, "a")
+
+    def emit(self, metric: Metric):
+        self.file.write(json.dumps(asdict(metric)) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class PrometheusSink(MetricsSink):
+    """
+    Keeps the last value of every metric and label set, and writes them in the
+    Prometheus text exposition format on close, e.g. for the node exporter's
+    textfile collector
+    """
+
+    def __init__(self, path, prefix: str = "stochastic_opti"):
+        self.path = Path(path)
+        self.prefix = prefix
+        self.values: Dict[str, Dict[tuple, float]] = {}
+
+    def emit(self, metric: Metric):
+        labels = tuple(sorted(metric.labels.items()))
+        self.values.setdefault(metric.name, {})[labels] = metric.value
+
+    def render(self) -> str:
+        lines = []
+        for name, series in sorted(self.values.items()):
+            full_name = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {full_name} gauge")
+            for labels, value in series.items():
+                rendered = ",".join(
+                    f'{key}="{str(label).replace(chr(34), chr(39))}"'
+                    for key, label in labels
+                )
+                lines.append(f"{full_name}{{{rendered}}} {value}")
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(self.path.suffix + ".tmp")
+        temporary.write_text(self.render())
+        temporary.replace(self.path)
+
+
+class Instrumentation:
+    """
+    Phases can be nested; each records its wall time and, with trace_memory, the peak
+    of Python allocations while it ran. Memory allocated inside the solver libraries
+    is not visible to tracemalloc.
+    """
+
+    enabled = True
+
+    def __init__(self, sink: MetricsSink, trace_memory: bool = True):
+        self.sink = sink
+        self.trace_memory = trace_memory
+        self._peaks: List[List[int]] = []
+        self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name: str, **labels):
+        labels = {"phase": name, **labels}
+        if self.trace_memory:
+            self._start_tracing()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.gauge("phase_seconds", time.perf_counter() - start, **labels)
+            if self.trace_memory:
+                self.gauge("phase_peak_bytes", self._stop_tracing(), **labels)
+
+    def _start_tracing(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self._peaks:
+            outer = self._peaks[-1]
+            outer[1] = max(outer[1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        self._peaks.append([tracemalloc.get_traced_memory()[0], 0])
+
+    def _stop_tracing(self) -> int:
+        start_size, inner_peak = self._peaks.pop()
+        peak = max(tracemalloc.get_traced_memory()[1], inner_peak)
+        if self._peaks:
+            self._peaks[-1][1] = max(self._peaks[-1][1], peak)
+            tracemalloc.reset_peak()
+        elif self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return peak - start_size
+
+    def gauge(self, name: str, value: float, **labels):
+        self.sink.emit(Metric(name, float(value), labels))
+
+    def model_size(self, model, **labels):
+        variables, constraints = model.model_size()
+        self.gauge("variables", variables, **labels)
+        self.gauge("constraints", constraints, **labels)
+
+    @contextmanager
+    def size_change(self, model, **labels):
+        """
+        Records the variables and constraints added to model inside the block
+        """
+        variables, constraints = model.model_size()
+        yield
+        added_variables, added_constraints = model.model_size()
+        self.gauge("added_variables", added_variables - variables, **labels)
+        self.gauge("added_constraints", added_constraints - constraints, **labels)
+
+    def solver_statistics(self, objective: float, bound: float, nodes: int, **labels):
+        self.gauge("solver_nodes", nodes, **labels)
+        self.gauge("solver_objective", objective, **labels)
+        self.gauge("solver_bound", bound, **labels)
+        self.gauge(
+            "solver_relative_gap",
+            abs(objective - bound) / max(abs(objective), 1e-9),
+            **labels,
+        )
+
+    def close(self):
+        self.sink.close()
+
+
+class NullInstrumentation(Instrumentation):
+    """
+    Disabled instrumentation: phases are a shared no-op context and nothing is
+    measured or emitted
+    """
+
+    enabled = False
+    _null_phase = nullcontext()
+
+    def __init__(self):
+        pass
+
+    def phase(self, name: str, **labels):
+        return self._null_phase
+
+    def gauge(self, name: str, value: float, **labels):
+        pass
+
+    def model_size(self, model, **labels):
+        pass
+
+    def size_change(self, model, **labels):
+        return self._null_phase
+
+    def solver_statistics(self, objective: float, bound: float, nodes: int, **labels):
+        pass
+
+    def close(self):
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
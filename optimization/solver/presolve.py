@@ -0,0 +1,127 @@
+"""
+Tightens the model parameters before the model is created: start windows per task,
+big-M values per task pair, and task orderings that are implied by those windows
+"""
+from dataclasses import dataclass, replace
+
+from optimization.solver.base_model_parameters import BaseModelParameters
+
+
+@dataclass
+class PresolveReport:
+    tightened_windows: int
+    dropped_pairs: int
+    removed_variables: int
+    removed_constraints: int
+    removed_constraints_per_scenario: int
+
+    def __str__(self):
+        return (
+            f"Presolve tightened {self.tightened_windows} start windows, dropped "
+            f"{self.dropped_pairs} task pairs, removed {self.removed_variables} "
+            f"variables and {self.removed_constraints} constraints, plus "
+            f"{self.removed_constraints_per_scenario} constraints per scenario"
+        )
+
+
+class Presolver:
+    """
+    Start windows rely on every optimal schedule being tight: with positive late
+    penalties, a task that follows idle time on its machine never starts after its
+    target, so no task starts later than the latest target among the tasks it can
+    share a machine with plus their durations. With positive early penalties the
+    mirrored argument bounds the earliest start. Durations are taken over the base
+    and delayed cases, so the windows hold for every scenario.
+    """
+
+    def __init__(self, verbose: bool = True):
+        self.verbose = verbose
+        self.report = None
+
+    def presolve(self, model_parameters: BaseModelParameters) -> BaseModelParameters:
+        p = model_parameters
+        end_date = p.end_date
+        shortest = {
+            s: min(p.task_duration[s], p.delayed_task_duration[s]) for s in p.S
+        }
+        longest = {
+            s: max(p.task_duration[s], p.delayed_task_duration[s]) for s in p.S
+        }
+
+        neighbours = {s: {s} for s in p.S}
+        for s, t in p.task_pairs:
+            neighbours[s].add(t)
+            neighbours[t].add(s)
+
+        bound_latest = all(p.delay_costs[r] > 0 for r in p.S)
+        bound_earliest = all(p.advance_costs[r] > 0 for r in p.S)
+        earliest_start = {s: 0 for s in p.S}
+        latest_start = {s: end_date for s in p.S}
+        for s in p.S:
+            workload = sum(longest[r] for r in neighbours[s])
+            if bound_latest:
+                latest_target = max(p.target_execution_times[r] for r in neighbours[s])
+                latest_start[s] = min(
+                    end_date, max(latest_target, 0) + workload - longest[s]
+                )
+            if bound_earliest:
+                earliest_target = min(
+                    min(p.target_execution_times[r], end_date) for r in neighbours[s]
+                )
+                earliest_start[s] = max(0, earliest_target - workload)
+
+        task_pairs = {}
+        j = set(p.j)
+        dropped_pairs = 0
+        removed_variables = 0
+        removed_constraints = 0
+        removed_constraints_per_scenario = 0
+        for (s, t), machines in p.task_pairs.items():
+            if (
+                latest_start[s] + longest[s] <= earliest_start[t]
+                or latest_start[t] + longest[t] <= earliest_start[s]
+            ):
+                dropped_pairs += 1
+                j -= {(s, t), (t, s)}
+                removed_variables += 2
+                removed_constraints += 3 + len(machines)
+                removed_constraints_per_scenario += 2
+                continue
+
+            task_pairs[s, t] = machines
+            for first, second in ((s, t), (t, s)):
+                if earliest_start[second] + shortest[second] > latest_start[first]:
+                    j.discard((second, first))
+                    removed_variables += 1
+                    removed_constraints += 1
+                    removed_constraints_per_scenario += 1
+            if (s, t) not in j or (t, s) not in j:
+                removed_constraints += 1
+
+        big_m = {
+            (s, r): min(
+                end_date, max(0, latest_start[s] + longest[s] - earliest_start[r])
+            )
+            for s, r in j
+        }
+
+        self.report = PresolveReport(
+            tightened_windows=sum(
+                earliest_start[s] > 0 or latest_start[s] < end_date for s in p.S
+            ),
+            dropped_pairs=dropped_pairs,
+            removed_variables=removed_variables,
+            removed_constraints=removed_constraints,
+            removed_constraints_per_scenario=removed_constraints_per_scenario,
+        )
+        if self.verbose:
+            print(self.report)
+
+        return replace(
+            model_parameters,
+            j=j,
+            task_pairs=task_pairs,
+            earliest_start=earliest_start,
+            latest_start=latest_start,
+            big_m=big_m,
+        )
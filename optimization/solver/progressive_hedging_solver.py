@@ -0,0 +1,267 @@
+import multiprocessing
+import os
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from optimization.domain.instance import Instance
+from optimization.model.scenario_hedging_model import (
+    ScenarioHedgingWorker,
+    partition_scenarios,
+    repair_first_stage,
+    run_hedging_worker,
+)
+from optimization.scenarios.scenario_reducer import ScenarioReducer
+from optimization.solver.model_parameters import ModelParametersBuilder
+from optimization.solver.presolve import Presolver
+from optimization.solver.solution import Solution
+from optimization.solver.solve_options import SolveOptions
+from optimization.solver.solver import Solver
+
+
+class _InlineWorker:
+    def __init__(self, worker: ScenarioHedgingWorker):
+        self.worker = worker
+        self.message = None
+
+    def submit(self, message):
+        self.message = message
+
+    def result(self) -> dict:
+        return self.worker.handle(self.message)
+
+
+class _ProcessWorker:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def submit(self, message):
+        self.connection.send(message)
+
+    def result(self) -> dict:
+        return self.connection.recv()
+
+
+class ProgressiveHedgingSolver(Solver):
+    """
+    Progressive hedging over the first-stage y and j: every scenario is solved as
+    its own model in a persistent worker process, and each iteration penalizes the
+    distance of its y and j to their probability-weighted consensus. Since y and j
+    are binary, the proximal term rho/2 * (x - x_bar)^2 equals rho/2 * (1 - 2 x_bar)
+    * x plus a constant, so the scenario models stay linear.
+
+    Once the consensus has converged, or after max_iterations, it is repaired into
+    a feasible y and j, which the workers fix in the scenario models they hold and
+    solve for the start times. The solution combines their start times and weighted
+    costs, so no process ever builds the extensive model. Its bound is the
+    wait-and-see bound of the first iteration, which holds when the scenario
+    weights sum to one.
+    """
+
+    def __init__(
+        self,
+        scenario_generator,
+        scenario_generation_strategy,
+        model_parameters_builder: ModelParametersBuilder,
+        scenario_reducer: Optional[ScenarioReducer] = None,
+        presolver: Optional[Presolver] = None,
+        rho: float = 1.0,
+        tolerance: float = 1e-3,
+        max_iterations: int = 50,
+        max_workers: Optional[int] = None,
+        solve_options: Optional[SolveOptions] = None,
+        formatter: Optional[Callable[[Solution], str]] = None,
+    ):
+        self.scenario_generator = scenario_generator
+        self.scenario_generation_strategy = scenario_generation_strategy
+        self.model_parameters_builder = model_parameters_builder
+        self.scenario_reducer = scenario_reducer
+        self.presolver = presolver
+        self.rho = rho
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.max_workers = max_workers
+        self.solve_options = solve_options or SolveOptions()
+        self.formatter = formatter
+
+    def solve(self, instance: Instance) -> Optional[Solution]:
+        scenarios = self.scenario_generation_strategy.generate_scenarios(
+            self.scenario_generator, instance
+        )
+        if self.scenario_reducer is not None:
+            scenarios = self.scenario_reducer.reduce(scenarios)
+        scenarios = list(scenarios)
+        if not scenarios:
+            raise ValueError("Progressive hedging needs at least one scenario")
+
+        model_parameters = self.model_parameters_builder.build(instance)
+        if self.presolver is not None:
+            model_parameters = self.presolver.presolve(model_parameters)
+
+        partitions = partition_scenarios(
+            scenarios, self.max_workers or os.cpu_count() or 1
+        )
+        if len(partitions) == 1:
+            worker = ScenarioHedgingWorker(
+                model_parameters, partitions[0], self.solve_options
+            )
+            solution = self._hedge(
+                model_parameters,
+                scenarios,
+                [_InlineWorker(worker)],
+                [list(partitions[0])],
+            )
+        else:
+            solution = self._hedge_in_processes(
+                model_parameters, scenarios, partitions
+            )
+
+        if solution is not None and self.formatter is not None:
+            print(self.formatter(solution))
+        return solution
+
+    def _hedge_in_processes(self, model_parameters, scenarios, partitions):
+        context = multiprocessing.get_context("spawn")
+        connections = []
+        processes = []
+        for partition in partitions:
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=run_hedging_worker,
+                args=(child, model_parameters, partition, self.solve_options),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            connections.append(parent)
+            processes.append(process)
+
+        try:
+            return self._hedge(
+                model_parameters,
+                scenarios,
+                [_ProcessWorker(connection) for connection in connections],
+                [list(partition) for partition in partitions],
+            )
+        finally:
+            for connection in connections:
+                # A worker that died has already closed its end of the pipe
+                try:
+                    connection.send(None)
+                except OSError:
+                    pass
+                connection.close()
+            for process in processes:
+                process.join()
+
+    def _hedge(
+        self, model_parameters, scenarios, workers: list, worker_scenarios
+    ) -> Optional[Solution]:
+        iteration_result = self._iterate(scenarios, workers, worker_scenarios)
+        if iteration_result is None:
+            return None
+
+        consensus, bound = iteration_result
+        first_stage = repair_first_stage(model_parameters, consensus)
+        solutions = self._solve_scenarios(
+            workers, [("fix", first_stage)] * len(workers)
+        )
+        solutions = [solutions[k] for k in range(len(scenarios))]
+        if any(solution is None for solution in solutions):
+            print("The repaired consensus is infeasible in a scenario.")
+            return None
+
+        return self._combine(scenarios, solutions, bound)
+
+    def _iterate(
+        self, scenarios, workers: list, worker_scenarios: List[List[int]]
+    ) -> Optional[tuple]:
+        """
+        The consensus of y and j after the last iteration, and the wait-and-see bound
+        """
+        weights = np.array([scenario.weight for scenario in scenarios], np.float64)
+        weights = weights / weights.sum()
+        penalties: Dict[int, Optional[np.ndarray]] = {
+            k: None for k in range(len(scenarios))
+        }
+        multipliers = None
+        consensus = None
+        bound = None
+
+        scenario_indices = range(len(scenarios))
+        for iteration in range(1, self.max_iterations + 1):
+            results = self._solve_scenarios(
+                workers,
+                [
+                    ("hedge", {k: penalties[k] for k in indices})
+                    for indices in worker_scenarios
+                ],
+            )
+            if not all(result.feasible for result in results.values()):
+                print("A scenario model does not have a feasible solution.")
+                return None
+
+            first_stage = np.array([results[k].first_stage for k in scenario_indices])
+            consensus = weights @ first_stage
+            if multipliers is None:
+                multipliers = np.zeros_like(first_stage)
+            multipliers += self.rho * (first_stage - consensus)
+
+            distance = np.abs(first_stage - consensus).sum(axis=1)
+            disagreement = float(weights @ distance)
+            expected_cost = float(
+                weights @ np.array([results[k].objective for k in scenario_indices])
+            )
+            if bound is None:
+                bound = expected_cost
+            print(
+                f"Progressive hedging iteration {iteration}: "
+                f"expected cost {expected_cost}, disagreement {disagreement}"
+            )
+            if disagreement <= self.tolerance * max(1, first_stage.shape[1]):
+                break
+
+            proximal = self.rho / 2 * (1 - 2 * consensus)
+            penalties = {k: multipliers[k] + proximal for k in scenario_indices}
+
+        return consensus, bound
+
+    @staticmethod
+    def _solve_scenarios(workers, messages) -> dict:
+        """
+        Sends every worker its message before collecting any result, so the workers
+        solve concurrently
+        """
+        for worker, message in zip(workers, messages):
+            worker.submit(message)
+
+        results = {}
+        for worker in workers:
+            results.update(worker.result())
+        return results
+
+    @staticmethod
+    def _combine(scenarios, solutions: List[Solution], bound: float) -> Solution:
+        """
+        Every scenario model plans the same first stage, so the first one supplies it
+        and each contributes its own scenario rows
+        """
+        scenario_cost = np.concatenate([s.scenario_cost for s in solutions])
+        weights = np.array([scenario.weight for scenario in scenarios], np.float64)
+        first = solutions[0]
+        first_stage_cost = first.objective - float(first.scenario_cost[0])
+
+        first.status = "feasible"
+        first.objective = first_stage_cost + float(weights @ scenario_cost)
+        first.bound = bound
+        first.scenario_names = [scenario.name for scenario in scenarios]
+        first.scenario_weights = weights
+        for name in (
+            "scenario_start",
+            "scenario_end",
+            "scenario_delay",
+            "scenario_advance",
+        ):
+            setattr(first, name, np.concatenate([getattr(s, name) for s in solutions]))
+        first.scenario_cost = scenario_cost
+        return first
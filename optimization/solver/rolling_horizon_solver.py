@@ -0,0 +1,251 @@
+"""
+Rolling-horizon decomposition: the tasks are solved in overlapping windows of target
+dates, committing the first part of every window before moving on
+"""
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from optimization.domain.instance import Instance
+from optimization.domain.task import Task
+from optimization.scenarios.scenario_generator import ScenarioGenerator
+from optimization.scenarios.task_delay_scenario_generator import (
+    TaskDelayScenarioGenerator,
+)
+from optimization.solver.solution import Solution
+from optimization.solver.solver import Solver
+from optimization.solver.stochastic_solver import StochasticSolver
+
+
+@dataclass
+class WindowReport:
+    first_day: int
+    last_day: int
+    number_of_tasks: int
+    committed_tasks: int
+    committed_cost: float
+    seconds: float
+
+
+@dataclass
+class RollingHorizonReport:
+    windows: List[WindowReport] = field(default_factory=list)
+    objective: float = 0.0
+    seconds: float = 0.0
+    full_objective: Optional[float] = None
+    full_seconds: Optional[float] = None
+
+    @property
+    def loss(self) -> Optional[float]:
+        if self.full_objective is None:
+            return None
+
+        return self.objective - self.full_objective
+
+    @property
+    def relative_loss(self) -> Optional[float]:
+        if self.full_objective is None:
+            return None
+
+        return self.loss / max(abs(self.full_objective), 1e-9)
+
+    def format(self) -> str:
+        lines = [
+            f"Window {k}: days {window.first_day}-{window.last_day}, "
+            f"{window.number_of_tasks} tasks, {window.committed_tasks} committed, "
+            f"cost {window.committed_cost:.3f} in {window.seconds:.3f}s"
+            for k, window in enumerate(self.windows)
+        ]
+        lines.append(
+            f"Rolling horizon objective {self.objective} in {self.seconds:.3f}s"
+        )
+        if self.full_objective is not None:
+            lines.append(
+                f"Full solve objective {self.full_objective} in "
+                f"{self.full_seconds:.3f}s, loss {self.loss} ({self.relative_loss:.2%})"
+            )
+        return "\n".join(lines)
+
+
+class RollingHorizonSolver(Solver):
+    """
+    Every window holds the uncommitted tasks whose target day lies in
+    [first_day, first_day + window_days). The window is solved as a stochastic model
+    with the wrapped solver's scenarios and backend; tasks whose target day falls
+    before first_day + window_days - overlap_days are then committed, and each
+    machine is released only after the latest end of its committed tasks over all
+    scenarios. The remaining overlap tasks are solved again in the next window.
+    The scenarios of a window are generated over its own tasks by
+    scenario_generator_factory.
+
+    The objective is the sum of the committed tasks' first-stage and expected
+    scenario costs in the window they were committed in. When the instance has at
+    most full_solve_task_limit tasks it is also solved whole, to report the loss.
+    """
+
+    def __init__(
+        self,
+        solver: StochasticSolver,
+        window_days: int = 14,
+        overlap_days: int = 7,
+        full_solve_task_limit: int = 0,
+        scenario_generator_factory: Callable[
+            [List[Task]], ScenarioGenerator
+        ] = TaskDelayScenarioGenerator,
+    ):
+        if window_days < 1:
+            raise ValueError("window_days must be at least 1")
+        if not 0 <= overlap_days < window_days:
+            raise ValueError("overlap_days must be between 0 and window_days - 1")
+        if solver.presolver is not None:
+            raise ValueError(
+                "Presolved start windows do not hold with machine release times"
+            )
+        symmetry_breaker = solver.symmetry_breaker
+        if symmetry_breaker is not None and symmetry_breaker.break_machines:
+            raise ValueError(
+                "Machine symmetry breaking does not hold with machine release times"
+            )
+
+        self.solver = solver
+        self.window_days = window_days
+        self.overlap_days = overlap_days
+        self.full_solve_task_limit = full_solve_task_limit
+        self.scenario_generator_factory = scenario_generator_factory
+        self.report = None
+
+    def solve(self, instance: Instance) -> Optional[Solution]:
+        start = time.perf_counter()
+        tasks = instance.tasks
+        number_of_tasks = len(tasks)
+        horizon_start = instance.planning_horizon[0]
+        target_day = np.array(
+            [(task.target_date - horizon_start).days for task in tasks], dtype=np.int64
+        )
+        delay_costs = np.array([task.late_penalty for task in tasks], np.float64)
+        advance_costs = np.array([task.early_penalty for task in tasks], np.float64)
+
+        machine_assignment = np.full(number_of_tasks, -1, dtype=np.int64)
+        start_time = np.zeros(number_of_tasks)
+        end_time = np.zeros(number_of_tasks)
+        delay = np.zeros(number_of_tasks)
+        advance = np.zeros(number_of_tasks)
+        task_order = []
+        release_times = {}
+        committed = np.zeros(number_of_tasks, dtype=bool)
+        report = RollingHorizonReport()
+
+        first_day = int(target_day.min()) if number_of_tasks else 0
+        while not committed.all():
+            window_start = time.perf_counter()
+            last_day = first_day + self.window_days
+            window = np.flatnonzero(~committed & (target_day < last_day))
+            final = not np.any(~committed & (target_day >= last_day))
+            commit_before = math.inf if final else last_day - self.overlap_days
+            if len(window) == 0:
+                first_day = int(target_day[~committed].min())
+                continue
+
+            window_instance = Instance(
+                tasks=[tasks[s] for s in window.tolist()],
+                machines=instance.machines,
+                capabilities=instance.capabilities,
+                planning_horizon=instance.planning_horizon,
+            )
+            base_model = self.build_window_model(window_instance, release_times)
+            solution = base_model.solve(self.solver.solve_options)
+            if solution is None:
+                print(f"Window starting on day {first_day} has no feasible solution.")
+                self.report = report
+                return None
+
+            local = np.flatnonzero(target_day[window] < commit_before)
+            tasks_committed = window[local]
+            committed[tasks_committed] = True
+            machine_assignment[tasks_committed] = solution.machine_assignment[local]
+            start_time[tasks_committed] = solution.start[local]
+            end_time[tasks_committed] = solution.end[local]
+            delay[tasks_committed] = solution.delay[local]
+            advance[tasks_committed] = solution.advance[local]
+
+            committed_local = set(local.tolist())
+            task_order.extend(
+                (int(window[s]), int(window[r]))
+                for s, r in solution.task_order.tolist()
+                if s in committed_local and r in committed_local
+            )
+
+            latest_end = solution.end
+            if len(solution.scenario_end):
+                latest_end = np.maximum(latest_end, solution.scenario_end.max(axis=0))
+            for s in local.tolist():
+                m = int(solution.machine_assignment[s])
+                release_times[m] = max(
+                    release_times.get(m, 0), int(math.ceil(latest_end[s]))
+                )
+
+            task_cost = self.task_costs(
+                solution, delay_costs[window], advance_costs[window]
+            )
+            report.windows.append(
+                WindowReport(
+                    first_day=first_day,
+                    last_day=last_day - 1,
+                    number_of_tasks=len(window),
+                    committed_tasks=len(local),
+                    committed_cost=float(task_cost[local].sum()),
+                    seconds=time.perf_counter() - window_start,
+                )
+            )
+            first_day = last_day - self.overlap_days
+
+        report.objective = sum(window.committed_cost for window in report.windows)
+        report.seconds = time.perf_counter() - start
+        if 0 < number_of_tasks <= self.full_solve_task_limit:
+            full_start = time.perf_counter()
+            full_solution = self.solver.build_model(
+                instance, self.scenario_generator_factory(instance.tasks)
+            ).solve(self.solver.solve_options)
+            report.full_seconds = time.perf_counter() - full_start
+            if full_solution is not None:
+                report.full_objective = full_solution.objective
+
+        self.report = report
+        print(report.format())
+        return Solution(
+            status="feasible",
+            objective=report.objective,
+            bound=-math.inf,
+            machine_assignment=machine_assignment,
+            task_order=np.array(task_order, dtype=np.int64).reshape(-1, 2),
+            start=start_time,
+            end=end_time,
+            delay=delay,
+            advance=advance,
+        )
+
+    def build_window_model(self, window_instance: Instance, release_times: dict):
+        base_model = self.solver.build_model(
+            window_instance, self.scenario_generator_factory(window_instance.tasks)
+        )
+        base_model.add_machine_release_constraints(release_times)
+        return base_model
+
+    @staticmethod
+    def task_costs(
+        solution: Solution, delay_costs: np.ndarray, advance_costs: np.ndarray
+    ) -> np.ndarray:
+        """
+        Each task's share of the window objective: its first-stage cost plus its
+        weighted cost in every scenario
+        """
+        cost = solution.delay * delay_costs + solution.advance * advance_costs
+        if len(solution.scenario_names):
+            cost = cost + solution.scenario_weights @ (
+                solution.scenario_delay * delay_costs
+                + solution.scenario_advance * advance_costs
+            )
+        return cost
@@ -0,0 +1,238 @@
+"""
+Structured, array-backed results of a solve
+"""
+import json
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import List, Union
+
+import numpy as np
+
+
+@dataclass
+class SolverOutput:
+    status: str
+    objective: float
+    bound: float
+    values: np.ndarray
+
+
+@dataclass
+class Solution:
+    status: str
+    objective: float
+    bound: float
+    machine_assignment: np.ndarray
+    task_order: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+    delay: np.ndarray
+    advance: np.ndarray
+    scenario_names: List[str] = field(default_factory=list)
+    scenario_weights: np.ndarray = field(default_factory=lambda: np.empty(0))
+    scenario_start: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+    scenario_end: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+    scenario_delay: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+    scenario_advance: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+    scenario_cost: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+    def to_dict(self) -> dict:
+        return {
+            name: value.tolist() if isinstance(value, np.ndarray) else value
+            for name, value in asdict(self).items()
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "Solution":
+        return Solution(
+            **{
+                item.name: data[item.name]
+                if item.name in ("status", "objective", "bound", "scenario_names")
+                else np.asarray(data[item.name])
+                for item in fields(Solution)
+            }
+        )
+
+    def to_json(self, path):
+        Path(path).write_text(json.dumps(self.to_dict()))
+
+    def to_parquet(self, directory):
+        """
+        Writes one table per task and one per (scenario, task)
+        """
+        import pandas as pd
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame(
+            {
+                "task": np.arange(len(self.start)),
+                "machine": self.machine_assignment,
+                "start": self.start,
+                "end": self.end,
+                "delay": self.delay,
+                "advance": self.advance,
+            }
+        ).to_parquet(directory / "tasks.parquet")
+
+        number_of_scenarios, number_of_tasks = self.scenario_start.shape
+        pd.DataFrame(
+            {
+                "scenario": np.repeat(self.scenario_names, number_of_tasks),
+                "weight": np.repeat(self.scenario_weights, number_of_tasks),
+                "task": np.tile(np.arange(number_of_tasks), number_of_scenarios),
+                "start": self.scenario_start.ravel(),
+                "end": self.scenario_end.ravel(),
+                "delay": self.scenario_delay.ravel(),
+                "advance": self.scenario_advance.ravel(),
+            }
+        ).to_parquet(directory / "scenarios.parquet")
+
+
+# The first index of a contiguous block of variables, or the indices of the block
+Block = Union[int, List[int]]
+
+
+def _contiguous(first_index: Block, count: int) -> np.ndarray:
+    if not isinstance(first_index, (int, np.integer)):
+        return np.asarray(first_index, dtype=np.int64)
+
+    return np.arange(first_index, first_index + count, dtype=np.int64)
+
+
+@dataclass
+class SolutionLayout:
+    """
+    Where each part of the solution sits in the solver's vector of variable values.
+    Every family of variables is created in one contiguous block, so only the
+    first index of each block is needed. A model that gained variables after it was
+    built is read with contiguous=False, and each block then holds the list of its
+    indices instead.
+    """
+
+    y_keys: np.ndarray
+    y_first: Block
+    j_keys: np.ndarray
+    j_first: Block
+    task_first: List[Block]
+    task_duration: np.ndarray
+    scenario_first: List[List[Block]] = field(default_factory=list)
+    scenario_names: List[str] = field(default_factory=list)
+    scenario_weights: List[float] = field(default_factory=list)
+    scenario_duration: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+    delay_costs: np.ndarray = field(default_factory=lambda: np.empty(0))
+    advance_costs: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+    @staticmethod
+    def first_index(variables: dict, index_of) -> int:
+        if not variables:
+            return 0
+
+        return index_of(next(iter(variables.values())))
+
+    @staticmethod
+    def indices(variables: dict, index_of) -> List[int]:
+        return [index_of(variable) for variable in variables.values()]
+
+    @staticmethod
+    def from_model(model, index_of, contiguous: bool = True) -> "SolutionLayout":
+        """
+        Reads the layout of a base model and its sub-models; index_of returns the
+        solver index of a variable
+        """
+        position = SolutionLayout.first_index if contiguous else SolutionLayout.indices
+        p = model.model_parameters
+        sub_models = list(model.sub_models.values())
+        return SolutionLayout(
+            y_keys=np.array(list(model.y), dtype=np.int64).reshape(-1, 2),
+            y_first=position(model.y, index_of),
+            j_keys=np.array(list(model.j), dtype=np.int64).reshape(-1, 2),
+            j_first=position(model.j, index_of),
+            task_first=[
+                position(variables, index_of)
+                for variables in (model.s_t, model.s_delay, model.s_advance)
+            ],
+            task_duration=np.array([p.task_duration[s] for s in p.S], np.float64),
+            scenario_first=[
+                [
+                    position(variables, index_of)
+                    for variables in (
+                        sub_model.s_t,
+                        sub_model.s_delay,
+                        sub_model.s_advance,
+                    )
+                ]
+                for sub_model in sub_models
+            ],
+            scenario_names=[sub_model.scenario.name for sub_model in sub_models],
+            scenario_weights=[float(sub_model.weight) for sub_model in sub_models],
+            scenario_duration=np.array(
+                [sub_model.task_duration for sub_model in sub_models], np.float64
+            ).reshape(len(sub_models), len(p.S)),
+            delay_costs=np.array([p.delay_costs[s] for s in p.S], np.float64),
+            advance_costs=np.array([p.advance_costs[s] for s in p.S], np.float64),
+        )
+
+    def build(self, output: SolverOutput) -> Solution:
+        values = output.values
+        number_of_tasks = len(self.task_duration)
+
+        y_values = values[_contiguous(self.y_first, len(self.y_keys))]
+        chosen = self.y_keys[y_values > 0.5]
+        machine_assignment = np.full(number_of_tasks, -1, dtype=np.int64)
+        machine_assignment[chosen[:, 1]] = chosen[:, 0]
+
+        j_values = values[_contiguous(self.j_first, len(self.j_keys))]
+        start, delay, advance = (
+            values[_contiguous(first, number_of_tasks)] for first in self.task_first
+        )
+
+        scenario_start, scenario_delay, scenario_advance = (
+            np.array(
+                [
+                    values[_contiguous(first[family], number_of_tasks)]
+                    for first in self.scenario_first
+                ],
+                dtype=np.float64,
+            ).reshape(len(self.scenario_first), number_of_tasks)
+            for family in range(3)
+        )
+
+        return Solution(
+            status=output.status,
+            objective=output.objective,
+            bound=output.bound,
+            machine_assignment=machine_assignment,
+            task_order=self.j_keys[j_values > 0.5],
+            start=start,
+            end=start + self.task_duration,
+            delay=delay,
+            advance=advance,
+            scenario_names=list(self.scenario_names),
+            scenario_weights=np.asarray(self.scenario_weights, dtype=np.float64),
+            scenario_start=scenario_start,
+            scenario_end=scenario_start + self.scenario_duration,
+            scenario_delay=scenario_delay,
+            scenario_advance=scenario_advance,
+            scenario_cost=scenario_delay @ self.delay_costs
+            + scenario_advance @ self.advance_costs,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            name: value.tolist() if isinstance(value, np.ndarray) else value
+            for name, value in asdict(self).items()
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "SolutionLayout":
+        layout = SolutionLayout(**data)
+        layout.y_keys = np.asarray(layout.y_keys, dtype=np.int64).reshape(-1, 2)
+        layout.j_keys = np.asarray(layout.j_keys, dtype=np.int64).reshape(-1, 2)
+        layout.task_duration = np.asarray(layout.task_duration, dtype=np.float64)
+        layout.scenario_duration = np.asarray(
+            layout.scenario_duration, dtype=np.float64
+        ).reshape(len(layout.scenario_first), len(layout.task_duration))
+        layout.delay_costs = np.asarray(layout.delay_costs, dtype=np.float64)
+        layout.advance_costs = np.asarray(layout.advance_costs, dtype=np.float64)
+        return layout
@@ -0,0 +1,35 @@
+from optimization.solver.solution import Solution
+
+
+def format_solution(solution: Solution) -> str:
+    lines = ["Solution:", f"Objective value = {solution.objective}"]
+    for s, m in enumerate(solution.machine_assignment):
+        lines.append(f"Task {s} is assigned to machine {m}")
+
+    for s, r in solution.task_order:
+        lines.append(f"Task {s} is executed before task {r}")
+
+    for s, start in enumerate(solution.start):
+        lines.append(f"Task {s} starts at {start}")
+
+    for s, end in enumerate(solution.end):
+        lines.append(f"Task {s} ends at {end}")
+
+    for s, delay in enumerate(solution.delay):
+        lines.append(f"Task {s} is delayed by {delay}")
+
+    for s, advance in enumerate(solution.advance):
+        lines.append(f"Task {s} is advanced by {advance}")
+
+    for k, name in enumerate(solution.scenario_names):
+        lines.append(f"\n\nSub model Sub Model {name}: ")
+        lines.append(
+            f"In scenario Sub Model {name} with weight {solution.scenario_weights[k]}"
+        )
+        for s in range(len(solution.start)):
+            lines.append(f"Task {s} ends at {solution.scenario_end[k, s]}")
+            lines.append(f"Task {s} is delayed by {solution.scenario_delay[k, s]}")
+            lines.append(f"Task {s} is advanced by {solution.scenario_advance[k, s]}")
+        lines.append(f"Sub objective Value: {solution.scenario_cost[k]}")
+
+    return "\n".join(lines)
@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class SolveOptions:
+    time_limit: Optional[float] = None
+    relative_gap: Optional[float] = None
+    num_threads: Optional[int] = None
+    solver_specific_parameters: str = ""
+
+
+@dataclass
+class Incumbent:
+    objective: float
+    bound: float
+    wall_time: float
@@ -0,0 +1,469 @@
+"""
+A local solve service: instances are submitted over HTTP on a TCP port or a Unix
+socket, queued, and solved by a fixed pool of long-lived worker processes
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs
+
+import pandas as pd
+
+from optimization.domain.instance import Instance
+from optimization.domain.instance_loader import (
+    MACHINE_COLUMNS,
+    TASK_COLUMNS,
+    InstanceLoader,
+)
+from optimization.solver.batch_runner import default_solver
+from optimization.solver.cache import instance_fingerprint, stable_hash
+from optimization.solver.solve_options import SolveOptions
+from optimization.solver.stochastic_solver import StochasticSolver
+
+ACTIVE_STATUSES = ("queued", "running")
+# An infeasible result may come from a time limit, so it is solved again
+REUSABLE_STATUSES = ("queued", "running", "solved")
+HTTP_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+@dataclass
+class SolveJob:
+    id: str
+    key: str
+    instance: Optional[Instance]
+    status: str = "queued"
+    submitted: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    incumbents: List[dict] = field(default_factory=list)
+    solution: Optional[dict] = None
+    error: Optional[str] = None
+    subscribers: Set[str] = field(default_factory=set)
+    cancel_requested: bool = False
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished,
+            "incumbents": self.incumbents,
+            "objective": self.solution["objective"] if self.solution else None,
+            "bound": self.solution["bound"] if self.solution else None,
+            "error": self.error,
+        }
+
+
+def run_solve_worker(
+    connection,
+    cancel_event,
+    solver_factory: Callable[[Instance, SolveOptions], StochasticSolver],
+    solve_options: SolveOptions,
+):
+    """
+    Solves one job at a time until it receives None. Every incumbent is sent back as
+    it is found, and the solve stops at the next incumbent once cancel_event is set.
+    """
+    while True:
+        job = connection.recv()
+        if job is None:
+            break
+
+        job_id, instance = job
+
+        def on_incumbent(incumbent) -> bool:
+            connection.send(("incumbent", job_id, asdict(incumbent)))
+            return cancel_event.is_set()
+
+        try:
+            solver = solver_factory(instance, solve_options)
+            solver.on_incumbent = on_incumbent
+            solution = solver.solve(instance)
+            if cancel_event.is_set():
+                status = "cancelled"
+            else:
+                status = "solved" if solution is not None else "infeasible"
+            connection.send(
+                (
+                    "finished",
+                    job_id,
+                    status,
+                    solution.to_dict() if solution is not None else None,
+                    None,
+                )
+            )
+        except Exception:
+            connection.send(
+                ("finished", job_id, "failed", None, traceback.format_exc())
+            )
+    connection.close()
+
+
+class _SolveWorker:
+    def __init__(self, context, solver_factory, solve_options: SolveOptions):
+        self.cancel_event = context.Event()
+        self.connection, child = context.Pipe()
+        self.process = context.Process(
+            target=run_solve_worker,
+            args=(child, self.cancel_event, solver_factory, solve_options),
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+        self.job: Optional[SolveJob] = None
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+class SolveService:
+    """
+    The worker processes are started once and keep ortools imported, so a request
+    only pays for its own solve. Each worker solves one job at a time and the event
+    loop only waits on their pipes, so a long solve never blocks the others.
+
+    Submissions of an instance that is queued, running or already solved are
+    coalesced into that job, keyed by the hash of its instance fingerprint. Every
+    submission gets its own token, and a job is cancelled once every token has
+    cancelled it: a queued job is dropped, and a running one stops at its next
+    incumbent, or is killed cancel_grace_seconds later and its worker replaced.
+    Incumbents are reported as the solver finds them; with SCIP these come from time
+    slices of doubling length.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        solve_options: Optional[SolveOptions] = None,
+        solver_factory: Callable[
+            [Instance, SolveOptions], StochasticSolver
+        ] = default_solver,
+        cancel_grace_seconds: float = 10.0,
+        max_finished_jobs: int = 1000,
+        max_body_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.solve_options = solve_options or SolveOptions()
+        self.solver_factory = solver_factory
+        self.cancel_grace_seconds = cancel_grace_seconds
+        self.max_finished_jobs = max_finished_jobs
+        self.max_body_bytes = max_body_bytes
+        self.jobs: Dict[str, SolveJob] = {}
+        self.jobs_by_key: Dict[str, str] = {}
+        self.context = multiprocessing.get_context("spawn")
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[_SolveWorker] = []
+        self.drivers = []
+        self.receivers = None
+        self.stopping = False
+
+    async def start(self):
+        self.queue = asyncio.Queue()
+        self.receivers = ThreadPoolExecutor(max_workers=self.max_workers)
+        for _ in range(self.max_workers):
+            worker = _SolveWorker(self.context, self.solver_factory, self.solve_options)
+            self.workers.append(worker)
+            self.drivers.append(asyncio.create_task(self._drive(worker)))
+
+    async def stop(self):
+        self.stopping = True
+        for _ in self.drivers:
+            self.queue.put_nowait(None)
+        for worker in self.workers:
+            if worker.job is not None:
+                worker.process.terminate()
+        await asyncio.gather(*self.drivers, return_exceptions=True)
+        for worker in self.workers:
+            worker.stop()
+        self.receivers.shutdown(wait=False)
+
+    def submit(self, instance: Instance) -> Tuple[SolveJob, bool, str]:
+        """
+        Returns the job, whether it was coalesced into an existing one, and the
+        token that cancels this submission
+        """
+        key = stable_hash(instance_fingerprint(instance))
+        token = uuid.uuid4().hex
+        job_id = self.jobs_by_key.get(key)
+        if job_id is not None:
+            job = self.jobs[job_id]
+            job.subscribers.add(token)
+            return job, True, token
+
+        job = SolveJob(id=uuid.uuid4().hex, key=key, instance=instance)
+        job.subscribers.add(token)
+        self.jobs[job.id] = job
+        self.jobs_by_key[key] = job.id
+        self.queue.put_nowait(job)
+        return job, False, token
+
+    def cancel(self, job_id: str, token: str) -> SolveJob:
+        """
+        Withdraws the submission of token; cancelling it again, or with a token of
+        another job, changes nothing
+        """
+        job = self.jobs[job_id]
+        if job.status not in ACTIVE_STATUSES or token not in job.subscribers:
+            return job
+
+        job.subscribers.discard(token)
+        if job.subscribers:
+            return job
+
+        job.cancel_requested = True
+        self.jobs_by_key.pop(job.key, None)
+        if job.status == "queued":
+            self._finish(job, "cancelled")
+            return job
+
+        for worker in self.workers:
+            if worker.job is job:
+                worker.cancel_event.set()
+                asyncio.get_running_loop().call_later(
+                    self.cancel_grace_seconds, self._kill_if_running, worker, job
+                )
+        return job
+
+    @staticmethod
+    def _kill_if_running(worker: _SolveWorker, job: SolveJob):
+        if worker.job is job:
+            worker.process.terminate()
+
+    async def _drive(self, worker: _SolveWorker):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            if job is None or self.stopping:
+                return
+            if job.status != "queued":
+                continue
+
+            job.status = "running"
+            job.started = time.time()
+            worker.job = job
+            worker.cancel_event.clear()
+            worker.connection.send((job.id, job.instance))
+            while True:
+                try:
+                    message = await loop.run_in_executor(
+                        self.receivers, worker.connection.recv
+                    )
+                except (EOFError, OSError):
+                    # The worker died, or was killed after a cancellation
+                    self._finish(
+                        job,
+                        "cancelled"
+                        if job.cancel_requested or self.stopping
+                        else "failed",
+                        error=f"Worker exited with code {worker.process.exitcode}",
+                    )
+                    if self.stopping:
+                        return
+                    worker = self._replace(worker)
+                    break
+
+                if message[0] == "incumbent":
+                    job.incumbents.append(message[2])
+                    continue
+
+                _, _, status, solution, error = message
+                if job.cancel_requested:
+                    status = "cancelled"
+                self._finish(job, status, solution, error)
+                break
+            worker.job = None
+
+    def _replace(self, worker: _SolveWorker) -> _SolveWorker:
+        worker.process.join()
+        worker.connection.close()
+        worker.job = None
+        replacement = _SolveWorker(
+            self.context, self.solver_factory, self.solve_options
+        )
+        self.workers[self.workers.index(worker)] = replacement
+        return replacement
+
+    def _finish(
+        self,
+        job: SolveJob,
+        status: str,
+        solution: Optional[dict] = None,
+        error: Optional[str] = None,
+    ):
+        job.status = status
+        job.finished = time.time()
+        job.solution = solution
+        job.error = error
+        job.instance = None
+        if status not in REUSABLE_STATUSES:
+            if self.jobs_by_key.get(job.key) == job.id:
+                del self.jobs_by_key[job.key]
+        self._evict()
+
+    def _evict(self):
+        finished = [
+            job for job in self.jobs.values() if job.status not in ACTIVE_STATUSES
+        ]
+        for job in finished[: max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job.id]
+            if self.jobs_by_key.get(job.key) == job.id:
+                del self.jobs_by_key[job.key]
+
+    @staticmethod
+    def parse_instance(payload: dict) -> Instance:
+        """
+        Reads {"planning_horizon": [start, end], "tasks": [...], "machines": [...]},
+        where tasks and machines are rows with the columns of the instance files
+        """
+        start, end = (
+            datetime.fromisoformat(date) for date in payload["planning_horizon"]
+        )
+        return InstanceLoader((start, end)).from_tables(
+            pd.DataFrame(payload["tasks"], columns=TASK_COLUMNS),
+            pd.DataFrame(payload["machines"], columns=MACHINE_COLUMNS),
+        )
+
+    async def route(self, method: str, path: str, body: bytes) -> Tuple[int, dict]:
+        parts = [part for part in path.split("?")[0].split("/") if part]
+        if parts == ["jobs"] and method == "GET":
+            return 200, {"jobs": [job.summary() for job in self.jobs.values()]}
+
+        if parts == ["jobs"] and method == "POST":
+            try:
+                payload = json.loads(body)
+                # Parsing a large instance should not hold up the event loop
+                instance = await asyncio.get_running_loop().run_in_executor(
+                    None, self.parse_instance, payload
+                )
+            except (ValueError, KeyError, TypeError) as error:
+                return 400, {"error": f"Invalid instance: {error}"}
+
+            job, coalesced, token = self.submit(instance)
+            return 202, {
+                "id": job.id,
+                "status": job.status,
+                "coalesced": coalesced,
+                "token": token,
+            }
+
+        if len(parts) not in (2, 3) or parts[0] != "jobs":
+            return 404, {"error": f"Unknown path {path}"}
+        job = self.jobs.get(parts[1])
+        if job is None:
+            return 404, {"error": f"Unknown job {parts[1]}"}
+
+        if len(parts) == 3:
+            if parts[2] != "solution":
+                return 404, {"error": f"Unknown path {path}"}
+            if method != "GET":
+                return 405, {"error": f"{method} is not allowed on {path}"}
+            if job.status in ACTIVE_STATUSES:
+                return 409, {"error": f"Job {job.id} is {job.status}"}
+            return 200, {"id": job.id, "status": job.status, "solution": job.solution}
+
+        if method == "GET":
+            return 200, job.summary()
+        if method == "DELETE":
+            token = parse_qs(path.partition("?")[2]).get("token")
+            if not token:
+                return 400, {"error": "Cancelling needs the token of the submission"}
+            return 200, self.cancel(job.id, token[0]).summary()
+        return 405, {"error": f"{method} is not allowed on {path}"}
+
+    async def handle_connection(self, reader, writer):
+        """
+        One HTTP/1.1 request per connection, with JSON bodies of at most
+        max_body_bytes
+        """
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            content_length = headers.get("content-length", "0")
+
+            if len(request_line) < 2:
+                status, payload = 400, {"error": "Malformed request line"}
+            elif not content_length.isdigit():
+                status, payload = 400, {
+                    "error": f"Invalid Content-Length {content_length}"
+                }
+            elif int(content_length) > self.max_body_bytes:
+                status, payload = 413, {
+                    "error": f"Bodies are limited to {self.max_body_bytes} bytes"
+                }
+            else:
+                body = await reader.readexactly(int(content_length))
+                try:
+                    status, payload = await self.route(
+                        request_line[0].upper(), request_line[1], body
+                    )
+                except Exception as error:
+                    traceback.print_exc()
+                    status, payload = 500, {"error": f"Internal error: {error!r}"}
+
+            data = json.dumps(payload).encode()
+            writer.write(
+                f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: close\r\n\r\n".encode("latin-1")
+                + data
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        socket_path: Optional[str] = None,
+    ):
+        await self.start()
+        try:
+            if socket_path is not None:
+                server = await asyncio.start_unix_server(
+                    self.handle_connection, path=socket_path
+                )
+                print(f"Solve service listening on {socket_path}")
+            else:
+                server = await asyncio.start_server(self.handle_connection, host, port)
+                print(f"Solve service listening on http://{host}:{port}")
+
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop()
@@ -1,30 +1,199 @@
+import math
+import time
+from dataclasses import asdict, replace
+from typing import Callable, Optional
+
+from ortools.linear_solver import pywraplp
+
 from optimization.domain.instance import Instance
+from optimization.model.backends import backend
 from optimization.model.base_model import BaseModel
 from optimization.model.model_expander import ModelExpander
+from optimization.scenarios.scenario_reducer import ScenarioReducer
+from optimization.solver.base_model_parameters import BaseModelParameters
+from optimization.solver.cache import describe
+from optimization.solver.instrumentation import NULL_INSTRUMENTATION, Instrumentation
 from optimization.solver.model_parameters import ModelParametersBuilder
+from optimization.solver.presolve import Presolver
+from optimization.solver.solution import Solution
+from optimization.solver.solve_options import Incumbent, SolveOptions
 from optimization.solver.solver import Solver
+from optimization.solver.symmetry import SymmetryBreaker
 
 
 class StochasticSolver(Solver):
+    # Share of the time limit the warm start may spend on the expected value model
+    WARM_START_TIME_SHARE = 0.1
+
     def __init__(
         self,
         scenario_generator,
         scenario_generation_strategy,
         model_parameters_builder: ModelParametersBuilder,
         model_expander: ModelExpander,
+        scenario_reducer: Optional[ScenarioReducer] = None,
+        presolver: Optional[Presolver] = None,
+        base_model_factory: Callable[[BaseModelParameters], BaseModel] = BaseModel,
+        warm_start: bool = False,
+        solve_options: Optional[SolveOptions] = None,
+        on_incumbent: Optional[Callable[[Incumbent], bool]] = None,
+        formatter: Optional[Callable[[Solution], str]] = None,
+        instrumentation: Instrumentation = NULL_INSTRUMENTATION,
+        symmetry_breaker: Optional[SymmetryBreaker] = None,
     ):
         self.scenario_generator = scenario_generator
         self.scenario_generation_strategy = scenario_generation_strategy
         self.model_parameters_builder = model_parameters_builder
         self.model_expander = model_expander
+        self.scenario_reducer = scenario_reducer
+        self.presolver = presolver
+        self.base_model_factory = base_model_factory
+        self.warm_start = warm_start
+        self.warm_start_time = None
+        self.solve_options = solve_options or SolveOptions()
+        self.on_incumbent = on_incumbent
+        self.formatter = formatter
+        self.instrumentation = instrumentation
+        self.symmetry_breaker = symmetry_breaker
 
-    def solve(self, instance: Instance):
-        scenarios = self.scenario_generation_strategy.generate_scenarios(
-            self.scenario_generator, instance
+    @classmethod
+    def with_backend(
+        cls,
+        backend_name: str,
+        scenario_generator,
+        scenario_generation_strategy,
+        model_parameters_builder: ModelParametersBuilder,
+        **kwargs,
+    ) -> "StochasticSolver":
+        base_model_factory, model_expander = backend(backend_name)
+        return cls(
+            scenario_generator,
+            scenario_generation_strategy,
+            model_parameters_builder,
+            model_expander,
+            base_model_factory=base_model_factory,
+            **kwargs,
         )
 
-        model_parameters = self.model_parameters_builder.build(instance)
-        base_model = BaseModel(model_parameters)
-        for scenario in scenarios:
-            self.model_expander.expand(base_model, scenario)
-        base_model.solve()
+    def solve(self, instance: Instance) -> Optional[Solution]:
+        base_model = self.build_model(instance)
+        solution = base_model.solve(self.solve_options, self.on_incumbent)
+        if solution is not None and self.formatter is not None:
+            print(self.formatter(solution))
+        return solution
+
+    def incumbents(self, instance: Instance):
+        base_model = self.build_model(instance)
+        yield from base_model.incumbents(self.solve_options)
+
+    def solver_options(self) -> dict:
+        return asdict(self.solve_options)
+
+    def model_settings(self) -> dict:
+        return {
+            "scenario_generator": describe(self.scenario_generator),
+            "scenario_generation_strategy": describe(
+                self.scenario_generation_strategy
+            ),
+            "model_parameters_builder": describe(
+                type(self.model_parameters_builder)
+            ),
+            "model_expander": describe(self.model_expander),
+            "scenario_reducer": describe(self.scenario_reducer),
+            "presolver": describe(self.presolver),
+            "symmetry_breaker": describe(self.symmetry_breaker),
+            "base_model_factory": describe(self.base_model_factory),
+            "warm_start": self.warm_start,
+        }
+
+    def build_model(
+        self, instance: Instance, scenario_generator=None, base_model_factory=None
+    ) -> BaseModel:
+        """
+        scenario_generator replaces the solver's own generator, for an instance with
+        other tasks than the one the solver was set up for, and base_model_factory
+        replaces the solver's own factory
+        """
+        base_model_factory = base_model_factory or self.base_model_factory
+        instrumentation = self.instrumentation
+        with instrumentation.phase("generate_scenarios"):
+            scenarios = self.scenario_generation_strategy.generate_scenarios(
+                scenario_generator or self.scenario_generator, instance
+            )
+            # Scenarios are streamed into the expansion unless they are measured
+            if instrumentation.enabled:
+                scenarios = list(scenarios)
+        if self.scenario_reducer is not None:
+            with instrumentation.phase("reduce_scenarios"):
+                scenarios = self.scenario_reducer.reduce(scenarios)
+
+        with instrumentation.phase("build_parameters"):
+            model_parameters = self.model_parameters_builder.build(instance)
+        if self.presolver is not None:
+            with instrumentation.phase("presolve"):
+                model_parameters = self.presolver.presolve(model_parameters)
+        first_stage_hint = None
+        if self.warm_start:
+            with instrumentation.phase("warm_start"):
+                first_stage_hint = self.solve_expected_value_model(model_parameters)
+
+        with instrumentation.phase("construct_base_model"):
+            # Only an instrumented build needs a factory that takes instrumentation
+            if instrumentation.enabled:
+                base_model = base_model_factory(
+                    model_parameters, instrumentation=instrumentation
+                )
+            else:
+                base_model = base_model_factory(model_parameters)
+        with instrumentation.phase("expand"):
+            for scenario in scenarios:
+                with instrumentation.size_change(base_model, scenario=scenario.name):
+                    self.model_expander.expand(base_model, scenario)
+        if self.symmetry_breaker is not None:
+            with instrumentation.phase("symmetry"):
+                self.symmetry_breaker.apply(base_model, instance)
+        if first_stage_hint is not None:
+            if self.symmetry_breaker is not None:
+                first_stage_hint = self.symmetry_breaker.canonical_hint(
+                    *first_stage_hint
+                )
+            base_model.set_first_stage_hint(*first_stage_hint)
+        return base_model
+
+    def solve_expected_value_model(self, model_parameters: BaseModelParameters):
+        """
+        Solves the deterministic model with expected task durations and returns its
+        assignment and ordering, to be used as a hint for the stochastic model
+        """
+        start = time.perf_counter()
+        expected_duration = {
+            s: math.ceil(
+                model_parameters.delay_probability[s]
+                * model_parameters.delayed_task_duration[s]
+                + (1 - model_parameters.delay_probability[s])
+                * model_parameters.task_duration[s]
+            )
+            for s in model_parameters.S
+        }
+        expected_value_model = BaseModel(
+            replace(model_parameters, task_duration=expected_duration)
+        )
+        time_limit = self.solve_options.time_limit
+        if time_limit is not None:
+            time_limit *= self.WARM_START_TIME_SHARE
+        status = expected_value_model.model.Solve(
+            BaseModel.configure(
+                expected_value_model.model, self.solve_options, time_limit
+            )
+        )
+        self.warm_start_time = time.perf_counter() - start
+
+        if status not in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+            print(
+                f"Warm start found no solution in {self.warm_start_time:.3f}s, "
+                f"solving without a hint"
+            )
+            return None
+
+        print(f"Warm start solved the expected value model in {self.warm_start_time:.3f}s")
+        return expected_value_model.first_stage_values()
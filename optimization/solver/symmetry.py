@@ -0,0 +1,156 @@
+"""
+Finds interchangeable machines and tasks of an instance and adds constraints that
+keep only one of their symmetric copies in the model
+"""
+import math
+from dataclasses import dataclass, field
+from typing import List
+
+from optimization.domain.instance import Instance
+
+
+@dataclass
+class SymmetryReport:
+    machine_classes: List[List[int]] = field(default_factory=list)
+    task_classes: List[List[int]] = field(default_factory=list)
+    machine_names: List[List[str]] = field(default_factory=list)
+    task_names: List[List[str]] = field(default_factory=list)
+
+    def __str__(self):
+        lines = [
+            f"Symmetry found {len(self.machine_classes)} classes of identical "
+            f"machines covering {sum(map(len, self.machine_classes))} machines, and "
+            f"{len(self.task_classes)} classes of identical tasks covering "
+            f"{sum(map(len, self.task_classes))} tasks"
+        ]
+        lines += [f"  machines: {', '.join(names)}" for names in self.machine_names]
+        lines += [f"  tasks: {', '.join(names)}" for names in self.task_names]
+        return "\n".join(lines)
+
+
+def equivalence_classes(keys: list) -> List[List[int]]:
+    """
+    The indices that share a key, for every key shared by at least two of them
+    """
+    classes = {}
+    for index, key in enumerate(keys):
+        classes.setdefault(key, []).append(index)
+    return [indices for indices in classes.values() if len(indices) > 1]
+
+
+class SymmetryBreaker:
+    """
+    Machines with the same capability set are interchangeable: the scenarios only
+    change task durations, so relabelling them maps every solution to one with the
+    same cost. Their assignments are ordered lexicographically, see
+    add_machine_symmetry_constraints of the base models. This assumes that machines
+    do not get different release times.
+
+    Tasks with the same durations, delay probability, penalties, capabilities and
+    target date are identical in the first stage, and with fix_task_order they run
+    in index order on a shared machine. This is opt-in because it only holds when the
+    scenarios treat those tasks alike, as the expected-value model and the
+    exhaustive strategy do; a sampled scenario that delays one but not the other
+    breaks the symmetry.
+    """
+
+    def __init__(
+        self,
+        break_machines: bool = True,
+        fix_task_order: bool = False,
+        verbose: bool = True,
+    ):
+        self.break_machines = break_machines
+        self.fix_task_order = fix_task_order
+        self.verbose = verbose
+        self.report = None
+
+    @staticmethod
+    def detect(instance: Instance) -> SymmetryReport:
+        machine_classes = equivalence_classes(
+            [frozenset(machine.capabilities) for machine in instance.machines]
+        )
+        task_classes = equivalence_classes(
+            [
+                (
+                    task.base_duration,
+                    task.delayed_duration,
+                    task.delay_probability,
+                    task.early_penalty,
+                    task.late_penalty,
+                    task.target_date,
+                    frozenset(task.required_capabilities),
+                )
+                for task in instance.tasks
+            ]
+        )
+        return SymmetryReport(
+            machine_classes=machine_classes,
+            task_classes=task_classes,
+            machine_names=[
+                [instance.machines[m].name for m in machines]
+                for machines in machine_classes
+            ],
+            task_names=[
+                [instance.tasks[s].name for s in tasks] for tasks in task_classes
+            ],
+        )
+
+    def apply(self, base_model, instance: Instance) -> SymmetryReport:
+        self.report = self.detect(instance)
+        if self.verbose:
+            print(self.report)
+
+        if self.break_machines and self.report.machine_classes:
+            base_model.add_machine_symmetry_constraints(self.report.machine_classes)
+        if self.fix_task_order and self.report.task_classes:
+            base_model.fix_identical_task_order(self.report.task_classes)
+        return self.report
+
+    def canonical_hint(self, y_values: dict, j_values: dict):
+        """
+        Relabels a first-stage hint, such as the warm start, into the order the
+        applied constraints keep. Identical tasks are relabelled so that they run in
+        index order on a shared machine, and never precede a lower index elsewhere.
+        The machines of a class are relabelled so that they take their first task
+        in index order. Relabelling identical tasks or machines keeps the cost.
+        """
+        machine_of = {s: m for (m, s), value in y_values.items() if value}
+
+        if self.fix_task_order:
+            rank = {s: 0 for s in machine_of}
+            for (r, s), value in j_values.items():
+                if value and r in machine_of and machine_of.get(s) == machine_of[r]:
+                    rank[s] += 1
+            task_label = {}
+            for tasks in self.report.task_classes:
+                slots = sorted(tasks, key=lambda s: (machine_of[s], rank[s]))
+                task_label.update(zip(slots, tasks))
+            y_values = {
+                (m, task_label.get(s, s)): value for (m, s), value in y_values.items()
+            }
+            j_values = {
+                (task_label.get(s, s), task_label.get(r, r)): value
+                for (s, r), value in j_values.items()
+            }
+            for tasks in self.report.task_classes:
+                for a, s in enumerate(tasks):
+                    for t in tasks[a + 1 :]:
+                        if (t, s) in j_values:
+                            j_values[t, s] = 0
+            machine_of = {s: m for (m, s), value in y_values.items() if value}
+
+        if self.break_machines:
+            machine_label = {}
+            for machines in self.report.machine_classes:
+                first_task = {m: math.inf for m in machines}
+                for s, m in machine_of.items():
+                    if m in first_task:
+                        first_task[m] = min(first_task[m], s)
+                slots = sorted(machines, key=lambda m: first_task[m])
+                machine_label.update(zip(slots, machines))
+            y_values = {
+                (machine_label.get(m, m), s): value
+                for (m, s), value in y_values.items()
+            }
+        return y_values, j_values
@@ -0,0 +1,33 @@
+import argparse
+import asyncio
+import os
+
+from optimization.solver.solve_options import SolveOptions
+from optimization.solver.solve_service import SolveService
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serve solves over HTTP on a local port or a Unix socket"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", default=None, help="Unix socket path")
+    parser.add_argument("--workers", type=int, default=None, help="Solver processes")
+    parser.add_argument("--threads", type=int, default=None, help="Total CPU threads")
+    parser.add_argument(
+        "--time-limit", type=float, default=None, help="Solver seconds per job"
+    )
+    arguments = parser.parse_args()
+
+    total_threads = arguments.threads or os.cpu_count() or 1
+    workers = max(1, min(arguments.workers or total_threads, total_threads))
+    service = SolveService(
+        max_workers=workers,
+        solve_options=SolveOptions(
+            time_limit=arguments.time_limit,
+            num_threads=max(1, total_threads // workers),
+        ),
+    )
+    asyncio.run(
+        service.serve(arguments.host, arguments.port, socket_path=arguments.socket)
+    )
@@ -0,0 +1,74 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from optimization.domain.instance_generator import InstanceGenerator
+from optimization.domain.instance_loader import InstanceLoader
+from optimization.model.changed_task_duration_submodel import (
+    ChangedTaskDurationSubModelExpander,
+)
+from optimization.scenarios.exhaustive_strategy import (
+    ExhaustiveScenarioGeneratorStrategy,
+)
+from optimization.scenarios.task_delay_scenario_generator import (
+    TaskDelayScenarioGenerator,
+)
+from optimization.solver.base_model_parameters import BaseModelParametersBuilder
+from optimization.solver.stochastic_solver import StochasticSolver
+
+INPUT_DIRECTORY = Path(__file__).resolve().parent.parent / "input"
+PLANNING_HORIZON = (datetime(2024, 1, 1), datetime(2024, 2, 15))
+
+
+@pytest.fixture
+def basic_instance():
+    return InstanceLoader(PLANNING_HORIZON).load(
+        INPUT_DIRECTORY / "basic_tasks.csv", INPUT_DIRECTORY / "basic_machines.csv"
+    )
+
+
+@pytest.fixture
+def generated_instance():
+    def generate(number_of_tasks=5, number_of_machines=2, seed=0, **kwargs):
+        return InstanceGenerator(
+            number_of_tasks,
+            number_of_machines,
+            horizon_days=20,
+            seed=seed,
+            **kwargs,
+        ).generate()
+
+    return generate
+
+
+@pytest.fixture
+def crowded_instance(generated_instance):
+    """
+    Generated instances whose tasks share one target date, so they compete for the
+    machines and every solve has a nonzero cost
+    """
+
+    def generate(number_of_tasks=4, number_of_machines=2, seed=0, **kwargs):
+        instance = generated_instance(
+            number_of_tasks, number_of_machines, seed=seed, **kwargs
+        )
+        for task in instance.tasks:
+            task.target_date = instance.tasks[0].target_date
+        return instance
+
+    return generate
+
+
+@pytest.fixture
+def exhaustive_solver():
+    def build(instance, **kwargs):
+        return StochasticSolver(
+            TaskDelayScenarioGenerator(instance.tasks),
+            ExhaustiveScenarioGeneratorStrategy(),
+            BaseModelParametersBuilder(),
+            ChangedTaskDurationSubModelExpander(),
+            **kwargs,
+        )
+
+    return build
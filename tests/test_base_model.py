@@ -0,0 +1,70 @@
+import pytest
+from ortools.linear_solver import pywraplp
+
+from optimization.model.base_model import BaseModel
+from optimization.model.changed_task_duration_submodel import (
+    ChangedTaskDurationSubModelExpander,
+)
+from optimization.scenarios.exhaustive_strategy import (
+    ExhaustiveScenarioGeneratorStrategy,
+)
+from optimization.scenarios.task_delay_scenario_generator import (
+    TaskDelayScenarioGenerator,
+)
+from optimization.solver.base_model_parameters import BaseModelParametersBuilder
+
+
+class LastSliceUnsolved(BaseModel):
+    """
+    Ends the incumbent search as a last time slice without a solution would
+    """
+
+    def incumbents(self, options=None, first_time_slice=1.0):
+        yield from super().incumbents(options, first_time_slice)
+        self.status = pywraplp.Solver.NOT_SOLVED
+
+
+def build(model_class, instance):
+    base_model = model_class(BaseModelParametersBuilder().build(instance))
+    expander = ChangedTaskDurationSubModelExpander()
+    scenario_generator = TaskDelayScenarioGenerator(instance.tasks)
+    for scenario in ExhaustiveScenarioGeneratorStrategy.generate_scenarios(
+        scenario_generator, instance
+    ):
+        expander.expand(base_model, scenario)
+    return base_model
+
+
+def test_incumbent_solve_keeps_the_best_incumbent(basic_instance):
+    expected = build(BaseModel, basic_instance).solve()
+    incumbents = []
+
+    solution = build(LastSliceUnsolved, basic_instance).solve(
+        on_incumbent=lambda incumbent: incumbents.append(incumbent) and False
+    )
+
+    assert incumbents
+    assert solution is not None
+    assert solution.objective == pytest.approx(expected.objective)
+
+
+def test_incumbents_improve_until_the_optimum(crowded_instance):
+    instance = crowded_instance(number_of_tasks=5)
+    expected = build(BaseModel, instance).solve()
+
+    incumbents = list(build(BaseModel, instance).incumbents(first_time_slice=0.01))
+
+    objectives = [incumbent.objective for incumbent in incumbents]
+    assert objectives == sorted(objectives, reverse=True)
+    assert objectives[-1] == pytest.approx(expected.objective)
+
+
+def test_on_incumbent_stops_the_search(crowded_instance):
+    incumbents = []
+
+    solution = build(BaseModel, crowded_instance(number_of_tasks=5)).solve(
+        on_incumbent=lambda incumbent: incumbents.append(incumbent) or True
+    )
+
+    assert len(incumbents) == 1
+    assert solution.objective == pytest.approx(incumbents[0].objective)
@@ -0,0 +1,54 @@
+from dataclasses import replace
+from itertools import combinations
+
+import pytest
+
+from optimization.model.base_model import BaseModel
+from optimization.model.changed_task_duration_submodel import (
+    ChangedTaskDurationSubModelExpander,
+)
+from optimization.scenarios.exhaustive_strategy import (
+    ExhaustiveScenarioGeneratorStrategy,
+)
+from optimization.scenarios.task_delay_scenario_generator import (
+    TaskDelayScenarioGenerator,
+)
+from optimization.solver.base_model_parameters import BaseModelParametersBuilder
+
+
+def with_every_task_pair(model_parameters):
+    task_pairs = {
+        (s, t): [
+            m
+            for m in model_parameters.M
+            if (m, s) in model_parameters.y and (m, t) in model_parameters.y
+        ]
+        for s, t in combinations(model_parameters.S, 2)
+    }
+    j = {(s, t) for s in model_parameters.S for t in model_parameters.S if s != t}
+    return replace(model_parameters, task_pairs=task_pairs, j=j)
+
+
+def solve(instance, model_parameters):
+    base_model = BaseModel(model_parameters)
+    expander = ChangedTaskDurationSubModelExpander()
+    for scenario in ExhaustiveScenarioGeneratorStrategy.generate_scenarios(
+        TaskDelayScenarioGenerator(instance.tasks), instance
+    ):
+        expander.expand(base_model, scenario)
+    return base_model.solve()
+
+
+def test_sparse_task_order_keeps_the_objective(crowded_instance):
+    instance = crowded_instance(
+        number_of_tasks=5, number_of_machines=3, capabilities_per_machine=1, seed=1
+    )
+    model_parameters = BaseModelParametersBuilder().build(instance)
+    full_parameters = with_every_task_pair(model_parameters)
+
+    expected = solve(instance, full_parameters)
+    solution = solve(instance, model_parameters)
+
+    assert len(model_parameters.j) < len(full_parameters.j)
+    assert expected.objective > 0
+    assert solution.objective == pytest.approx(expected.objective)
@@ -0,0 +1,80 @@
+import json
+import os
+import shutil
+import time
+
+from conftest import INPUT_DIRECTORY, PLANNING_HORIZON
+from optimization.solver.batch_runner import BatchRunner, discover_instances
+
+
+class ThreadReportingSolver:
+    def solve(self, instance):
+        raise RuntimeError(f"OMP_NUM_THREADS={os.environ.get('OMP_NUM_THREADS')}")
+
+
+class SleepingSolver:
+    def solve(self, instance):
+        time.sleep(60)
+
+
+def failing_solver(instance, solve_options):
+    return ThreadReportingSolver()
+
+
+def sleeping_solver(instance, solve_options):
+    return SleepingSolver()
+
+
+def instance_directory(tmp_path):
+    directory = tmp_path / "input"
+    directory.mkdir()
+    for table in ("tasks", "machines"):
+        shutil.copy(
+            INPUT_DIRECTORY / f"basic_{table}.csv", directory / f"basic_{table}.csv"
+        )
+    return directory
+
+
+def test_solves_and_records_each_instance(tmp_path):
+    output = tmp_path / "output"
+
+    (result,) = BatchRunner(PLANNING_HORIZON, output, max_jobs=1).run(
+        discover_instances(instance_directory(tmp_path))
+    )
+
+    solution = json.loads((output / "basic" / "solution.json").read_text())
+    assert result.status == "solved"
+    assert solution["objective"] == result.objective
+    assert json.loads((output / "results.jsonl").read_text())["status"] == "solved"
+
+
+def test_failed_job_reports_its_error_with_the_job_thread_limit(tmp_path):
+    output = tmp_path / "output"
+    environment = os.environ.get("OMP_NUM_THREADS")
+
+    (result,) = BatchRunner(
+        PLANNING_HORIZON,
+        output,
+        max_jobs=2,
+        total_threads=4,
+        solver_factory=failing_solver,
+    ).run(discover_instances(instance_directory(tmp_path)))
+
+    assert result.status == "failed"
+    assert "OMP_NUM_THREADS=2" in result.error
+    assert "OMP_NUM_THREADS=2" in (output / "basic" / "error.txt").read_text()
+    assert os.environ.get("OMP_NUM_THREADS") == environment
+
+
+def test_wall_clock_limit_kills_a_job_without_a_time_limit(tmp_path):
+    start = time.perf_counter()
+
+    (result,) = BatchRunner(
+        PLANNING_HORIZON,
+        tmp_path / "output",
+        wall_clock_limit=2,
+        solver_factory=sleeping_solver,
+    ).run(discover_instances(instance_directory(tmp_path)))
+
+    assert result.status == "timed_out"
+    assert time.perf_counter() - start < 30
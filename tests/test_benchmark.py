@@ -0,0 +1,52 @@
+import json
+
+from optimization.domain.instance_generator import InstanceGenerator
+from optimization.evaluation.benchmark import BenchmarkSuite
+from optimization.solver.cache import instance_fingerprint
+
+
+def test_generator_is_reproducible_per_seed():
+    def generate(seed):
+        return instance_fingerprint(InstanceGenerator(6, 2, seed=seed).generate())
+
+    assert generate(3) == generate(3)
+    assert generate(3) != generate(4)
+
+
+def test_records_times_and_memory_per_phase(tmp_path):
+    suite = BenchmarkSuite(
+        sizes=[(3, 2), (12, 2)], strategies=["exhaustive"], max_exhaustive_tasks=10
+    )
+
+    solved, skipped = suite.run(tmp_path / "results.jsonl")
+
+    assert skipped.skipped is not None
+    assert solved.number_of_scenarios == 2 ** 3
+    assert solved.objective is not None
+    phases = {phase.phase: phase for phase in solved.phases}
+    assert list(phases) == [
+        "build_parameters",
+        "generate_scenarios",
+        "construct_base_model",
+        "expand",
+        "solve",
+    ]
+    assert all(phase.seconds >= 0 for phase in solved.phases)
+    assert phases["expand"].peak_bytes > 0
+    assert phases["solve"].peak_bytes is None
+    records = [
+        json.loads(line) for line in (tmp_path / "results.jsonl").read_text().splitlines()
+    ]
+    assert [record["number_of_tasks"] for record in records] == [3, 12]
+
+
+def test_replan_records_the_planner_latency(tmp_path):
+    suite = BenchmarkSuite(
+        sizes=[(3, 2)], strategies=["exhaustive"], measure_memory=False, replan=True
+    )
+
+    (result,) = suite.run(tmp_path / "results.jsonl")
+
+    phases = [phase.phase for phase in result.phases]
+    assert phases[-3:] == ["solve", "plan", "replan"]
+    assert all(phase.seconds >= 0 for phase in result.phases)
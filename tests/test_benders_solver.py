@@ -0,0 +1,37 @@
+import pytest
+
+from optimization.scenarios.exhaustive_strategy import (
+    ExhaustiveScenarioGeneratorStrategy,
+)
+from optimization.scenarios.task_delay_scenario_generator import (
+    TaskDelayScenarioGenerator,
+)
+from optimization.solver.base_model_parameters import BaseModelParametersBuilder
+from optimization.solver.benders_solver import BendersStochasticSolver
+
+
+def benders_solver(instance, **kwargs):
+    return BendersStochasticSolver(
+        TaskDelayScenarioGenerator(instance.tasks),
+        ExhaustiveScenarioGeneratorStrategy(),
+        BaseModelParametersBuilder(),
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_matches_the_extensive_form(crowded_instance, exhaustive_solver, max_workers):
+    instance = crowded_instance(number_of_tasks=4)
+
+    expected = exhaustive_solver(instance).solve(instance)
+    solution = benders_solver(instance, max_workers=max_workers).solve(instance)
+
+    assert expected.objective > 0
+    assert solution is not None
+    assert solution.objective == pytest.approx(expected.objective, rel=1e-5)
+    assert solution.bound == pytest.approx(expected.objective, rel=1e-5)
+
+
+def test_rejects_zero_iterations(crowded_instance):
+    with pytest.raises(ValueError):
+        benders_solver(crowded_instance(), max_iterations=0)
@@ -0,0 +1,34 @@
+from optimization.scenarios.sampling_strategy import SamplingScenarioGeneratorStrategy
+from optimization.scenarios.task_delay_scenario_generator import (
+    TaskDelayScenarioGenerator,
+)
+from optimization.solver.cache import ModelCache
+from optimization.solver.cached_solver import CachedSolver
+
+
+def test_model_key_depends_on_the_scenario_tasks(
+    generated_instance, exhaustive_solver, tmp_path
+):
+    instance = generated_instance()
+    other_tasks = generated_instance(seed=1).tasks
+    cache = ModelCache(tmp_path)
+
+    solver = exhaustive_solver(instance)
+    other_solver = exhaustive_solver(instance)
+    other_solver.scenario_generator = TaskDelayScenarioGenerator(other_tasks)
+
+    model_key, _ = CachedSolver(solver, cache).keys(instance)
+    other_model_key, _ = CachedSolver(other_solver, cache).keys(instance)
+
+    assert model_key != other_model_key
+
+
+def test_unseeded_sampling_is_not_cached(generated_instance, exhaustive_solver, tmp_path):
+    instance = generated_instance()
+    solver = exhaustive_solver(instance)
+    solver.scenario_generation_strategy = SamplingScenarioGeneratorStrategy(4)
+
+    solution = CachedSolver(solver, ModelCache(tmp_path)).solve(instance)
+
+    assert solution is not None
+    assert not list(tmp_path.iterdir())
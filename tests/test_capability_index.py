@@ -0,0 +1,34 @@
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from optimization.domain.capability import Capability
+from optimization.domain.capability_index import CapabilityIndex
+
+
+@pytest.mark.parametrize("number_of_capabilities", [3, 70, 130])
+def test_compatibility_matches_issubset(number_of_capabilities):
+    rng = np.random.default_rng(number_of_capabilities)
+    capabilities = [
+        Capability(name=f"c{k}", id=uuid4()) for k in range(number_of_capabilities)
+    ]
+
+    def random_sets(count, size):
+        return [
+            {capabilities[k] for k in rng.choice(len(capabilities), size, False)}
+            for _ in range(count)
+        ]
+
+    machines = random_sets(7, min(number_of_capabilities, 60))
+    tasks = random_sets(11, 2) + [set()] + [machines[0]]
+    index = CapabilityIndex()
+
+    compatible = CapabilityIndex.compatibility_matrix(
+        index.masks(machines), index.masks(tasks), block_size=16
+    )
+
+    expected = [[task.issubset(machine) for task in tasks] for machine in machines]
+    assert compatible.tolist() == expected
+    assert compatible[:, len(tasks) - 2].all()
+    assert compatible[0, -1]
@@ -0,0 +1,48 @@
+import pytest
+
+from conftest import INPUT_DIRECTORY, PLANNING_HORIZON
+from optimization.domain.columnar_instance import ColumnarInstance
+from optimization.domain.instance_loader import InstanceLoader
+from optimization.solver.base_model_parameters import BaseModelParametersBuilder
+from optimization.solver.presolve import Presolver
+
+
+@pytest.mark.parametrize("presolver", [None, Presolver(verbose=False)])
+def test_columnar_instance_solves_like_the_instance(
+    generated_instance, exhaustive_solver, presolver
+):
+    instance = generated_instance(number_of_tasks=5, seed=3)
+    columnar = ColumnarInstance.from_instance(instance)
+
+    expected = exhaustive_solver(instance, presolver=presolver).solve(instance)
+    solution = exhaustive_solver(columnar, presolver=presolver).solve(columnar)
+
+    assert solution is not None
+    assert solution.objective == pytest.approx(expected.objective)
+
+
+def test_columnar_loading_builds_the_same_parameters():
+    tasks_path = INPUT_DIRECTORY / "basic_tasks.csv"
+    machines_path = INPUT_DIRECTORY / "basic_machines.csv"
+    loader = InstanceLoader(PLANNING_HORIZON)
+    builder = BaseModelParametersBuilder()
+
+    expected = builder.build(loader.load(tasks_path, machines_path))
+    columnar = loader.load_columnar(tasks_path, machines_path)
+    model_parameters = builder.build(columnar)
+
+    assert [task.name for task in columnar.tasks] == ["task_1", "task_2", "task_2"]
+    assert model_parameters.y == expected.y
+    assert model_parameters.j == expected.j
+    assert model_parameters.task_pairs == expected.task_pairs
+    for name in (
+        "delay_costs",
+        "advance_costs",
+        "target_execution_times",
+        "task_duration",
+        "delayed_task_duration",
+        "delay_probability",
+    ):
+        values = getattr(model_parameters, name)
+        expected_values = getattr(expected, name)
+        assert [values[s] for s in expected.S] == [expected_values[s] for s in expected.S]
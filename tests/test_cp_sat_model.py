@@ -0,0 +1,17 @@
+import pytest
+
+from optimization.model.backends import backend
+
+
+@pytest.mark.parametrize("penalties", [(1.0, 5.0), (0.0001, 0.0005)])
+def test_cp_sat_matches_scip(generated_instance, exhaustive_solver, penalties):
+    instance = generated_instance(number_of_tasks=4, seed=0, penalties=penalties)
+    base_model_factory, model_expander = backend("cp-sat")
+
+    expected = exhaustive_solver(instance).solve(instance)
+    solver = exhaustive_solver(instance, base_model_factory=base_model_factory)
+    solver.model_expander = model_expander
+    solution = solver.solve(instance)
+
+    assert expected.objective > 0
+    assert solution.objective == pytest.approx(expected.objective, rel=1e-3)
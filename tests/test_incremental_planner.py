@@ -0,0 +1,138 @@
+from dataclasses import replace
+
+import pytest
+
+from optimization.domain.instance import Instance
+from optimization.solver.incremental_planner import IncrementalPlanner
+
+
+def _with_tasks(instance, tasks):
+    return Instance(
+        tasks, instance.machines, instance.capabilities, instance.planning_horizon
+    )
+
+
+def _changed(instance, s, **changes):
+    tasks = [replace(task) for task in instance.tasks]
+    tasks[s] = replace(tasks[s], **changes)
+    return _with_tasks(instance, tasks)
+
+
+@pytest.fixture
+def planned(crowded_instance, exhaustive_solver):
+    instance = crowded_instance()
+    planner = IncrementalPlanner(exhaustive_solver(instance), instance)
+    assert planner.solve() is not None
+    return instance, planner
+
+
+def _cold_objective(exhaustive_solver, instance):
+    return exhaustive_solver(instance).solve(instance).objective
+
+
+def test_fix_start_matches_a_rebuild_with_fixed_bounds(planned, exhaustive_solver):
+    instance, planner = planned
+    start = int(planner.solution.start[1]) + 2
+
+    planner.fix_start(1, start)
+    solution = planner.solve()
+
+    base_model = exhaustive_solver(instance).build_model(instance)
+    for s_t in [base_model.s_t] + [
+        sub_model.s_t for sub_model in base_model.sub_models.values()
+    ]:
+        s_t[1].SetBounds(start, start)
+    expected = base_model.solve()
+    assert solution.start[1] == start
+    assert solution.objective == pytest.approx(expected.objective)
+
+
+def test_change_duration_matches_a_rebuild(planned, exhaustive_solver):
+    instance, planner = planned
+    duration = instance.tasks[0].delayed_duration + 2
+
+    planner.change_duration(0, duration)
+
+    rebuilt = _changed(instance, 0, base_duration=duration, delayed_duration=duration)
+    assert planner.solve().objective == pytest.approx(
+        _cold_objective(exhaustive_solver, rebuilt)
+    )
+
+
+def test_observe_duration_matches_a_rebuild(planned, exhaustive_solver):
+    instance, planner = planned
+    duration = instance.tasks[0].delayed_duration
+
+    planner.observe_duration(0, duration)
+
+    assert len(planner.base_model.sub_models) == 2 ** (len(instance.tasks) - 1)
+    rebuilt = _changed(instance, 0, base_duration=duration, delayed_duration=duration)
+    assert planner.solve().objective == pytest.approx(
+        _cold_objective(exhaustive_solver, rebuilt)
+    )
+
+
+def test_drop_scenarios_matches_a_rebuild(planned, exhaustive_solver):
+    instance, planner = planned
+    delayed = instance.tasks[0].delayed_duration
+    dropped = [
+        sub_model.scenario.name
+        for sub_model in planner.base_model.sub_models.values()
+        if sub_model.task_duration[0] == delayed
+    ]
+
+    planner.drop_scenarios(dropped)
+
+    # Without delay the dropped scenarios have no weight, the others their marginal
+    rebuilt = _changed(instance, 0, delay_probability=0.0)
+    assert planner.solve().objective == pytest.approx(
+        _cold_objective(exhaustive_solver, rebuilt)
+    )
+
+
+def test_drop_scenarios_keeps_one_scenario(planned):
+    _, planner = planned
+
+    with pytest.raises(ValueError):
+        planner.drop_scenarios(
+            sub_model.scenario.name
+            for sub_model in planner.base_model.sub_models.values()
+        )
+
+
+def test_remove_task_matches_a_rebuild(planned, exhaustive_solver):
+    instance, planner = planned
+
+    planner.remove_task(1)
+    solution = planner.solve()
+
+    rebuilt = _with_tasks(instance, instance.tasks[:1] + instance.tasks[2:])
+    assert solution.machine_assignment[1] == -1
+    assert solution.objective == pytest.approx(
+        _cold_objective(exhaustive_solver, rebuilt)
+    )
+
+
+def test_add_task_matches_a_rebuild(planned, exhaustive_solver):
+    instance, planner = planned
+    # The scenarios have not sampled the new task, so it is never delayed
+    task = replace(instance.tasks[1], name="added", delay_probability=0.0)
+
+    s = planner.add_task(task)
+    solution = planner.solve()
+
+    rebuilt = _with_tasks(instance, instance.tasks + [task])
+    assert s == len(instance.tasks)
+    assert len(solution.start) == len(instance.tasks) + 1
+    assert solution.objective == pytest.approx(
+        _cold_objective(exhaustive_solver, rebuilt)
+    )
+
+
+def test_constraint_handles_are_only_kept_for_the_planner(
+    planned, crowded_instance, exhaustive_solver
+):
+    instance, planner = planned
+
+    assert planner.base_model.constraints
+    assert not exhaustive_solver(instance).build_model(instance).constraints
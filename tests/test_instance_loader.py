@@ -0,0 +1,99 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from conftest import INPUT_DIRECTORY, PLANNING_HORIZON
+from optimization.domain.instance_loader import InstanceLoader
+
+
+def load_with_iterrows(tasks_path, machines_path):
+    """
+    The row-by-row parsing the loader replaced, returning plain tuples with
+    capability names in place of Capability objects
+    """
+    tasks_df = pd.read_csv(tasks_path)
+    machines_df = pd.read_csv(machines_path)
+
+    tasks = [
+        (
+            task["name"],
+            task["delay_probability"],
+            task["base_duration"],
+            task["delayed_duration"],
+            datetime.strptime(task["target_date"], "%Y-%m-%d"),
+            task["early_penalty"],
+            task["late_penalty"],
+            frozenset(task["required_capabilities"].split(",")),
+        )
+        for _, task in tasks_df.iterrows()
+    ]
+    machines = [
+        (machine["name"], frozenset(machine["capabilities"].split(",")))
+        for _, machine in machines_df.iterrows()
+    ]
+    return tasks, machines
+
+
+def as_tuples(instance):
+    tasks = [
+        (
+            task.name,
+            task.delay_probability,
+            task.base_duration,
+            task.delayed_duration,
+            task.target_date,
+            task.early_penalty,
+            task.late_penalty,
+            frozenset(capability.name for capability in task.required_capabilities),
+        )
+        for task in instance.tasks
+    ]
+    machines = [
+        (
+            machine.name,
+            frozenset(capability.name for capability in machine.capabilities),
+        )
+        for machine in instance.machines
+    ]
+    return tasks, machines
+
+
+@pytest.fixture
+def multi_capability_files(tmp_path):
+    tasks_path = tmp_path / "tasks.csv"
+    machines_path = tmp_path / "machines.csv"
+    tasks_path.write_text(
+        "name,delay_probability,base_duration,delayed_duration,target_date,"
+        "early_penalty,late_penalty,required_capabilities\n"
+        'a,0.25,2,5,2024-01-04,1.5,2,"Weld,Paint"\n'
+        "b,0.5,1,3,2024-01-02,1,4,Paint\n"
+        'c,0.1,3,4,2024-01-10,2,2.5,"Weld,Paint"\n'
+    )
+    machines_path.write_text(
+        'name,capabilities\nm1,"Paint,Weld"\nm2,Paint\nm3,"Cut,Weld,Paint"\n'
+    )
+    return tasks_path, machines_path
+
+
+def test_basic_files_load_like_iterrows():
+    tasks_path = INPUT_DIRECTORY / "basic_tasks.csv"
+    machines_path = INPUT_DIRECTORY / "basic_machines.csv"
+
+    instance = InstanceLoader(PLANNING_HORIZON).load(tasks_path, machines_path)
+
+    assert as_tuples(instance) == load_with_iterrows(tasks_path, machines_path)
+
+
+def test_shared_capability_lists_load_like_iterrows(multi_capability_files):
+    instance = InstanceLoader(PLANNING_HORIZON).load(*multi_capability_files)
+
+    assert as_tuples(instance) == load_with_iterrows(*multi_capability_files)
+    assert sorted(capability.name for capability in instance.capabilities) == [
+        "Cut",
+        "Paint",
+        "Weld",
+    ]
+    assert instance.tasks[0].required_capabilities is (
+        instance.tasks[2].required_capabilities
+    )
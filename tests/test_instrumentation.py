@@ -0,0 +1,78 @@
+import pytest
+
+from optimization.solver.instrumentation import (
+    Instrumentation,
+    MetricsSink,
+    PrometheusSink,
+)
+
+
+class ListSink(MetricsSink):
+    def __init__(self):
+        self.metrics = []
+
+    def emit(self, metric):
+        self.metrics.append(metric)
+
+
+def test_instrumented_solve_reports_every_phase(crowded_instance, exhaustive_solver):
+    instance = crowded_instance()
+    sink = ListSink()
+
+    expected = exhaustive_solver(instance).solve(instance)
+    solution = exhaustive_solver(
+        instance, instrumentation=Instrumentation(sink)
+    ).solve(instance)
+
+    assert solution.objective == pytest.approx(expected.objective)
+    seconds = {
+        metric.labels["phase"]
+        for metric in sink.metrics
+        if metric.name == "phase_seconds"
+    }
+    assert {
+        "generate_scenarios",
+        "build_parameters",
+        "construct_base_model",
+        "expand",
+        "constraints",
+        "solve",
+    } <= seconds
+    peaks = [metric for metric in sink.metrics if metric.name == "phase_peak_bytes"]
+    assert len(peaks) == sum(metric.name == "phase_seconds" for metric in sink.metrics)
+    assert all(metric.value >= 0 for metric in peaks)
+    values = {metric.name: metric.value for metric in sink.metrics}
+    assert values["solver_objective"] == pytest.approx(expected.objective)
+    assert values["variables"] > 0 and values["constraints"] > 0
+
+
+def test_nested_phases_include_the_inner_peak():
+    sink = ListSink()
+    instrumentation = Instrumentation(sink)
+
+    with instrumentation.phase("outer"):
+        with instrumentation.phase("inner"):
+            data = bytearray(1_000_000)
+        del data
+
+    peaks = {
+        metric.labels["phase"]: metric.value
+        for metric in sink.metrics
+        if metric.name == "phase_peak_bytes"
+    }
+    assert peaks["inner"] >= 1_000_000
+    assert peaks["outer"] >= peaks["inner"]
+
+
+def test_prometheus_sink_keeps_the_last_value(tmp_path):
+    sink = PrometheusSink(tmp_path / "metrics.prom")
+    instrumentation = Instrumentation(sink, trace_memory=False)
+
+    instrumentation.gauge("phase_seconds", 1, phase="solve")
+    instrumentation.gauge("phase_seconds", 2, phase="solve")
+    instrumentation.close()
+
+    assert (tmp_path / "metrics.prom").read_text() == (
+        "# TYPE stochastic_opti_phase_seconds gauge\n"
+        'stochastic_opti_phase_seconds{phase="solve"} 2.0\n'
+    )
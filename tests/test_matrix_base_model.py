@@ -0,0 +1,31 @@
+import pytest
+
+from optimization.model.backends import backend
+from optimization.solver.presolve import Presolver
+
+
+@pytest.mark.parametrize("presolver", [None, Presolver(verbose=False)])
+def test_builds_the_same_model_as_base_model(
+    crowded_instance, exhaustive_solver, presolver
+):
+    instance = crowded_instance(number_of_tasks=4)
+    base_model_factory, model_expander = backend("scip-matrix")
+    solver = exhaustive_solver(
+        instance, presolver=presolver, base_model_factory=base_model_factory
+    )
+    solver.model_expander = model_expander
+
+    expected_model = exhaustive_solver(instance, presolver=presolver).build_model(
+        instance
+    )
+    matrix_model = solver.build_model(instance)
+    matrix_model.load()
+
+    assert len(matrix_model.sub_models) == 2 ** 4
+    assert matrix_model.model.NumVariables() == expected_model.model.NumVariables()
+    assert (
+        matrix_model.model.NumConstraints() == expected_model.model.NumConstraints()
+    )
+    expected = expected_model.solve()
+    assert expected.objective > 0
+    assert matrix_model.solve().objective == pytest.approx(expected.objective)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from optimization.scenarios.exhaustive_strategy import (
+    ExhaustiveScenarioGeneratorStrategy,
+)
+from optimization.scenarios.most_probable_strategy import (
+    MostProbableScenarioGeneratorStrategy,
+)
+from optimization.scenarios.task_delay_scenario_generator import (
+    TaskDelayScenarioGenerator,
+)
+
+
+def _durations_and_weights(scenarios):
+    return sorted(
+        ((tuple(s.task_duration.tolist()), s.weight) for s in scenarios),
+        key=lambda item: (-item[1], item[0]),
+    )
+
+
+@pytest.mark.parametrize("number_of_scenarios", [1, 5, 12])
+def test_scenarios_are_the_top_k_of_the_exhaustive_strategy(
+    generated_instance, number_of_scenarios
+):
+    instance = generated_instance()
+    generator = TaskDelayScenarioGenerator(instance.tasks, batch_size=3)
+    strategy = MostProbableScenarioGeneratorStrategy(
+        number_of_scenarios, renormalize=False
+    )
+
+    scenarios = list(strategy.generate_scenarios(generator, instance))
+    exhaustive = _durations_and_weights(
+        ExhaustiveScenarioGeneratorStrategy.generate_scenarios(generator, instance)
+    )
+    expected = exhaustive[:number_of_scenarios]
+
+    actual = _durations_and_weights(scenarios)
+    assert [durations for durations, _ in actual] == [
+        durations for durations, _ in expected
+    ]
+    assert [weight for _, weight in actual] == pytest.approx(
+        [weight for _, weight in expected]
+    )
+    covered = sum(weight for _, weight in expected)
+    assert strategy.covered_probability == pytest.approx(covered)
+    assert strategy.uncovered_probability == pytest.approx(1 - covered)
+
+
+def test_probability_mass_stops_enumeration_and_renormalizes(generated_instance):
+    instance = generated_instance()
+    generator = TaskDelayScenarioGenerator(instance.tasks)
+    strategy = MostProbableScenarioGeneratorStrategy(2 ** 10, probability_mass=0.5)
+
+    scenarios = list(strategy.generate_scenarios(generator, instance))
+    exhaustive = _durations_and_weights(
+        ExhaustiveScenarioGeneratorStrategy.generate_scenarios(generator, instance)
+    )
+    cumulative = np.cumsum([weight for _, weight in exhaustive])
+    expected_count = int(np.searchsorted(cumulative, 0.5)) + 1
+
+    assert len(scenarios) == expected_count
+    assert strategy.covered_probability == pytest.approx(
+        cumulative[expected_count - 1]
+    )
+    assert sum(s.weight for s in scenarios) == pytest.approx(1.0)
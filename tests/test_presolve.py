@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+import pytest
+
+from optimization.solver.base_model_parameters import BaseModelParametersBuilder
+from optimization.solver.presolve import Presolver
+
+
+def short_task_instance(generated_instance, seed):
+    """
+    Short tasks around the middle of the horizon, so presolve can tighten their
+    start windows
+    """
+    instance = generated_instance(
+        number_of_tasks=4, seed=seed, base_duration=(1, 1), delay_factor=(1.5, 2.0)
+    )
+    for task in instance.tasks:
+        task.target_date = instance.planning_horizon[0] + timedelta(days=10)
+    return instance
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_presolve_keeps_the_optimum(generated_instance, exhaustive_solver, seed):
+    instance = short_task_instance(generated_instance, seed)
+    presolver = Presolver(verbose=False)
+
+    expected = exhaustive_solver(instance).solve(instance)
+    solution = exhaustive_solver(instance, presolver=presolver).solve(instance)
+
+    assert presolver.report.tightened_windows > 0
+    assert expected.objective > 0
+    assert solution.objective == pytest.approx(expected.objective)
+
+
+def test_windows_stay_within_the_horizon(generated_instance):
+    model_parameters = BaseModelParametersBuilder().build(
+        short_task_instance(generated_instance, seed=0)
+    )
+
+    presolved = Presolver(verbose=False).presolve(model_parameters)
+
+    for s in model_parameters.S:
+        assert 0 <= presolved.earliest_start[s] <= presolved.latest_start[s]
+        assert presolved.latest_start[s] <= model_parameters.end_date
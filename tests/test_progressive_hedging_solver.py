@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from optimization.model.scenario_hedging_model import repair_first_stage
+from optimization.scenarios.exhaustive_strategy import (
+    ExhaustiveScenarioGeneratorStrategy,
+)
+from optimization.scenarios.task_delay_scenario_generator import (
+    TaskDelayScenarioGenerator,
+)
+from optimization.solver.base_model_parameters import BaseModelParametersBuilder
+from optimization.solver.progressive_hedging_solver import ProgressiveHedgingSolver
+
+
+def hedging_solver(instance, **kwargs):
+    return ProgressiveHedgingSolver(
+        TaskDelayScenarioGenerator(instance.tasks),
+        ExhaustiveScenarioGeneratorStrategy(),
+        BaseModelParametersBuilder(),
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_matches_the_extensive_form(crowded_instance, exhaustive_solver, max_workers):
+    instance = crowded_instance(number_of_tasks=4)
+
+    expected = exhaustive_solver(instance).solve(instance)
+    solution = hedging_solver(instance, max_workers=max_workers).solve(instance)
+
+    assert solution is not None
+    assert solution.objective == pytest.approx(expected.objective, rel=1e-6)
+    assert solution.bound <= expected.objective + 1e-6
+    assert len(solution.scenario_names) == 2 ** 4
+    assert solution.scenario_start.shape == (2 ** 4, 4)
+    assert (solution.machine_assignment >= 0).all()
+
+
+def test_repair_assigns_each_task_one_machine(generated_instance):
+    model_parameters = BaseModelParametersBuilder().build(
+        generated_instance(number_of_tasks=4, capabilities_per_machine=3)
+    )
+    y_keys = sorted(model_parameters.y)
+    j_keys = sorted(model_parameters.j)
+    # Every task is split evenly between the machines and every order is a coin flip
+    consensus = np.full(len(y_keys) + len(j_keys), 0.5)
+
+    first_stage = repair_first_stage(model_parameters, consensus)
+
+    y = dict(zip(y_keys, first_stage[: len(y_keys)]))
+    j = dict(zip(j_keys, first_stage[len(y_keys) :]))
+    for s in model_parameters.S:
+        assert sum(y.get((m, s), 0) for m in model_parameters.M) == 1
+    for s, r in j_keys:
+        shared = any(y.get((m, s)) and y.get((m, r)) for m in model_parameters.M)
+        assert j[s, r] + j.get((r, s), 0) == (1 if shared else 0)
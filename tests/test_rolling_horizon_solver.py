@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+import pytest
+
+from optimization.domain.instance import Instance
+from optimization.solver.presolve import Presolver
+from optimization.solver.rolling_horizon_solver import RollingHorizonSolver
+
+
+def test_window_scenarios_use_the_window_tasks(generated_instance, exhaustive_solver):
+    instance = generated_instance(number_of_tasks=6)
+    solver = RollingHorizonSolver(
+        exhaustive_solver(instance), window_days=5, overlap_days=2
+    )
+    window_tasks = [instance.tasks[s] for s in (4, 1, 5)]
+    window_instance = Instance(
+        tasks=window_tasks,
+        machines=instance.machines,
+        capabilities=instance.capabilities,
+        planning_horizon=instance.planning_horizon,
+    )
+
+    base_model = solver.build_window_model(window_instance, {})
+
+    assert len(base_model.sub_models) == 2 ** len(window_tasks)
+    for sub_model in base_model.sub_models.values():
+        assert len(sub_model.task_duration) == len(window_tasks)
+        for task, duration in zip(window_tasks, sub_model.task_duration.tolist()):
+            assert duration in (task.base_duration, task.delayed_duration)
+
+
+def test_solves_every_task_once(generated_instance, exhaustive_solver):
+    instance = generated_instance(number_of_tasks=6)
+    for k, task in enumerate(instance.tasks):
+        task.target_date = instance.planning_horizon[0] + timedelta(days=2 * k)
+
+    solution = RollingHorizonSolver(
+        exhaustive_solver(instance), window_days=4, overlap_days=2
+    ).solve(instance)
+
+    assert solution is not None
+    assert (solution.machine_assignment >= 0).all()
+
+
+def test_rejects_a_presolver(generated_instance, exhaustive_solver):
+    instance = generated_instance()
+
+    with pytest.raises(ValueError):
+        RollingHorizonSolver(exhaustive_solver(instance, presolver=Presolver()))
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from optimization.scenarios.sampling_strategy import SamplingScenarioGeneratorStrategy
+from optimization.scenarios.task_delay_scenario_generator import (
+    TaskDelayScenarioGenerator,
+)
+
+
+def sample(instance, **kwargs):
+    strategy = SamplingScenarioGeneratorStrategy(**kwargs)
+    generator = TaskDelayScenarioGenerator(instance.tasks, batch_size=3)
+    return list(strategy.generate_scenarios(generator, instance))
+
+
+def test_rejects_more_scenarios_than_the_budget():
+    with pytest.raises(ValueError):
+        SamplingScenarioGeneratorStrategy(11, scenario_budget=10)
+    with pytest.raises(ValueError):
+        SamplingScenarioGeneratorStrategy(0)
+
+
+def test_same_seed_samples_the_same_scenarios(generated_instance):
+    instance = generated_instance()
+
+    scenarios = sample(instance, number_of_scenarios=8, seed=4)
+    repeated = sample(instance, number_of_scenarios=8, seed=4)
+
+    assert len(scenarios) == 8
+    assert [s.name for s in scenarios] == [s.name for s in repeated]
+    for scenario, other in zip(scenarios, repeated):
+        assert np.array_equal(scenario.task_duration, other.task_duration)
+    assert sum(s.weight for s in scenarios) == pytest.approx(1.0)
+
+
+def test_durations_are_base_or_delayed(generated_instance):
+    instance = generated_instance()
+
+    for scenario in sample(instance, number_of_scenarios=8, seed=1):
+        for task, duration in zip(instance.tasks, scenario.task_duration.tolist()):
+            assert duration in (task.base_duration, task.delayed_duration)
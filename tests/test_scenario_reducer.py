@@ -0,0 +1,55 @@
+import pytest
+
+from optimization.scenarios.exhaustive_strategy import (
+    ExhaustiveScenarioGeneratorStrategy,
+)
+from optimization.scenarios.scenario_reducer import ScenarioReducer
+from optimization.scenarios.task_delay_scenario_generator import (
+    TaskDelayScenarioGenerator,
+)
+
+
+def instance_with_duplicate_scenarios(generated_instance):
+    instance = generated_instance(number_of_tasks=4, seed=1)
+    for task in instance.tasks:
+        task.target_date = instance.tasks[0].target_date
+    for task in instance.tasks[:2]:
+        task.delayed_duration = task.base_duration
+    return instance
+
+
+def exhaustive_scenarios(instance):
+    return list(
+        ExhaustiveScenarioGeneratorStrategy.generate_scenarios(
+            TaskDelayScenarioGenerator(instance.tasks), instance
+        )
+    )
+
+
+@pytest.mark.parametrize("merge_dominated", [False, True])
+def test_reduced_weights_keep_the_probability_mass(generated_instance, merge_dominated):
+    instance = instance_with_duplicate_scenarios(generated_instance)
+    scenarios = exhaustive_scenarios(instance)
+
+    reduced = ScenarioReducer(merge_dominated).reduce(scenarios)
+
+    assert len(reduced) < len(scenarios)
+    assert sum(s.weight for s in reduced) == pytest.approx(
+        sum(s.weight for s in scenarios)
+    )
+
+
+def test_merging_duplicates_keeps_the_objective(generated_instance, exhaustive_solver):
+    instance = instance_with_duplicate_scenarios(generated_instance)
+
+    expected_model = exhaustive_solver(instance).build_model(instance)
+    reduced_model = exhaustive_solver(
+        instance, scenario_reducer=ScenarioReducer()
+    ).build_model(instance)
+    expected = expected_model.solve()
+    solution = reduced_model.solve()
+
+    assert len(reduced_model.sub_models) == 2 ** 2
+    assert len(expected_model.sub_models) == 2 ** 4
+    assert expected.objective > 0
+    assert solution.objective == pytest.approx(expected.objective)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from optimization.evaluation.schedule import Schedule
+from optimization.evaluation.schedule_evaluator import MonteCarloScheduleEvaluator
+
+
+@pytest.fixture
+def schedule():
+    # Task 1 follows task 0 on machine 0 and is planned a day before its target
+    return Schedule(
+        machine_sequences={0: [0, 1]},
+        planned_start=np.array([0.0, 2.0]),
+        target_execution_times=np.array([0.0, 3.0]),
+        delay_costs=np.array([1.0, 2.0]),
+        advance_costs=np.array([0.5, 0.5]),
+    )
+
+
+def test_costs_and_cvar_of_a_hand_computed_schedule(schedule):
+    durations = np.array([[2, 1], [4, 1], [3, 1], [2, 1]])
+
+    evaluation = MonteCarloScheduleEvaluator(
+        quantiles=(0.5,), cvar_alpha=0.5, chunk_size=3, max_workers=1
+    ).evaluate(schedule, durations)
+
+    assert evaluation.costs.tolist() == [0.5, 2.0, 0.0, 0.5]
+    assert evaluation.mean == pytest.approx(0.75)
+    assert evaluation.quantiles == {0.5: pytest.approx(0.5)}
+    assert evaluation.cvar == pytest.approx(1.0)
+    assert evaluation.mean_lateness.tolist() == [0.0, 0.25]
+    assert evaluation.mean_earliness.tolist() == [0.0, 0.5]
+
+
+def test_rejects_an_empty_duration_matrix(schedule):
+    with pytest.raises(ValueError):
+        MonteCarloScheduleEvaluator().evaluate(schedule, np.empty((0, 2)))
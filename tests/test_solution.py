@@ -0,0 +1,47 @@
+import json
+
+import numpy as np
+
+from optimization.solver.solution import Solution
+
+
+def assert_same_solution(solution, other):
+    assert solution.status == other.status
+    assert solution.objective == other.objective
+    assert solution.bound == other.bound
+    assert solution.scenario_names == other.scenario_names
+    for name, value in vars(solution).items():
+        if isinstance(value, np.ndarray):
+            assert np.array_equal(value, getattr(other, name)), name
+
+
+def test_dict_round_trip(crowded_instance, exhaustive_solver):
+    instance = crowded_instance(number_of_tasks=3)
+    solution = exhaustive_solver(instance).solve(instance)
+
+    restored = Solution.from_dict(json.loads(json.dumps(solution.to_dict())))
+
+    assert len(solution.scenario_names) == 2 ** 3
+    assert solution.scenario_start.shape == (2 ** 3, 3)
+    assert_same_solution(solution, restored)
+
+
+def test_json_file_round_trip(crowded_instance, exhaustive_solver, tmp_path):
+    instance = crowded_instance(number_of_tasks=3)
+    solution = exhaustive_solver(instance).solve(instance)
+
+    solution.to_json(tmp_path / "solution.json")
+    restored = Solution.from_dict(
+        json.loads((tmp_path / "solution.json").read_text())
+    )
+
+    assert_same_solution(solution, restored)
+
+
+def test_start_and_end_follow_the_durations(crowded_instance, exhaustive_solver):
+    instance = crowded_instance(number_of_tasks=3)
+    solution = exhaustive_solver(instance).solve(instance)
+
+    base_duration = np.array([task.base_duration for task in instance.tasks])
+    assert np.allclose(solution.end - solution.start, base_duration)
+    assert set(solution.machine_assignment.tolist()) <= {0, 1}
@@ -0,0 +1,191 @@
+import asyncio
+import json
+import time
+
+import pandas as pd
+import pytest
+from conftest import INPUT_DIRECTORY
+
+from optimization.solver.solve_options import SolveOptions
+from optimization.solver.solve_service import SolveService
+
+
+class _StuckSolver:
+    on_incumbent = None
+
+    def solve(self, instance):
+        time.sleep(60)
+
+
+def stuck_solver(instance, solve_options):
+    return _StuckSolver()
+
+
+def _payload(target_date="2024-01-01"):
+    tasks = pd.read_csv(INPUT_DIRECTORY / "basic_tasks.csv")
+    tasks["target_date"] = target_date
+    machines = pd.read_csv(INPUT_DIRECTORY / "basic_machines.csv")
+    return {
+        "planning_horizon": ["2024-01-01", "2024-02-15"],
+        "tasks": tasks.values.tolist(),
+        "machines": machines.values.tolist(),
+    }
+
+
+async def _request(port, method, path, payload=None, headers=None):
+    body = b"" if payload is None else json.dumps(payload).encode()
+    headers = {"Content-Length": str(len(body)), **(headers or {})}
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\n".encode()
+        + "".join(f"{name}: {value}\r\n" for name, value in headers.items()).encode()
+        + b"\r\n"
+        + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, data = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(data)
+
+
+def _serve(test, service=None):
+    """
+    Runs test(service, port) against a service whose jobs are never picked up by a
+    worker, unless test starts them
+    """
+    service = service or SolveService(max_workers=1)
+
+    async def run():
+        service.queue = asyncio.Queue()
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        async with server:
+            await test(service, server.sockets[0].getsockname()[1])
+
+    asyncio.run(run())
+
+
+def test_identical_submissions_are_coalesced_until_every_token_cancels():
+    async def test(service, port):
+        _, first = await _request(port, "POST", "/jobs", _payload())
+        _, second = await _request(port, "POST", "/jobs", _payload())
+        _, other = await _request(port, "POST", "/jobs", _payload("2024-01-05"))
+
+        assert not first["coalesced"] and second["coalesced"]
+        assert second["id"] == first["id"] != other["id"]
+        assert second["token"] != first["token"]
+
+        path = f"/jobs/{first['id']}"
+        for _ in range(2):
+            status, job = await _request(
+                port, "DELETE", f"{path}?token={first['token']}"
+            )
+            assert status == 200 and job["status"] == "queued"
+        # A token of another job does not count for this one
+        _, job = await _request(port, "DELETE", f"{path}?token={other['token']}")
+        assert job["status"] == "queued"
+        status, _ = await _request(port, "DELETE", path)
+        assert status == 400
+
+        _, job = await _request(port, "DELETE", f"{path}?token={second['token']}")
+        assert job["status"] == "cancelled"
+        _, resubmitted = await _request(port, "POST", "/jobs", _payload())
+        assert resubmitted["id"] != first["id"]
+
+    _serve(test)
+
+
+def test_infeasible_jobs_are_not_coalesced():
+    async def test(service, port):
+        _, first = await _request(port, "POST", "/jobs", _payload())
+        service._finish(service.jobs[first["id"]], "infeasible")
+
+        _, second = await _request(port, "POST", "/jobs", _payload())
+
+        assert not second["coalesced"] and second["id"] != first["id"]
+
+    _serve(test)
+
+
+def test_rejects_bad_and_oversized_bodies():
+    async def test(service, port):
+        status, _ = await _request(
+            port, "POST", "/jobs", headers={"Content-Length": "-1"}
+        )
+        assert status == 400
+        status, _ = await _request(
+            port, "POST", "/jobs", headers={"Content-Length": "ten"}
+        )
+        assert status == 400
+        status, _ = await _request(port, "POST", "/jobs", _payload())
+        assert status == 413
+        status, _ = await _request(port, "POST", "/jobs", {"tasks": []})
+        assert status == 400
+
+    _serve(test, SolveService(max_workers=1, max_body_bytes=100))
+
+
+def test_unexpected_errors_are_internal_server_errors():
+    def parse_instance(payload):
+        raise RuntimeError("broken")
+
+    async def test(service, port):
+        service.parse_instance = parse_instance
+
+        status, payload = await _request(port, "POST", "/jobs", _payload())
+
+        assert status == 500
+        assert "broken" in payload["error"]
+
+    _serve(test)
+
+
+def test_workers_solve_submitted_jobs():
+    service = SolveService(max_workers=1, solve_options=SolveOptions(time_limit=10))
+
+    async def test(service, port):
+        await service.start()
+        try:
+            _, job = await _request(port, "POST", "/jobs", _payload())
+            for _ in range(600):
+                _, summary = await _request(port, "GET", f"/jobs/{job['id']}")
+                if summary["status"] not in ("queued", "running"):
+                    break
+                await asyncio.sleep(0.1)
+            status, result = await _request(port, "GET", f"/jobs/{job['id']}/solution")
+        finally:
+            await service.stop()
+
+        assert status == 200
+        assert result["status"] == "solved"
+        assert result["solution"]["objective"] == pytest.approx(summary["objective"])
+        assert len(result["solution"]["machine_assignment"]) == 3
+
+    _serve(test, service)
+
+
+def test_a_running_job_is_killed_after_the_cancel_grace_period():
+    service = SolveService(
+        max_workers=1, solver_factory=stuck_solver, cancel_grace_seconds=0.1
+    )
+
+    async def test(service, port):
+        await service.start()
+        try:
+            _, job = await _request(port, "POST", "/jobs", _payload())
+            while service.jobs[job["id"]].status == "queued":
+                await asyncio.sleep(0.01)
+            stuck_worker = service.workers[0]
+            await _request(port, "DELETE", f"/jobs/{job['id']}?token={job['token']}")
+            for _ in range(600):
+                if service.workers[0] is not stuck_worker:
+                    break
+                await asyncio.sleep(0.1)
+            _, summary = await _request(port, "GET", f"/jobs/{job['id']}")
+        finally:
+            await service.stop()
+
+        assert summary["status"] == "cancelled"
+        assert stuck_worker.process.exitcode is not None
+
+    _serve(test, service)
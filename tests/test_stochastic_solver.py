@@ -0,0 +1,35 @@
+import pytest
+from ortools.linear_solver import linear_solver_pb2
+
+from optimization.solver.solve_options import SolveOptions
+
+
+def test_warm_start_hints_the_first_stage(crowded_instance, exhaustive_solver):
+    instance = crowded_instance(number_of_tasks=4)
+    solver = exhaustive_solver(
+        instance, warm_start=True, solve_options=SolveOptions(time_limit=30)
+    )
+
+    base_model = solver.build_model(instance)
+    model_proto = linear_solver_pb2.MPModelProto.FromString(base_model.export_model())
+
+    y_values, j_values = base_model.first_stage_hint
+    assert solver.warm_start_time is not None
+    assert set(y_values) == set(base_model.y)
+    assert set(j_values) == set(base_model.j)
+    hinted = dict(
+        zip(model_proto.solution_hint.var_index, model_proto.solution_hint.var_value)
+    )
+    for key, y_ms in base_model.y.items():
+        assert hinted[y_ms.index()] == y_values[key]
+    for key, j_sr in base_model.j.items():
+        assert hinted[j_sr.index()] == j_values[key]
+
+
+def test_warm_start_keeps_the_objective(crowded_instance, exhaustive_solver):
+    instance = crowded_instance(number_of_tasks=4)
+
+    expected = exhaustive_solver(instance).solve(instance)
+    solution = exhaustive_solver(instance, warm_start=True).solve(instance)
+
+    assert solution.objective == pytest.approx(expected.objective)
@@ -0,0 +1,92 @@
+from dataclasses import replace
+
+import pytest
+
+from optimization.model.backends import backend
+from optimization.solver.symmetry import SymmetryBreaker
+
+BREAKERS = [
+    SymmetryBreaker(verbose=False),
+    SymmetryBreaker(fix_task_order=True, verbose=False),
+]
+
+
+@pytest.fixture
+def symmetric_instance(crowded_instance):
+    """
+    Two identical machines, and a pair of identical tasks. CP-SAT on one worker is
+    slow to prove optimality on four tasks, so there are three.
+    """
+    instance = crowded_instance(
+        number_of_tasks=3,
+        number_of_capabilities=1,
+        capabilities_per_machine=1,
+        capabilities_per_task=1,
+    )
+    instance.tasks[1] = replace(instance.tasks[0], name="copy of 0")
+    return instance
+
+
+def _solver(exhaustive_solver, instance, backend_name, **kwargs):
+    base_model_factory, model_expander = backend(backend_name)
+    solver = exhaustive_solver(
+        instance, base_model_factory=base_model_factory, **kwargs
+    )
+    solver.model_expander = model_expander
+    return solver
+
+
+def test_detects_the_identical_machines_and_tasks(symmetric_instance):
+    report = SymmetryBreaker.detect(symmetric_instance)
+
+    assert report.machine_classes == [[0, 1]]
+    assert report.task_classes == [[0, 1]]
+
+
+@pytest.mark.parametrize("backend_name", ["scip", "cp-sat"])
+@pytest.mark.parametrize("symmetry_breaker", BREAKERS)
+@pytest.mark.parametrize("warm_start", [False, True])
+def test_symmetry_breaking_keeps_the_optimum(
+    symmetric_instance, exhaustive_solver, backend_name, symmetry_breaker, warm_start
+):
+    expected = _solver(exhaustive_solver, symmetric_instance, backend_name).solve(
+        symmetric_instance
+    )
+
+    solution = _solver(
+        exhaustive_solver,
+        symmetric_instance,
+        backend_name,
+        symmetry_breaker=symmetry_breaker,
+        warm_start=warm_start,
+    ).solve(symmetric_instance)
+
+    assert expected.objective > 0
+    assert solution.objective == pytest.approx(expected.objective, rel=1e-3)
+
+
+@pytest.mark.parametrize("symmetry_breaker", BREAKERS)
+def test_canonical_hint_is_feasible_with_the_symmetry_constraints(
+    symmetric_instance, exhaustive_solver, symmetry_breaker
+):
+    unbroken = exhaustive_solver(symmetric_instance).build_model(symmetric_instance)
+    expected = unbroken.solve()
+    y_values, j_values = unbroken.first_stage_values()
+    # Swapping the machines and the identical tasks gives an equally good hint
+    # that the symmetry constraints cut off
+    swap = {0: 1, 1: 0, 2: 2}
+    y_values = {(1 - m, swap[s]): value for (m, s), value in y_values.items()}
+    j_values = {(swap[s], swap[r]): value for (s, r), value in j_values.items()}
+
+    base_model = exhaustive_solver(
+        symmetric_instance, symmetry_breaker=symmetry_breaker
+    ).build_model(symmetric_instance)
+    y_values, j_values = symmetry_breaker.canonical_hint(y_values, j_values)
+    for key, value in y_values.items():
+        base_model.y[key].SetBounds(value, value)
+    for key, value in j_values.items():
+        base_model.j[key].SetBounds(value, value)
+    solution = base_model.solve()
+
+    assert solution is not None
+    assert solution.objective == pytest.approx(expected.objective)
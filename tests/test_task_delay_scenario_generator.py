@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from optimization.scenarios.exhaustive_strategy import (
+    ExhaustiveScenarioGeneratorStrategy,
+)
+from optimization.scenarios.task_delay_scenario_generator import (
+    TaskDelayScenarioGenerator,
+)
+
+
+def test_batches_match_per_index_generation(generated_instance):
+    instance = generated_instance()
+    generator = TaskDelayScenarioGenerator(instance.tasks, batch_size=5)
+
+    scenarios = list(
+        ExhaustiveScenarioGeneratorStrategy.generate_scenarios(generator, instance)
+    )
+
+    assert len(scenarios) == 2 ** len(instance.tasks)
+    for index, scenario in zip(generator.index_iterator(), scenarios):
+        expected = generator.generate_by_index(index)
+        assert scenario.name == expected.name
+        assert scenario.weight == pytest.approx(expected.weight)
+        assert np.array_equal(scenario.task_duration, expected.task_duration)
+    assert sum(s.weight for s in scenarios) == pytest.approx(1.0)
+
+
+def test_index_bits_select_the_delayed_tasks(generated_instance):
+    instance = generated_instance()
+    generator = TaskDelayScenarioGenerator(instance.tasks)
+
+    scenario = generator.generate_by_index(0b101)
+
+    for k, task in enumerate(instance.tasks):
+        delayed = k in (0, 2)
+        expected = task.delayed_duration if delayed else task.base_duration
+        assert scenario.task_duration[k] == expected